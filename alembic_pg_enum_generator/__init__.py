@@ -21,11 +21,26 @@ Features:
 """
 
 from .add_enum_value_op import AddEnumValueOp
+from .add_enum_values_block_op import AddEnumValuesBlockOp
+from .add_enum_values_op import AddEnumValuesOp
 
 # Import the compare dispatch to register it with Alembic
 # This import triggers the @dispatch_for decorator registration
 from .compare_dispatch import compare_enums_for_additions as _
+from .compare_dispatch import compare_metadata_to_snapshot
 from .config import Config, get_configuration, set_configuration
+from .enum_registry import DeclaredEnumRegistry
+from .filters import EnumFilter
+from .instrumentation import Instrumentation, RecordingInstrumentation
+from .lock_retry import LockRetryPolicy, LockRetryReport
+from .parallel_apply import EnumValuesApplyError, apply_enum_value_ops_parallel
+from .preflight import EnumLockBlockedError, PreflightPolicy
+from .revision import split_enum_additions
+from .snapshot import (
+    dump_catalog_snapshot,
+    export_catalog_snapshot,
+    load_catalog_snapshot,
+)
 
 __version__ = "1.0.0"
 
@@ -34,4 +49,21 @@ __all__ = [
     "get_configuration",
     "set_configuration",
     "AddEnumValueOp",
+    "AddEnumValuesOp",
+    "AddEnumValuesBlockOp",
+    "DeclaredEnumRegistry",
+    "EnumFilter",
+    "Instrumentation",
+    "RecordingInstrumentation",
+    "LockRetryPolicy",
+    "LockRetryReport",
+    "EnumLockBlockedError",
+    "PreflightPolicy",
+    "EnumValuesApplyError",
+    "apply_enum_value_ops_parallel",
+    "split_enum_additions",
+    "compare_metadata_to_snapshot",
+    "export_catalog_snapshot",
+    "dump_catalog_snapshot",
+    "load_catalog_snapshot",
 ]
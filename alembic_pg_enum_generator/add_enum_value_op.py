@@ -1,29 +1,76 @@
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Optional
 
 import alembic.autogenerate.render
 import alembic.operations.base
 import alembic.operations.ops
-import sqlalchemy
+
+from .config import get_configuration
+from .defined_enums import get_existing_enum_labels, record_enum_labels
+from .lock_retry import execute_add_value_statement
+from .preflight import preflight_enum_types
 
 if TYPE_CHECKING:
     from alembic.autogenerate.api import AutogenContext
 
+# SQL of the no-op reverse of every enum value operation
+NO_OP_REVERSE_SQL = "-- No-op: enum value removal not supported"
+
 
 @alembic.operations.base.Operations.register_operation("add_enum_value")
 class AddEnumValueOp(alembic.operations.ops.MigrateOperation):
-    """Operation to add a single value to an existing PostgreSQL enum type."""
+    """Operation to add a single value to an existing PostgreSQL enum type.
+
+    ``before``/``after`` optionally name an existing label the new value is
+    placed next to; without them the value is appended at the end.
+
+    ``if_not_exists`` adds ``IF NOT EXISTS`` to the statement. ``skip_existing``
+    instead checks the value against the labels read once per transaction
+    (:func:`get_existing_enum_labels`) and skips it when it is already there.
+    Either way a rerun after a partially applied migration is a no-op.
+    """
 
-    def __init__(self, enum_schema: str, enum_name: str, value: str):
+    def __init__(
+        self,
+        enum_schema: str,
+        enum_name: str,
+        value: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        if_not_exists: bool = False,
+        skip_existing: bool = False,
+    ):
+        if before is not None and after is not None:
+            raise ValueError("Only one of 'before' and 'after' can be given")
         self.enum_schema = enum_schema
         self.enum_name = enum_name
         self.value = value
+        self.before = before
+        self.after = after
+        self.if_not_exists = if_not_exists
+        self.skip_existing = skip_existing
 
     @classmethod
     def add_enum_value(
-        cls, operations: Any, enum_schema: str, enum_name: str, value: str
+        cls,
+        operations: Any,
+        enum_schema: str,
+        enum_name: str,
+        value: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        if_not_exists: bool = False,
+        skip_existing: bool = False,
     ) -> Any:
         """Execute the add enum value operation."""
-        op = cls(enum_schema, enum_name, value)
+        op = cls(
+            enum_schema,
+            enum_name,
+            value,
+            before=before,
+            after=after,
+            if_not_exists=if_not_exists,
+            skip_existing=skip_existing,
+        )
         return operations.invoke(op)
 
     def reverse(self) -> "alembic.operations.ops.MigrateOperation":
@@ -31,18 +78,49 @@ class AddEnumValueOp(alembic.operations.ops.MigrateOperation):
         # Return a no-op operation that does nothing
         from alembic.operations.ops import ExecuteSQLOp
 
-        return ExecuteSQLOp("-- No-op: enum value removal not supported")
+        return ExecuteSQLOp(NO_OP_REVERSE_SQL)
 
-    def execute(self, connection: Any) -> None:
-        """Execute the ALTER TYPE ... ADD VALUE statement."""
+    def to_sql(self) -> str:
+        """Return the ALTER TYPE ... ADD VALUE statement for this operation."""
         if self.enum_schema:
             enum_type_name = f"{self.enum_schema}.{self.enum_name}"
         else:
             enum_type_name = self.enum_name
 
-        connection.execute(
-            sqlalchemy.text(f"ALTER TYPE {enum_type_name} ADD VALUE '{self.value}'")
-        )
+        if_not_exists = " IF NOT EXISTS" if self.if_not_exists else ""
+        sql = f"ALTER TYPE {enum_type_name} ADD VALUE{if_not_exists} '{self.value}'"
+        if self.before is not None:
+            sql += f" BEFORE '{self.before}'"
+        elif self.after is not None:
+            sql += f" AFTER '{self.after}'"
+        return sql
+
+    def execute(self, connection: Any) -> None:
+        """Execute the ALTER TYPE ... ADD VALUE statement."""
+        schema = self.enum_schema or connection.dialect.default_schema_name
+        if self.skip_existing:
+            existing = get_existing_enum_labels(connection)
+            if self.value in existing.get((schema, self.enum_name), ()):
+                return
+
+        preflight_enum_types(connection, [(schema, self.enum_name)])
+        execute_add_value_statement(connection, self.to_sql())
+        record_enum_labels(connection, schema, self.enum_name, [self.value])
+
+
+def applies_through_connection(op: Any) -> bool:
+    """
+    Return whether an enum value operation has to run on the connection.
+
+    The existing-label pre-check, lock retries and the pre-flight check need
+    the operation itself at migration time rather than its plain SQL.
+    """
+    config = get_configuration()
+    return bool(
+        op.skip_existing
+        or config.lock_retry is not None
+        or config.preflight is not None
+    )
 
 
 @alembic.autogenerate.render.renderers.dispatch_for(AddEnumValueOp)
@@ -50,10 +128,16 @@ def render_add_enum_value_op(
     autogen_context: "AutogenContext", op: AddEnumValueOp
 ) -> str:
     """Render the add enum value operation in migration files."""
-    if op.enum_schema:
-        enum_type_name = f"{op.enum_schema}.{op.enum_name}"
-    else:
-        enum_type_name = op.enum_name
+    if not applies_through_connection(op):
+        return f'op.execute("{op.to_sql()}")'
 
-    sql = f"ALTER TYPE {enum_type_name} ADD VALUE '{op.value}'"
-    return f'op.execute("{sql}")'
+    args = [repr(op.enum_schema), repr(op.enum_name), repr(op.value)]
+    if op.before is not None:
+        args.append(f"before={op.before!r}")
+    if op.after is not None:
+        args.append(f"after={op.after!r}")
+    if op.if_not_exists:
+        args.append("if_not_exists=True")
+    if op.skip_existing:
+        args.append("skip_existing=True")
+    return f"op.add_enum_value({', '.join(args)})"
@@ -0,0 +1,159 @@
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import alembic.autogenerate.render
+import alembic.operations.base
+import alembic.operations.ops
+
+from .add_enum_value_op import NO_OP_REVERSE_SQL
+from .config import get_configuration
+from .connection import TRANSACTIONAL_ADD_VALUE_VERSION_NUM, get_server_version_num
+from .preflight import preflight_batch
+
+if TYPE_CHECKING:
+    from alembic.autogenerate.api import AutogenContext
+
+# Run in an autocommit block on servers that need it (PostgreSQL < 12)
+STRATEGY_AUTO = "auto"
+# Always run inside the migration transaction
+STRATEGY_TRANSACTION = "transaction"
+# Always run in an autocommit block, e.g. when later steps use the new labels
+STRATEGY_AUTOCOMMIT = "autocommit"
+
+STRATEGIES = (STRATEGY_AUTO, STRATEGY_TRANSACTION, STRATEGY_AUTOCOMMIT)
+
+
+def uses_autocommit(strategy: str, server_version_num: Any = None) -> bool:
+    """
+    Return whether ``strategy`` runs the enum additions in an autocommit block.
+
+    ``server_version_num`` is None when the version is unknown (offline
+    ``--sql`` runs); ``auto`` then picks the autocommit block, which is
+    correct on every server.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown enum value strategy {strategy!r}, expected one of {STRATEGIES}"
+        )
+    if strategy == STRATEGY_AUTO:
+        return (
+            server_version_num is None
+            or server_version_num < TRANSACTIONAL_ADD_VALUE_VERSION_NUM
+        )
+    return strategy == STRATEGY_AUTOCOMMIT
+
+
+@contextmanager
+def _preflight(
+    operations: Any, enum_types: Optional[Sequence[Tuple[Optional[str], str]]]
+) -> Iterator[None]:
+    """Run the pre-flight check for every type of the block at once."""
+    if not enum_types or operations.get_context().as_sql:
+        yield
+        return
+
+    connection = operations.get_bind()
+    default_schema = connection.dialect.default_schema_name
+    with preflight_batch(
+        connection,
+        [(schema or default_schema, enum_name) for schema, enum_name in enum_types],
+    ):
+        yield
+
+
+@contextmanager
+def _add_enum_values_block(
+    operations: Any,
+    strategy: str,
+    enum_types: Optional[Sequence[Tuple[Optional[str], str]]] = None,
+) -> Iterator[None]:
+    context = operations.get_context()
+    server_version_num = None
+    if strategy == STRATEGY_AUTO and not context.as_sql:
+        server_version_num = get_server_version_num(operations.get_bind())
+
+    if uses_autocommit(strategy, server_version_num):
+        with context.autocommit_block(), _preflight(operations, enum_types):
+            yield
+    else:
+        with _preflight(operations, enum_types):
+            yield
+
+
+@alembic.operations.base.Operations.register_operation("add_enum_values_block")
+class AddEnumValuesBlockOp(alembic.operations.ops.MigrateOperation):
+    """Container running all enum value additions of a migration together.
+
+    The additions run either inside the migration transaction or in a single
+    ``autocommit_block``, chosen by ``strategy`` (``auto``, ``transaction``
+    or ``autocommit``) and the server version, so a migration never commits
+    once per label. ``enum_types`` lists the altered (schema, name) pairs so
+    the pre-flight check runs once for the whole block.
+    """
+
+    def __init__(
+        self,
+        ops: Sequence[alembic.operations.ops.MigrateOperation],
+        strategy: str = STRATEGY_AUTO,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown enum value strategy {strategy!r}, "
+                f"expected one of {STRATEGIES}"
+            )
+        self.ops: List[alembic.operations.ops.MigrateOperation] = list(ops)
+        self.strategy = strategy
+
+    @property
+    def enum_types(self) -> List[Tuple[Optional[str], str]]:
+        """Return the (schema, name) pairs altered by the wrapped ops, in order."""
+        enum_types = (
+            (getattr(op, "enum_schema", None), getattr(op, "enum_name", None))
+            for op in self.ops
+        )
+        return [
+            (schema, enum_name)
+            for schema, enum_name in dict.fromkeys(enum_types)
+            if enum_name is not None
+        ]
+
+    @classmethod
+    def add_enum_values_block(
+        cls,
+        operations: Any,
+        strategy: str = STRATEGY_AUTO,
+        enum_types: Optional[Sequence[Tuple[Optional[str], str]]] = None,
+    ) -> ContextManager[None]:
+        """Return a context manager running the enum additions it wraps."""
+        return _add_enum_values_block(operations, strategy, enum_types)
+
+    def reverse(self) -> "alembic.operations.ops.MigrateOperation":
+        """Reverse operation - not supported for add-only library."""
+        from alembic.operations.ops import ExecuteSQLOp
+
+        return ExecuteSQLOp(NO_OP_REVERSE_SQL)
+
+
+@alembic.autogenerate.render.renderers.dispatch_for(AddEnumValuesBlockOp)
+def render_add_enum_values_block_op(
+    autogen_context: "AutogenContext", op: AddEnumValuesBlockOp
+) -> List[str]:
+    """Render the wrapped operations inside a ``with`` block."""
+    args = [f"strategy={op.strategy!r}"]
+    if get_configuration().preflight is not None:
+        args.append(f"enum_types={op.enum_types!r}")
+    lines = [f"with op.add_enum_values_block({', '.join(args)}):"]
+    for wrapped_op in op.ops:
+        lines.extend(alembic.autogenerate.render.render_op(autogen_context, wrapped_op))
+    # An empty line closes the block in Alembic's Python printer
+    lines.append("")
+    return lines
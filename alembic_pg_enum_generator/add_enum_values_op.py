@@ -0,0 +1,267 @@
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import alembic.autogenerate.render
+import alembic.operations.base
+import alembic.operations.ops
+
+from .add_enum_value_op import (
+    NO_OP_REVERSE_SQL,
+    AddEnumValueOp,
+    applies_through_connection,
+)
+from .connection import (
+    TRANSACTIONAL_ADD_VALUE_VERSION_NUM,
+    get_connection,
+    get_server_version_num,
+)
+from .defined_enums import get_existing_enum_labels, record_enum_labels
+from .lock_retry import execute_add_value_statement
+from .preflight import preflight_enum_types
+
+if TYPE_CHECKING:
+    from alembic.autogenerate.api import AutogenContext
+
+_DO_BLOCK_QUOTE = "$add_enum_values$"
+
+
+@alembic.operations.base.Operations.register_operation("add_enum_values")
+class AddEnumValuesOp(alembic.operations.ops.MigrateOperation):
+    """Operation to add several values to one existing PostgreSQL enum type.
+
+    ``values`` are added in order. ``before``/``after`` map a new value to the
+    label it is placed next to; values in neither mapping are appended.
+    ``if_not_exists`` and ``skip_existing`` behave as on ``AddEnumValueOp``.
+    """
+
+    def __init__(
+        self,
+        enum_schema: str,
+        enum_name: str,
+        values: Sequence[str],
+        before: Optional[Mapping[str, str]] = None,
+        after: Optional[Mapping[str, str]] = None,
+        if_not_exists: bool = False,
+        skip_existing: bool = False,
+    ):
+        self.enum_schema = enum_schema
+        self.enum_name = enum_name
+        self.values = list(values)
+        self.before: Dict[str, str] = dict(before or {})
+        self.after: Dict[str, str] = dict(after or {})
+        self.if_not_exists = if_not_exists
+        self.skip_existing = skip_existing
+        both = set(self.before) & set(self.after)
+        if both:
+            raise ValueError(
+                f"Only one of 'before' and 'after' can be given for {sorted(both)}"
+            )
+
+    @classmethod
+    def add_enum_values(
+        cls,
+        operations: Any,
+        enum_schema: str,
+        enum_name: str,
+        values: Sequence[str],
+        before: Optional[Mapping[str, str]] = None,
+        after: Optional[Mapping[str, str]] = None,
+        if_not_exists: bool = False,
+        skip_existing: bool = False,
+    ) -> Any:
+        """Execute the add enum values operation."""
+        op = cls(
+            enum_schema,
+            enum_name,
+            values,
+            before=before,
+            after=after,
+            if_not_exists=if_not_exists,
+            skip_existing=skip_existing,
+        )
+        return operations.invoke(op)
+
+    @classmethod
+    def from_value_ops(cls, ops: Sequence[AddEnumValueOp]) -> "AddEnumValuesOp":
+        """
+        Combine single-value operations on the same enum type.
+
+        Raises:
+            ValueError: If the operations disagree on ``if_not_exists`` or
+                ``skip_existing``, which apply to the combined operation as a whole
+        """
+        first = ops[0]
+        if any(_flags(op) != _flags(first) for op in ops):
+            raise ValueError(
+                f"Cannot combine values of {first.enum_name!r} with different"
+                " if_not_exists/skip_existing flags"
+            )
+        return cls(
+            first.enum_schema,
+            first.enum_name,
+            [op.value for op in ops],
+            before={op.value: op.before for op in ops if op.before is not None},
+            after={op.value: op.after for op in ops if op.after is not None},
+            if_not_exists=first.if_not_exists,
+            skip_existing=first.skip_existing,
+        )
+
+    def to_value_ops(self) -> List[AddEnumValueOp]:
+        """Return the equivalent single-value operations, in order."""
+        return [
+            AddEnumValueOp(
+                self.enum_schema,
+                self.enum_name,
+                value,
+                before=self.before.get(value),
+                after=self.after.get(value),
+                if_not_exists=self.if_not_exists,
+                skip_existing=self.skip_existing,
+            )
+            for value in self.values
+        ]
+
+    def reverse(self) -> "alembic.operations.ops.MigrateOperation":
+        """Reverse operation - not supported for add-only library."""
+        from alembic.operations.ops import ExecuteSQLOp
+
+        return ExecuteSQLOp(NO_OP_REVERSE_SQL)
+
+    def to_sql(self, server_version_num: Optional[int] = None) -> List[str]:
+        """
+        Return the statements adding every value, in as few as the server allows.
+
+        From PostgreSQL 12 (``server_version_num`` 120000) all values are added
+        by a single DO block, since ADD VALUE then runs in a transaction block;
+        older or unknown servers get one ALTER TYPE ... ADD VALUE statement per
+        value.
+        """
+        statements = [op.to_sql() for op in self.to_value_ops()]
+        if (
+            len(statements) > 1
+            and server_version_num is not None
+            and server_version_num >= TRANSACTIONAL_ADD_VALUE_VERSION_NUM
+            and not any(_DO_BLOCK_QUOTE in statement for statement in statements)
+        ):
+            body = "".join(f" {statement};" for statement in statements)
+            return [f"DO {_DO_BLOCK_QUOTE} BEGIN{body} END {_DO_BLOCK_QUOTE}"]
+        return statements
+
+    def execute(self, connection: Any) -> None:
+        """Execute the statements in as few round-trips as the server allows."""
+        schema = self.enum_schema or connection.dialect.default_schema_name
+        op = self
+        if self.skip_existing:
+            existing = get_existing_enum_labels(connection).get(
+                (schema, self.enum_name), set()
+            )
+            op = self._without(existing)
+
+        if op.values:
+            preflight_enum_types(connection, [(schema, self.enum_name)])
+        # A single value needs no DO block, so no version lookup either
+        server_version_num = (
+            get_server_version_num(connection) if len(op.values) > 1 else None
+        )
+        for statement in op.to_sql(server_version_num):
+            execute_add_value_statement(connection, statement)
+        record_enum_labels(connection, schema, self.enum_name, op.values)
+
+    def _without(self, labels: AbstractSet[str]) -> "AddEnumValuesOp":
+        """Return a copy of this operation without the given values."""
+        values = [value for value in self.values if value not in labels]
+        return AddEnumValuesOp(
+            self.enum_schema,
+            self.enum_name,
+            values,
+            before={
+                value: self.before[value] for value in values if value in self.before
+            },
+            after={value: self.after[value] for value in values if value in self.after},
+            if_not_exists=self.if_not_exists,
+        )
+
+
+def _flags(op: AddEnumValueOp) -> Tuple[bool, bool]:
+    return op.if_not_exists, op.skip_existing
+
+
+def _group_key(op: AddEnumValueOp) -> Tuple[Optional[str], str, bool, bool]:
+    return (op.enum_schema, op.enum_name, *_flags(op))
+
+
+def group_add_enum_value_ops(
+    ops: Sequence[AddEnumValueOp],
+) -> List[Union[AddEnumValueOp, "AddEnumValuesOp"]]:
+    """
+    Group consecutive single-value operations on the same enum type.
+
+    Types with a single new value keep their ``AddEnumValueOp``. Operations
+    with different ``if_not_exists``/``skip_existing`` flags are not grouped.
+    """
+    groups: List[List[AddEnumValueOp]] = []
+    for op in ops:
+        if groups and _group_key(groups[-1][0]) == _group_key(op):
+            groups[-1].append(op)
+        else:
+            groups.append([op])
+
+    return [
+        AddEnumValuesOp.from_value_ops(group) if len(group) > 1 else group[0]
+        for group in groups
+    ]
+
+
+@alembic.operations.base.Operations.implementation_for(AddEnumValueOp)
+def add_enum_value(operations: Any, op: AddEnumValueOp) -> None:
+    """Run ``op.add_enum_value`` in a migration, online or with ``--sql``."""
+    if applies_through_connection(op) and not operations.get_context().as_sql:
+        with get_connection(operations) as connection:
+            op.execute(connection)
+    else:
+        operations.execute(op.to_sql())
+
+
+@alembic.operations.base.Operations.implementation_for(AddEnumValuesOp)
+def add_enum_values(operations: Any, op: AddEnumValuesOp) -> None:
+    """Run ``op.add_enum_values`` in a migration, online or with ``--sql``."""
+    if applies_through_connection(op) and not operations.get_context().as_sql:
+        with get_connection(operations) as connection:
+            op.execute(connection)
+        return
+
+    # Offline (--sql) runs have no server version and get one statement each
+    server_version_num = None
+    if not operations.get_context().as_sql:
+        with get_connection(operations) as connection:
+            server_version_num = get_server_version_num(connection)
+    for statement in op.to_sql(server_version_num):
+        operations.execute(statement)
+
+
+@alembic.autogenerate.render.renderers.dispatch_for(AddEnumValuesOp)
+def render_add_enum_values_op(
+    autogen_context: "AutogenContext", op: AddEnumValuesOp
+) -> List[str]:
+    """Render the add enum values operation as a compact data-driven call."""
+    args = [repr(op.enum_schema), repr(op.enum_name), repr(op.values)]
+    if op.before:
+        args.append(f"before={op.before!r}")
+    if op.after:
+        args.append(f"after={op.after!r}")
+    if op.if_not_exists:
+        args.append("if_not_exists=True")
+    if op.skip_existing:
+        args.append("skip_existing=True")
+    # One line each, so the call is indented correctly inside blocks
+    return ["op.add_enum_values(", *(f"    {arg}," for arg in args), ")"]
@@ -0,0 +1,148 @@
+"""
+Asyncio entry points for ``AsyncConnection`` users.
+
+These mirror the sync introspection helpers but await the queries directly
+on an ``AsyncConnection``, so several databases can be introspected
+concurrently on one event loop instead of one after another behind
+``connection.run_sync``. Applying enum values goes through ``run_sync``, so
+the pre-check, lock retry and pre-flight options behave as in migrations.
+
+Alembic itself still runs migrations synchronously; in an async ``env.py`` the
+autogenerate hooks keep working through the usual bridge::
+
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+"""
+
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
+
+import sqlalchemy
+
+from .add_enum_value_op import AddEnumValueOp
+from .add_enum_values_op import AddEnumValuesOp
+from .defined_enums import (
+    _ALL_ENUMS_FOR_SCHEMAS_SQL,
+    _ALL_ENUMS_SQL,
+    _CATALOG_FINGERPRINT_SQL,
+    _combine_include_name,
+    _decode_defined_enums,
+    _decode_defined_enums_by_schema,
+    _filter_enums_sql,
+    _format_catalog_fingerprint,
+)
+from .preflight import preflight_batch
+from .types import EnumNamesToValues, SchemaNamesToEnums
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.ext.asyncio import AsyncConnection
+
+    from .filters import EnumFilter
+
+EnumValueOps = Sequence[Union[AddEnumValueOp, AddEnumValuesOp]]
+
+
+async def get_defined_enums_async(
+    connection: "AsyncConnection",
+    schema: str,
+    include_name: Optional[Callable[[str], bool]] = None,
+    enum_filter: Optional["EnumFilter"] = None,
+) -> EnumNamesToValues:
+    """Async counterpart of ``get_defined_enums``."""
+    sql, params = _filter_enums_sql(_ALL_ENUMS_SQL, {"schema": schema}, enum_filter)
+    result = await connection.execute(sqlalchemy.text(sql), params)
+    return _decode_defined_enums(
+        result, _combine_include_name(include_name, enum_filter)
+    )
+
+
+async def get_defined_enums_by_schema_async(
+    connection: "AsyncConnection",
+    schemas: Sequence[str],
+    include_name: Optional[Callable[[str], bool]] = None,
+    enum_filter: Optional["EnumFilter"] = None,
+) -> SchemaNamesToEnums:
+    """Async counterpart of ``get_defined_enums_by_schema``."""
+    if not schemas:
+        return {}
+
+    sql, params = _filter_enums_sql(
+        _ALL_ENUMS_FOR_SCHEMAS_SQL, {"schemas": list(schemas)}, enum_filter
+    )
+    result = await connection.execute(sqlalchemy.text(sql), params)
+    return _decode_defined_enums_by_schema(
+        result, _combine_include_name(include_name, enum_filter)
+    )
+
+
+async def get_catalog_fingerprint_async(
+    connection: "AsyncConnection", schemas: Sequence[str]
+) -> str:
+    """Async counterpart of ``get_catalog_fingerprint``."""
+    result = await connection.execute(
+        sqlalchemy.text(_CATALOG_FINGERPRINT_SQL), {"schemas": list(schemas)}
+    )
+    return _format_catalog_fingerprint(result.one())
+
+
+async def get_defined_enums_for_databases_async(
+    connections: Mapping[str, "AsyncConnection"],
+    schemas: Sequence[str],
+    include_name: Optional[Callable[[str], bool]] = None,
+    enum_filter: Optional["EnumFilter"] = None,
+) -> Dict[str, SchemaNamesToEnums]:
+    """
+    Introspect several databases concurrently on the running event loop.
+
+    Args:
+        connections: Async connections keyed by a database label
+        schemas: Schema names to introspect in every database
+        include_name: Optional filter function for enum names
+        enum_filter: Optional declarative filter, pushed into the queries
+
+    Returns:
+        Dict mapping database labels to their per-schema enum index
+    """
+    results = await asyncio.gather(
+        *(
+            get_defined_enums_by_schema_async(
+                connection, schemas, include_name, enum_filter
+            )
+            for connection in connections.values()
+        )
+    )
+    return dict(zip(connections, results))
+
+
+def _execute_add_enum_value_ops(connection: "Connection", ops: EnumValueOps) -> None:
+    default_schema = cast(str, connection.dialect.default_schema_name)
+    enum_types = [(op.enum_schema or default_schema, op.enum_name) for op in ops]
+    # One pre-flight check for every type, before any of them is altered
+    with preflight_batch(connection, enum_types):
+        for op in ops:
+            op.execute(connection)
+
+
+async def execute_add_enum_value_ops_async(
+    connection: "AsyncConnection",
+    ops: Iterable[Union[AddEnumValueOp, AddEnumValuesOp]],
+) -> None:
+    """
+    Apply enum value operations in order on an ``AsyncConnection``.
+
+    The operations run through ``run_sync`` exactly as in a migration, so
+    ``skip_existing``, the configured lock retry policy and the pre-flight
+    check apply; the pre-flight check runs once for all types of the call.
+    """
+    await connection.run_sync(_execute_add_enum_value_ops, list(ops))
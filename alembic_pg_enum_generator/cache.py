@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence
+
+from .add_enum_value_op import AddEnumValueOp
+from .types import SchemaNamesToEnums
+
+if TYPE_CHECKING:
+    from .filters import EnumFilter
+
+if sys.platform != "win32":
+    import fcntl
+
+# Bump whenever the cached payload or the key inputs change meaning
+CACHE_FORMAT_VERSION = 1
+
+# Number of catalog snapshots kept in memory per process
+MAX_IN_PROCESS_SNAPSHOTS = 32
+
+_catalog_snapshots: "OrderedDict[str, SchemaNamesToEnums]" = OrderedDict()
+
+
+@contextmanager
+def _locked(path: str, exclusive: bool) -> Iterator[None]:
+    """Hold an advisory lock on ``path`` where the platform supports it."""
+    if sys.platform == "win32":  # pragma: no cover - no flock on Windows
+        yield
+        return
+
+    with open(path, "a+") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_json_atomically(directory: str, path: str, payload: object) -> None:
+    """Replace ``path`` with ``payload`` under an exclusive lock."""
+    with _locked(f"{path}.lock", exclusive=True):
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(payload, tmp_file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class EnumComparisonCache:
+    """
+    On-disk cache of enum comparison results.
+
+    Entries are keyed on a stable hash of the declared-enum index and a catalog
+    fingerprint, so a hit means neither the models nor the database enums
+    changed since the result was stored. Reads and writes are guarded by file
+    locks and entries are replaced atomically, which makes the directory safe
+    to share between parallel CI workers.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def make_key(
+        self,
+        schemas: Sequence[str],
+        declared_enums_by_schema: SchemaNamesToEnums,
+        catalog_fingerprint: str,
+    ) -> str:
+        """Return the cache key for one comparison."""
+        payload = json.dumps(
+            {
+                "version": CACHE_FORMAT_VERSION,
+                "schemas": list(schemas),
+                "declared": {
+                    schema: {name: list(values) for name, values in enums.items()}
+                    for schema, enums in declared_enums_by_schema.items()
+                },
+                "catalog": catalog_fingerprint,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> Optional[List[AddEnumValueOp]]:
+        """Return the cached operations for ``key``, or None on a miss."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        with _locked(f"{path}.lock", exclusive=False):
+            try:
+                with open(path, encoding="utf-8") as cache_file:
+                    entries = json.load(cache_file)
+            except (OSError, ValueError):
+                return None
+
+        return [
+            AddEnumValueOp(
+                enum_schema=entry["schema"],
+                enum_name=entry["name"],
+                value=entry["value"],
+                before=entry["before"],
+                after=entry["after"],
+            )
+            for entry in entries
+        ]
+
+    def store(self, key: str, ops: Sequence[AddEnumValueOp]) -> None:
+        """Store the operations produced for ``key``."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        entries = [
+            {
+                "schema": op.enum_schema,
+                "name": op.enum_name,
+                "value": op.value,
+                "before": op.before,
+                "after": op.after,
+            }
+            for op in ops
+        ]
+
+        _write_json_atomically(self.directory, path, entries)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+
+class CatalogSnapshotCache:
+    """
+    Snapshots of the defined-enum index keyed by a catalog fingerprint.
+
+    Snapshots are always kept in memory for the lifetime of the process and,
+    when a directory is given, also on disk. A snapshot is only reused when
+    the fingerprint of the live catalog still matches, so unchanged catalogs
+    skip the full enum fetch.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+
+    def make_key(
+        self,
+        schemas: Sequence[str],
+        catalog_fingerprint: str,
+        enum_filter: Optional["EnumFilter"] = None,
+    ) -> str:
+        """
+        Return the snapshot key for a set of schemas and a fingerprint.
+
+        Snapshots fetched with an enum filter only hold part of the catalog,
+        so the filter is part of the key.
+        """
+        payload = json.dumps(
+            {
+                "version": CACHE_FORMAT_VERSION,
+                "schemas": sorted(schemas),
+                "catalog": catalog_fingerprint,
+                "filter": repr(enum_filter) if enum_filter else None,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> Optional[SchemaNamesToEnums]:
+        """Return the snapshot stored for ``key``, or None on a miss."""
+        if key in _catalog_snapshots:
+            _catalog_snapshots.move_to_end(key)
+            return _catalog_snapshots[key]
+
+        if self.directory is None:
+            return None
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        with _locked(f"{path}.lock", exclusive=False):
+            try:
+                with open(path, encoding="utf-8") as snapshot_file:
+                    payload = json.load(snapshot_file)
+            except (OSError, ValueError):
+                return None
+
+        snapshot = {
+            schema: {name: tuple(values) for name, values in enums.items()}
+            for schema, enums in payload.items()
+        }
+        self._remember(key, snapshot)
+        return snapshot
+
+    def store(self, key: str, snapshot: SchemaNamesToEnums) -> None:
+        """Store the defined-enum index captured for ``key``."""
+        self._remember(key, snapshot)
+
+        if self.directory is None:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        payload = {
+            schema: {name: list(values) for name, values in enums.items()}
+            for schema, enums in snapshot.items()
+        }
+        _write_json_atomically(self.directory, self._path(key), payload)
+
+    def _remember(self, key: str, snapshot: SchemaNamesToEnums) -> None:
+        _catalog_snapshots[key] = snapshot
+        _catalog_snapshots.move_to_end(key)
+        while len(_catalog_snapshots) > MAX_IN_PROCESS_SNAPSHOTS:
+            _catalog_snapshots.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory or "", f"catalog-{key}.json")
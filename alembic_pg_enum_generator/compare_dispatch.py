@@ -1,14 +1,412 @@
-from typing import Iterable, List, Union, cast
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
 
 from alembic.autogenerate import comparators
 from alembic.autogenerate.api import AutogenContext
-from alembic.operations.ops import UpgradeOps
+from alembic.operations.ops import MigrateOperation, UpgradeOps
 from sqlalchemy import MetaData
 
 from .add_enum_value_op import AddEnumValueOp
-from .config import get_configuration
-from .declared_enums import get_declared_enums
-from .defined_enums import get_defined_enums
+from .add_enum_values_block_op import AddEnumValuesBlockOp
+from .add_enum_values_op import AddEnumValuesOp, group_add_enum_value_ops
+from .cache import CatalogSnapshotCache, EnumComparisonCache
+from .config import Config, get_configuration
+from .declared_enums import get_declared_enums_by_schema
+from .defined_enums import (
+    _combine_include_name,
+    get_catalog_fingerprint,
+    get_defined_enums_by_schema,
+    get_defined_enums_parallel,
+    get_missing_enum_values,
+    iter_defined_enums,
+)
+from .enum_diff import EnumValueAddition, diff_enum_values, place_missing_values
+from .instrumentation import (
+    COUNTER_OPS_PRODUCED,
+    COUNTER_ROWS_FETCHED,
+    COUNTER_SCHEMAS_QUERIED,
+    PHASE_CATALOG_QUERY,
+    PHASE_DIFF,
+    PHASE_EMIT,
+    PHASE_METADATA_WALK,
+    span,
+)
+from .snapshot import CatalogSnapshot, load_catalog_snapshot
+from .types import SchemaNamesToEnums
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+
+def _span(config: Config, phase: str) -> ContextManager[None]:
+    """Return an instrumentation span for ``phase``, or a no-op."""
+    return span(config.instrumentation, phase)
+
+
+def _resolve_schemas(
+    schema_names: Iterable[Union[str, None]], default_schema: str
+) -> List[str]:
+    """Replace None with the default schema and drop duplicates, keeping order."""
+    schemas: List[str] = []
+    for schema in schema_names:
+        if schema is None:
+            schema = default_schema
+        if schema not in schemas:
+            schemas.append(schema)
+    return schemas
+
+
+def _compared_schemas(
+    config: Config, schema_names: Iterable[Union[str, None]], default_schema: str
+) -> List[str]:
+    """Return the schemas to compare, after the configured schema filter."""
+    schemas = _resolve_schemas(schema_names, default_schema)
+    if config.enum_filter is not None:
+        schemas = [
+            schema for schema in schemas if config.enum_filter.include_schema(schema)
+        ]
+    return schemas
+
+
+def _include_name(config: Config) -> Optional[Callable[[str], bool]]:
+    """Return the enum name filter combining include_name and enum_filter."""
+    return _combine_include_name(config.include_name, config.enum_filter)
+
+
+def _get_declared_enums_by_schema(
+    config: Config, metadata_list: List[MetaData], default_schema: str
+) -> SchemaNamesToEnums:
+    """Return the declared-enum index from the registry or a metadata walk."""
+    if config.declared_enum_registry is not None:
+        # Live index maintained from SQLAlchemy events - no metadata scan needed
+        with _span(config, PHASE_METADATA_WALK):
+            return config.declared_enum_registry.by_schema(
+                default_schema=default_schema,
+                include_name=_include_name(config),
+            )
+
+    # Walk SQLAlchemy metadata once and reuse the index for every schema
+    return get_declared_enums_by_schema(
+        metadata=metadata_list,
+        default_schema=default_schema,
+        include_name=_include_name(config),
+        instrumentation=config.instrumentation,
+    )
+
+
+def _fetch_defined_enums_by_schema(
+    config: Config,
+    connection: "Connection",
+    schemas: List[str],
+    include_name: Optional[Callable[[str], bool]],
+) -> SchemaNamesToEnums:
+    """Fetch the defined-enum index from PostgreSQL."""
+    if config.introspection_workers:
+        # One query per schema, fanned out over short-lived connections
+        return get_defined_enums_parallel(
+            engine=connection.engine,
+            schemas=schemas,
+            include_name=include_name,
+            max_workers=config.introspection_workers,
+            instrumentation=config.instrumentation,
+            enum_filter=config.enum_filter,
+        )
+
+    # Get defined enums for every schema from PostgreSQL in one round-trip
+    return get_defined_enums_by_schema(
+        connection=connection,
+        schemas=schemas,
+        include_name=include_name,
+        instrumentation=config.instrumentation,
+        enum_filter=config.enum_filter,
+    )
+
+
+def _get_defined_enums_by_schema(
+    config: Config,
+    connection: "Connection",
+    schemas: List[str],
+    catalog_fingerprint: Optional[str],
+) -> SchemaNamesToEnums:
+    """Return the defined-enum index, reusing a snapshot when the catalog matches."""
+    if catalog_fingerprint is None or not config.reuse_catalog_snapshots:
+        return _fetch_defined_enums_by_schema(
+            config, connection, schemas, config.include_name
+        )
+
+    snapshots = CatalogSnapshotCache(config.cache_dir)
+    snapshot_key = snapshots.make_key(schemas, catalog_fingerprint, config.enum_filter)
+    snapshot = snapshots.load(snapshot_key)
+    if snapshot is None:
+        # Snapshots are stored without include_name so any callable can reuse
+        # them; the enum_filter is applied while fetching and keys the snapshot
+        snapshot = _fetch_defined_enums_by_schema(config, connection, schemas, None)
+        snapshots.store(snapshot_key, snapshot)
+
+    include_name = _include_name(config)
+    if include_name is None:
+        return snapshot
+
+    schema_to_enums: SchemaNamesToEnums = {}
+    for schema, enums in snapshot.items():
+        filtered = {
+            name: values for name, values in enums.items() if include_name(name)
+        }
+        if filtered:
+            schema_to_enums[schema] = filtered
+    return schema_to_enums
+
+
+def _get_enum_indexes_pipelined(
+    config: Config,
+    connection: "Connection",
+    metadata_list: List[MetaData],
+    default_schema: str,
+    schemas: List[str],
+    catalog_fingerprint: Optional[str],
+) -> Tuple[SchemaNamesToEnums, SchemaNamesToEnums]:
+    """
+    Return the declared and defined indexes, overlapping their construction.
+
+    The catalog fetch is issued first on a background thread and the metadata
+    is walked while it waits on the network. The connection is only used by
+    that thread until the fetch completes.
+    """
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="alembic-pg-enum-catalog"
+    ) as executor:
+        defined_future = executor.submit(
+            _get_defined_enums_by_schema,
+            config,
+            connection,
+            schemas,
+            catalog_fingerprint,
+        )
+        declared_enums_by_schema = _get_declared_enums_by_schema(
+            config, metadata_list, default_schema
+        )
+        return declared_enums_by_schema, defined_future.result()
+
+
+def _additions_to_ops(
+    schema: str, enum_name: str, additions: Iterable[EnumValueAddition]
+) -> Iterator[AddEnumValueOp]:
+    for addition in additions:
+        yield AddEnumValueOp(
+            enum_schema=schema,
+            enum_name=enum_name,
+            value=addition.value,
+            before=addition.before,
+            after=addition.after,
+        )
+
+
+def _emitted_ops(
+    config: Config, ops: List[AddEnumValueOp]
+) -> Sequence[MigrateOperation]:
+    """Return the ops to emit, grouped, made idempotent and wrapped as configured."""
+    emitted: List[Union[AddEnumValueOp, AddEnumValuesOp]] = list(
+        group_add_enum_value_ops(ops) if config.group_enum_values else ops
+    )
+    for op in emitted:
+        op.if_not_exists = config.add_value_if_not_exists
+        op.skip_existing = config.skip_existing_values
+    if config.add_value_strategy is not None and emitted:
+        # One block per migration instead of a commit cycle per label
+        return [AddEnumValuesBlockOp(emitted, strategy=config.add_value_strategy)]
+    return emitted
+
+
+def _diff_enums(
+    schemas: List[str],
+    declared_enums_by_schema: SchemaNamesToEnums,
+    defined_enums_by_schema: SchemaNamesToEnums,
+) -> List[AddEnumValueOp]:
+    """Return an AddEnumValueOp for every declared value missing in the database."""
+    ops: List[AddEnumValueOp] = []
+
+    for schema in schemas:
+        defined_enums = defined_enums_by_schema.get(schema)
+        if not defined_enums:
+            # No enum types in this schema - nothing can be extended
+            continue
+
+        declared_enums = declared_enums_by_schema.get(schema, {})
+
+        # Compare and detect new values
+        for enum_name, declared_values in declared_enums.items():
+            if enum_name not in defined_enums:
+                # Enum doesn't exist in database - skip (let standard Alembic handle enum creation)
+                continue
+
+            # Find new values (values in declared but not in defined)
+            additions = diff_enum_values(declared_values, defined_enums[enum_name])
+
+            # Generate AddEnumValueOp for each new value
+            ops.extend(_additions_to_ops(schema, enum_name, additions))
+
+    return ops
+
+
+def _diff_enums_server_side(
+    config: Config,
+    connection: "Connection",
+    schemas: List[str],
+    declared_enums_by_schema: SchemaNamesToEnums,
+) -> List[AddEnumValueOp]:
+    """Return the AddEnumValueOps computed from a server-side anti-join."""
+    declared_in_schemas = {
+        schema: declared_enums_by_schema[schema]
+        for schema in schemas
+        if schema in declared_enums_by_schema
+    }
+    missing_enum_values = get_missing_enum_values(
+        connection, declared_in_schemas, instrumentation=config.instrumentation
+    )
+
+    ops: List[AddEnumValueOp] = []
+    with _span(config, PHASE_DIFF):
+        for schema, declared_enums in declared_in_schemas.items():
+            for enum_name, declared_values in declared_enums.items():
+                missing = missing_enum_values.get((schema, enum_name))
+                if missing is None:
+                    # Enum is complete or doesn't exist in the database
+                    continue
+
+                missing_values, tail = missing
+                additions = place_missing_values(declared_values, missing_values, tail)
+                ops.extend(_additions_to_ops(schema, enum_name, additions))
+
+    return ops
+
+
+def _diff_enums_streaming(
+    config: Config,
+    connection: "Connection",
+    schemas: List[str],
+    declared_enums_by_schema: SchemaNamesToEnums,
+    batch_size: int,
+) -> List[AddEnumValueOp]:
+    """
+    Diff catalog rows as they stream in, without building a defined index.
+
+    Rows of enum types that are not declared are dropped immediately, so only
+    the resulting ops are kept. The whole loop is reported as the catalog
+    query phase, since decoding and diffing are interleaved with the fetch.
+    """
+    ops_by_enum: Dict[Tuple[str, str], List[AddEnumValueOp]] = {}
+    rows_fetched = 0
+
+    with _span(config, PHASE_CATALOG_QUERY):
+        for schema, enum_name, defined_values in iter_defined_enums(
+            connection, schemas, enum_filter=config.enum_filter, batch_size=batch_size
+        ):
+            rows_fetched += 1
+            declared_values = declared_enums_by_schema.get(schema, {}).get(enum_name)
+            if declared_values is None:
+                continue
+
+            additions = diff_enum_values(declared_values, defined_values)
+            if additions:
+                ops_by_enum[(schema, enum_name)] = list(
+                    _additions_to_ops(schema, enum_name, additions)
+                )
+
+    if config.instrumentation is not None:
+        config.instrumentation.count(COUNTER_SCHEMAS_QUERIED, len(schemas))
+        config.instrumentation.count(COUNTER_ROWS_FETCHED, rows_fetched)
+
+    # Emit in the same order as the non-streaming diff
+    ops: List[AddEnumValueOp] = []
+    for schema in schemas:
+        for enum_name in declared_enums_by_schema.get(schema, {}):
+            ops.extend(ops_by_enum.get((schema, enum_name), ()))
+    return ops
+
+
+def _warn_if_snapshot_is_stale(
+    config: Config, connection: "Connection", snapshot: CatalogSnapshot
+) -> None:
+    """Warn when the live catalog no longer matches the configured snapshot."""
+    if snapshot.fingerprint is None:
+        return
+
+    captured_schemas = snapshot.schemas or sorted(snapshot.enums)
+    with _span(config, PHASE_CATALOG_QUERY):
+        live_fingerprint = get_catalog_fingerprint(connection, captured_schemas)
+    if live_fingerprint != snapshot.fingerprint:
+        warnings.warn(
+            f"Catalog snapshot {config.catalog_snapshot} does not match the "
+            f"connected database (fingerprint {snapshot.fingerprint} != "
+            f"{live_fingerprint}); comparing against the snapshot anyway. "
+            "Re-export it with export_catalog_snapshot().",
+            stacklevel=2,
+        )
+
+
+def compare_metadata_to_snapshot(
+    metadata: Union[MetaData, List[MetaData]],
+    snapshot: Union[str, CatalogSnapshot],
+    schemas: Optional[Sequence[Optional[str]]] = None,
+) -> List[MigrateOperation]:
+    """
+    Return the operations adding declared enum values missing from a snapshot.
+
+    Runs without any database connection, e.g. in CI, against a catalog
+    captured by ``export_catalog_snapshot``. Alembic's autogenerate cannot do
+    this itself, since it requires a connection before comparators run. The
+    configured filters and emission options apply as in autogenerate.
+
+    Args:
+        metadata: SQLAlchemy schema metadata
+        snapshot: Snapshot file path or a loaded ``CatalogSnapshot``
+        schemas: Schemas to compare (None means the snapshot's default
+            schema); defaults to every schema in the snapshot
+
+    Returns:
+        The operations autogenerate would emit, in the same order
+    """
+    config = get_configuration()
+    if isinstance(snapshot, str):
+        snapshot = load_catalog_snapshot(snapshot)
+    metadata_list = metadata if isinstance(metadata, list) else [metadata]
+
+    default_schema = snapshot.default_schema or "public"
+    compared_schemas = _compared_schemas(
+        config,
+        (snapshot.schemas or list(snapshot.enums)) if schemas is None else schemas,
+        default_schema,
+    )
+
+    with _span(config, PHASE_CATALOG_QUERY):
+        defined_enums_by_schema = snapshot.get_defined_enums_by_schema(
+            compared_schemas, _include_name(config)
+        )
+    if not defined_enums_by_schema:
+        return []
+
+    declared_enums_by_schema = _get_declared_enums_by_schema(
+        config, metadata_list, default_schema
+    )
+    with _span(config, PHASE_DIFF):
+        ops = _diff_enums(
+            compared_schemas, declared_enums_by_schema, defined_enums_by_schema
+        )
+    return list(_emitted_ops(config, ops))
 
 
 @comparators.dispatch_for("schema")
@@ -28,57 +426,121 @@ def compare_enums_for_additions(
     if connection is None or connection.dialect.name != "postgresql":
         return
 
+    # Get declared enums from SQLAlchemy metadata
+    metadata = autogen_context.metadata
+    if metadata is None:
+        return
+
+    # Convert metadata to the expected type
+    if isinstance(metadata, list):
+        metadata_list = cast(List[MetaData], metadata)
+    else:
+        metadata_list = [cast(MetaData, metadata)]
+
     # Get default schema
     default_schema = connection.dialect.default_schema_name or "public"
+    schemas = _compared_schemas(config, schema_names, default_schema)
+    if not schemas:
+        return
 
-    for schema in schema_names:
-        if schema is None:
-            schema = default_schema
+    # A catalog snapshot stands in for the live catalog query
+    snapshot: Optional[CatalogSnapshot] = None
+    if config.catalog_snapshot:
+        snapshot = load_catalog_snapshot(config.catalog_snapshot)
+        _warn_if_snapshot_is_stale(config, connection, snapshot)
 
-        # Get declared enums from SQLAlchemy metadata
-        metadata = autogen_context.metadata
-        if metadata is None:
-            continue
+    declared_enums_by_schema: Optional[SchemaNamesToEnums] = None
+    cache_key: Optional[str] = None
+    cache = EnumComparisonCache(config.cache_dir) if config.cache_dir else None
 
-        # Convert metadata to the expected type
-        if isinstance(metadata, list):
-            metadata_list = cast(List[MetaData], metadata)
-        else:
-            metadata_list = [cast(MetaData, metadata)]
+    # Cheap single-row probe of the catalog, shared by both caches
+    catalog_fingerprint: Optional[str] = None
+    if snapshot is not None:
+        catalog_fingerprint = snapshot.fingerprint
+    elif cache is not None or config.reuse_catalog_snapshots:
+        with _span(config, PHASE_CATALOG_QUERY):
+            catalog_fingerprint = get_catalog_fingerprint(connection, schemas)
 
-        declared_enums = get_declared_enums(
-            metadata=metadata_list,
-            schema=schema,
-            default_schema=default_schema,
-            include_name=config.include_name,
+    if cache is not None and catalog_fingerprint is not None:
+        # Skip the full comparison when neither models nor catalog changed
+        declared_enums_by_schema = _get_declared_enums_by_schema(
+            config, metadata_list, default_schema
         )
+        cache_key = cache.make_key(
+            schemas, declared_enums_by_schema, catalog_fingerprint
+        )
+        cached_ops = cache.load(cache_key)
+        if cached_ops is not None:
+            with _span(config, PHASE_EMIT):
+                emitted = _emitted_ops(config, cached_ops)
+                upgrade_ops.ops.extend(emitted)
+            if config.instrumentation is not None:
+                config.instrumentation.count(COUNTER_OPS_PRODUCED, len(emitted))
+            return
+
+    ops: List[AddEnumValueOp] = []
+    defined_enums_by_schema: SchemaNamesToEnums = {}
 
-        # Get defined enums from PostgreSQL database
-        defined_enums = get_defined_enums(
-            connection=connection,
-            schema=schema,
-            include_name=config.include_name,
+    if snapshot is not None:
+        with _span(config, PHASE_CATALOG_QUERY):
+            defined_enums_by_schema = snapshot.get_defined_enums_by_schema(
+                schemas, _include_name(config)
+            )
+    elif config.server_side_diff:
+        # PostgreSQL computes the missing labels; no defined index is fetched
+        if declared_enums_by_schema is None:
+            declared_enums_by_schema = _get_declared_enums_by_schema(
+                config, metadata_list, default_schema
+            )
+        ops = _diff_enums_server_side(
+            config, connection, schemas, declared_enums_by_schema
         )
+    elif config.stream_catalog_batch_size:
+        # Rows are diffed as they arrive; no defined index is kept
+        if declared_enums_by_schema is None:
+            declared_enums_by_schema = _get_declared_enums_by_schema(
+                config, metadata_list, default_schema
+            )
+        ops = _diff_enums_streaming(
+            config,
+            connection,
+            schemas,
+            declared_enums_by_schema,
+            config.stream_catalog_batch_size,
+        )
+    else:
+        if config.pipelined and declared_enums_by_schema is None:
+            declared_enums_by_schema, defined_enums_by_schema = (
+                _get_enum_indexes_pipelined(
+                    config,
+                    connection,
+                    metadata_list,
+                    default_schema,
+                    schemas,
+                    catalog_fingerprint,
+                )
+            )
+        else:
+            defined_enums_by_schema = _get_defined_enums_by_schema(
+                config, connection, schemas, catalog_fingerprint
+            )
 
-        # Compare and detect new values
-        for enum_name, declared_values in declared_enums.items():
-            if enum_name not in defined_enums:
-                # Enum doesn't exist in database - skip (let standard Alembic handle enum creation)
-                continue
+    if defined_enums_by_schema:
+        if declared_enums_by_schema is None:
+            declared_enums_by_schema = _get_declared_enums_by_schema(
+                config, metadata_list, default_schema
+            )
+        with _span(config, PHASE_DIFF):
+            ops = _diff_enums(
+                schemas, declared_enums_by_schema, defined_enums_by_schema
+            )
 
-            defined_values = defined_enums[enum_name]
+    with _span(config, PHASE_EMIT):
+        emitted = _emitted_ops(config, ops)
+        upgrade_ops.ops.extend(emitted)
 
-            # Find new values (values in declared but not in defined)
-            new_values = [
-                value for value in declared_values if value not in defined_values
-            ]
+        if cache is not None and cache_key is not None:
+            cache.store(cache_key, ops)
 
-            # Generate AddEnumValueOp for each new value
-            for value in new_values:
-                upgrade_ops.ops.append(
-                    AddEnumValueOp(
-                        enum_schema=schema,
-                        enum_name=enum_name,
-                        value=value,
-                    )
-                )
+    if config.instrumentation is not None:
+        config.instrumentation.count(COUNTER_OPS_PRODUCED, len(emitted))
@@ -1,10 +1,50 @@
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from .enum_registry import DeclaredEnumRegistry
+    from .filters import EnumFilter
+    from .instrumentation import Instrumentation
+    from .lock_retry import LockRetryPolicy
+    from .preflight import PreflightPolicy
 
 
 @dataclass
 class Config:
     include_name: Optional[Callable[[str], bool]] = None
+    # Declarative enum/schema name filter, pushed into the catalog query
+    enum_filter: Optional["EnumFilter"] = None
+    # Live declared-enum index used instead of walking the metadata
+    declared_enum_registry: Optional["DeclaredEnumRegistry"] = None
+    # Directory of the on-disk comparison cache; disabled when None
+    cache_dir: Optional[str] = None
+    # Probe the catalog fingerprint and reuse enum snapshots while it matches
+    reuse_catalog_snapshots: bool = False
+    # Introspect schemas one query each over this many parallel connections
+    introspection_workers: Optional[int] = None
+    # Fetch the catalog on a background thread while the metadata is walked
+    pipelined: bool = False
+    # Let PostgreSQL compute the missing labels instead of fetching all labels
+    server_side_diff: bool = False
+    # Stream the catalog in batches of this many rows, keeping only declared enums
+    stream_catalog_batch_size: Optional[int] = None
+    # Emit one AddEnumValuesOp per enum type with several new values
+    group_enum_values: bool = False
+    # Render ADD VALUE IF NOT EXISTS so reruns after a partial deploy are no-ops
+    add_value_if_not_exists: bool = False
+    # Render ops that skip labels already present, checked with one catalog read
+    skip_existing_values: bool = False
+    # Wrap the additions in one op.add_enum_values_block using this strategy:
+    # "auto", "transaction" or "autocommit"; emitted unwrapped when None
+    add_value_strategy: Optional[str] = None
+    # Bound the wait for the enum type lock and retry when applying additions
+    lock_retry: Optional["LockRetryPolicy"] = None
+    # Check for sessions locking the enum types before altering them
+    preflight: Optional["PreflightPolicy"] = None
+    # Catalog snapshot file read instead of querying the database
+    catalog_snapshot: Optional[str] = None
+    # Receiver of per-phase timings and counters; disabled when None
+    instrumentation: Optional["Instrumentation"] = None
 
 
 _configuration: Optional[Config] = None
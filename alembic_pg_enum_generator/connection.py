@@ -15,3 +15,32 @@ def get_connection(operations: Any) -> Iterator[sqlalchemy.engine.Connection]:
         yield binding
         return
     yield binding.connect()
+
+
+# First server_version_num that allows ALTER TYPE ... ADD VALUE in a
+# transaction block
+TRANSACTIONAL_ADD_VALUE_VERSION_NUM = 120000
+
+# connection.info key holding the cached server_version_num
+_SERVER_VERSION_INFO_KEY = "alembic_pg_enum_generator.server_version_num"
+
+
+def get_server_version_num(connection: sqlalchemy.engine.Connection) -> int:
+    """
+    Return the PostgreSQL ``server_version_num`` (e.g. 120004 for 12.4).
+
+    The setting is queried once per connection and cached in
+    ``connection.info``.
+    """
+    try:
+        return int(connection.info[_SERVER_VERSION_INFO_KEY])
+    except KeyError:
+        pass
+
+    version_num = int(
+        connection.execute(
+            sqlalchemy.text("SELECT current_setting('server_version_num')")
+        ).scalar_one()
+    )
+    connection.info[_SERVER_VERSION_INFO_KEY] = version_num
+    return version_num
@@ -1,9 +1,29 @@
-from typing import Any, Callable, List, Optional, Tuple, Union
+import weakref
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 import sqlalchemy
 from sqlalchemy import MetaData
 
-from .types import EnumNamesToValues
+from .instrumentation import (
+    COUNTER_ENUM_COLUMNS,
+    COUNTER_TABLES_SCANNED,
+    PHASE_METADATA_WALK,
+    span,
+)
+from .types import EnumNamesToValues, SchemaNamesToEnums
+
+if TYPE_CHECKING:
+    from .instrumentation import Instrumentation
 
 
 def get_enum_values(enum_type: Union[sqlalchemy.Enum, Any]) -> Tuple[str, ...]:
@@ -38,63 +58,194 @@ def column_type_is_enum(column_type: Any) -> bool:
     return False
 
 
-def get_declared_enums(
+# Named native enum behind a column type: (name, schema, labels)
+DeclaredEnum = Tuple[str, Optional[str], Tuple[str, ...]]
+
+# Resolved enum type and its labels per column type object; Enum instances are
+# shared by many columns. The enum is held weakly so an Enum keyed on itself
+# can still be collected, and name/schema are read live because inherit_schema
+# enums only get their schema when attached to a table.
+_CachedEnum = Tuple["weakref.ref[sqlalchemy.Enum]", Tuple[str, ...]]
+_declared_enum_cache: "weakref.WeakKeyDictionary[Any, Optional[_CachedEnum]]" = (
+    weakref.WeakKeyDictionary()
+)
+# Type classes that can neither be nor wrap an enum, e.g. Integer or String
+_non_enum_type_classes: "weakref.WeakSet[type]" = weakref.WeakSet()
+
+
+def _resolve_enum_type(column_type: Any) -> Optional[sqlalchemy.Enum]:
+    """Unwrap TypeDecorator/ARRAY chains down to a named native enum."""
+    wrapped = False
+    while True:
+        if isinstance(column_type, sqlalchemy.types.TypeDecorator):
+            column_type = column_type.impl
+            wrapped = True
+        elif isinstance(column_type, sqlalchemy.ARRAY):
+            column_type = column_type.item_type
+        else:
+            break
+
+    if not isinstance(column_type, sqlalchemy.Enum):
+        return None
+
+    # Non-native enums are only accepted behind a TypeDecorator, as before
+    if not (column_type.native_enum or wrapped) or not column_type.name:
+        return None
+
+    return column_type
+
+
+def _declared_enum_type(
+    column_type: Any,
+) -> Optional[Tuple[sqlalchemy.Enum, Tuple[str, ...]]]:
+    """Return the named native enum behind a column type and its labels, memoized."""
+    type_class = type(column_type)
+    if type_class in _non_enum_type_classes:
+        return None
+
+    try:
+        cached = _declared_enum_cache[column_type]
+    except KeyError:
+        cached = None
+        enum_type = _resolve_enum_type(column_type)
+        if enum_type is not None:
+            cached = (weakref.ref(enum_type), get_enum_values(enum_type))
+            _declared_enum_cache[column_type] = cached
+        elif issubclass(
+            type_class,
+            (sqlalchemy.Enum, sqlalchemy.types.TypeDecorator, sqlalchemy.ARRAY),
+        ):
+            _declared_enum_cache[column_type] = None
+        else:
+            # The verdict cannot depend on the instance
+            _non_enum_type_classes.add(type_class)
+    except TypeError:
+        # Unhashable or not weakly referenceable - classify every time
+        enum_type = _resolve_enum_type(column_type)
+        if enum_type is None:
+            return None
+        return enum_type, get_enum_values(enum_type)
+
+    if cached is None:
+        return None
+
+    enum_ref, values = cached
+    enum_type = enum_ref()
+    if enum_type is None:
+        # Column types that build their enum on the fly do not keep it alive
+        enum_type = _resolve_enum_type(column_type)
+        if enum_type is None:
+            _declared_enum_cache[column_type] = None
+            return None
+        values = get_enum_values(enum_type)
+        _declared_enum_cache[column_type] = (weakref.ref(enum_type), values)
+    return enum_type, values
+
+
+def _declared_enum(column_type: Any) -> Optional[DeclaredEnum]:
+    """Return the named native enum behind a column type, memoized per type."""
+    declared = _declared_enum_type(column_type)
+    if declared is None:
+        return None
+
+    enum_type, values = declared
+    return (cast(str, enum_type.name), enum_type.schema, values)
+
+
+def get_declared_enums_by_schema(
     metadata: Union[MetaData, List[MetaData]],
-    schema: str,
     default_schema: str,
     include_name: Optional[Callable[[str], bool]] = None,
-) -> EnumNamesToValues:
+    instrumentation: Optional["Instrumentation"] = None,
+) -> SchemaNamesToEnums:
     """
-    Return a dict mapping SQLAlchemy declared enumeration types to their values.
+    Return SQLAlchemy declared enumeration types for every schema at once.
+
+    The metadata is walked a single time and enums are partitioned by their
+    resolved schema, so the result can be reused for all compared schemas.
 
     Args:
         metadata: SQLAlchemy schema metadata
-        schema: Schema name (e.g. "public")
-        default_schema: Default schema name
+        default_schema: Default schema name, used for enums without a schema
         include_name: Optional filter function for enum names
+        instrumentation: Optional receiver of the walk timing and counters
 
     Returns:
-        Dict mapping enum names to their values: {"my_enum": ("a", "b", "c")}
+        Dict mapping schema names to enum names to their values:
+        {"public": {"my_enum": ("a", "b", "c")}}
     """
+    if isinstance(metadata, list):
+        metadata_list = metadata
+    else:
+        metadata_list = [metadata]
+
+    with span(instrumentation, PHASE_METADATA_WALK):
+        return _walk_declared_enums(
+            metadata_list, default_schema, include_name, instrumentation
+        )
+
+
+def _walk_declared_enums(
+    metadata_list: List[MetaData],
+    default_schema: str,
+    include_name: Optional[Callable[[str], bool]],
+    instrumentation: Optional["Instrumentation"] = None,
+) -> SchemaNamesToEnums:
     if include_name is None:
 
         def include_name(_: str) -> bool:
             return True
 
-    enum_name_to_values = {}
-
-    if isinstance(metadata, list):
-        metadata_list = metadata
-    else:
-        metadata_list = [metadata]
+    schema_to_enums: Dict[str, EnumNamesToValues] = {}
+    tables_scanned = 0
+    enum_columns = 0
 
     for metadata in metadata_list:
+        tables_scanned += len(metadata.tables)
         for table in metadata.tables.values():
             for column in table.columns:
-                column_type = column.type
-
-                # Handle array of enums
-                if isinstance(column_type, sqlalchemy.ARRAY):
-                    column_type = column_type.item_type
-
-                if not column_type_is_enum(column_type):
+                declared_enum = _declared_enum(column.type)
+                if declared_enum is None:
                     continue
 
-                # Type guard: at this point we know it's an enum-like type
-                if not hasattr(column_type, "name"):
+                enum_columns += 1
+                enum_name, enum_schema, values = declared_enum
+                if not include_name(enum_name):
                     continue
 
-                if not include_name(column_type.name):  # type: ignore[attr-defined]
-                    continue
-
-                column_type_schema = (
-                    getattr(column_type, "schema", None) or default_schema
+                enum_name_to_values = schema_to_enums.setdefault(
+                    enum_schema or default_schema, {}
                 )
-                if column_type_schema != schema:
-                    continue
-
-                enum_name = column_type.name  # type: ignore[attr-defined]
                 if enum_name not in enum_name_to_values:
-                    enum_name_to_values[enum_name] = get_enum_values(column_type)
+                    enum_name_to_values[enum_name] = values
+
+    if instrumentation is not None:
+        instrumentation.count(COUNTER_TABLES_SCANNED, tables_scanned)
+        instrumentation.count(COUNTER_ENUM_COLUMNS, enum_columns)
+
+    return schema_to_enums
+
+
+def get_declared_enums(
+    metadata: Union[MetaData, List[MetaData]],
+    schema: str,
+    default_schema: str,
+    include_name: Optional[Callable[[str], bool]] = None,
+) -> EnumNamesToValues:
+    """
+    Return a dict mapping SQLAlchemy declared enumeration types to their values.
+
+    Args:
+        metadata: SQLAlchemy schema metadata
+        schema: Schema name (e.g. "public")
+        default_schema: Default schema name
+        include_name: Optional filter function for enum names
 
-    return enum_name_to_values
+    Returns:
+        Dict mapping enum names to their values: {"my_enum": ("a", "b", "c")}
+    """
+    return get_declared_enums_by_schema(
+        metadata=metadata,
+        default_schema=default_schema,
+        include_name=include_name,
+    ).get(schema, {})
@@ -1,52 +1,409 @@
-from typing import TYPE_CHECKING, Any, Callable, Optional
+import json
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
 
 import sqlalchemy
 
-from .types import EnumNamesToValues
+from .instrumentation import (
+    COUNTER_ROWS_FETCHED,
+    COUNTER_SCHEMAS_QUERIED,
+    PHASE_CATALOG_QUERY,
+    PHASE_DECODE,
+    span,
+)
+from .types import (
+    EnumNamesToValues,
+    ExistingEnumLabels,
+    MissingEnumValues,
+    SchemaNamesToEnums,
+)
 
 if TYPE_CHECKING:
-    from sqlalchemy.engine import Connection
+    from sqlalchemy.engine import Connection, Engine
 
+    from .filters import EnumFilter
+    from .instrumentation import Instrumentation
 
-def _extract_enum_name(enum_name: str, schema: str) -> str:
-    """Extract enum name by removing schema prefix and quotes."""
-    # Remove schema
-    schema_prefix = f"{schema}."
-    quoted_schema_prefix = f'"{schema}".'
-    if enum_name.startswith(schema_prefix):
-        enum_name = enum_name[len(schema_prefix) :]
-    elif enum_name.startswith(quoted_schema_prefix):
-        enum_name = enum_name[len(quoted_schema_prefix) :]
 
-    # Remove quotes
-    if enum_name.startswith('"') and enum_name.endswith('"'):
-        enum_name = enum_name[1:-1]
+# One row per enum type with its labels aggregated in sort order. The
+# conditions placeholder takes the pushed-down name filters; enum types without
+# labels yield an empty array.
+_ALL_ENUMS_SQL = """
+    SELECT
+        t.typname,
+        t.oid,
+        array_remove(array_agg(e.enumlabel ORDER BY e.enumsortorder), NULL)
+    FROM pg_catalog.pg_type t
+    JOIN pg_catalog.pg_namespace n ON n.oid = t.typnamespace
+    LEFT JOIN pg_catalog.pg_enum e ON e.enumtypid = t.oid
+    WHERE
+        t.typtype = 'e'
+        AND n.nspname = :schema
+{conditions}    GROUP BY t.oid, t.typname
+"""
 
-    return enum_name
+_ALL_ENUMS_FOR_SCHEMAS_SQL = """
+    SELECT
+        n.nspname,
+        t.typname,
+        t.oid,
+        array_remove(array_agg(e.enumlabel ORDER BY e.enumsortorder), NULL)
+    FROM pg_catalog.pg_type t
+    JOIN pg_catalog.pg_namespace n ON n.oid = t.typnamespace
+    LEFT JOIN pg_catalog.pg_enum e ON e.enumtypid = t.oid
+    WHERE
+        t.typtype = 'e'
+        AND n.nspname = ANY(:schemas)
+{conditions}    GROUP BY n.nspname, t.oid, t.typname
+"""
 
+_CATALOG_FINGERPRINT_SQL = """
+    SELECT
+        count(*),
+        coalesce(max(e.oid), 0),
+        coalesce(md5(string_agg(
+            t.oid::text || ':' || n.nspname || '.' || t.typname || ':'
+                || coalesce(e.enumlabel, '') || ':'
+                || coalesce(e.enumsortorder::text, ''),
+            ',' ORDER BY t.oid, e.enumsortorder
+        )), '')
+    FROM pg_catalog.pg_type t
+    JOIN pg_catalog.pg_namespace n ON n.oid = t.typnamespace
+    LEFT JOIN pg_catalog.pg_enum e ON e.enumtypid = t.oid
+    WHERE
+        t.typtype = 'e'
+        AND n.nspname = ANY(:schemas)
+"""
 
-def get_all_enums(connection: "Connection", schema: str) -> Any:
-    """Query PostgreSQL for all enum types and their values in a schema."""
-    sql = """
+
+# Anti-join of the declared labels against pg_enum, returning only the labels
+# missing from existing enum types together with each type's last label
+_MISSING_ENUM_VALUES_SQL = """
+    WITH declared AS (
+        SELECT d.schema_name, d.type_name, l.label
+        FROM jsonb_to_recordset(CAST(:declared AS jsonb))
+            AS d(schema_name text, type_name text, labels jsonb)
+        CROSS JOIN LATERAL jsonb_array_elements_text(d.labels) AS l(label)
+    ),
+    types AS (
         SELECT
-            pg_catalog.format_type(t.oid, NULL),
-            ARRAY(SELECT enumlabel
-                  FROM pg_catalog.pg_enum
-                  WHERE enumtypid = t.oid
-                  ORDER BY enumsortorder)
-        FROM pg_catalog.pg_type t
-        LEFT JOIN pg_catalog.pg_namespace n ON n.oid = t.typnamespace
-        WHERE
-            t.typtype = 'e'
-            AND n.nspname = :schema
+            d.schema_name,
+            d.type_name,
+            t.oid,
+            (SELECT e.enumlabel
+             FROM pg_catalog.pg_enum e
+             WHERE e.enumtypid = t.oid
+             ORDER BY e.enumsortorder DESC
+             LIMIT 1) AS tail
+        FROM (SELECT DISTINCT schema_name, type_name FROM declared) d
+        JOIN pg_catalog.pg_namespace n ON n.nspname = d.schema_name::name
+        JOIN pg_catalog.pg_type t
+            ON t.typnamespace = n.oid
+            AND t.typname = d.type_name::name
+            AND t.typtype = 'e'
+    )
+    SELECT d.schema_name, d.type_name, d.label, ty.tail
+    FROM declared d
+    JOIN types ty
+        ON ty.schema_name = d.schema_name AND ty.type_name = d.type_name
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM pg_catalog.pg_enum e
+        WHERE e.enumtypid = ty.oid AND e.enumlabel = d.label::name
+    )
+"""
+
+# Every enum label in the database, read once per connection for the
+# pre-check of add value operations
+_ALL_ENUM_LABELS_SQL = """
+    SELECT n.nspname, t.typname, e.enumlabel
+    FROM pg_catalog.pg_enum e
+    JOIN pg_catalog.pg_type t ON t.oid = e.enumtypid
+    JOIN pg_catalog.pg_namespace n ON n.oid = t.typnamespace
+"""
+
+# connection.info key holding the result of _ALL_ENUM_LABELS_SQL
+_EXISTING_LABELS_INFO_KEY = "alembic_pg_enum_generator.existing_enum_labels"
+
+
+def _include_all(_: str) -> bool:
+    return True
+
+
+def _filter_enums_sql(
+    sql: str, params: Dict[str, Any], enum_filter: Optional["EnumFilter"]
+) -> Tuple[str, Dict[str, Any]]:
+    """Push the LIKE-expressible part of an enum filter into a catalog query."""
+    conditions = ""
+    if enum_filter is not None:
+        include, exclude = enum_filter.like_patterns()
+        if include is not None:
+            conditions += "        AND t.typname LIKE ANY(:include_patterns)\n"
+            params["include_patterns"] = include
+        if exclude:
+            conditions += "        AND t.typname NOT LIKE ALL(:exclude_patterns)\n"
+            params["exclude_patterns"] = exclude
+    return sql.format(conditions=conditions), params
+
+
+def _combine_include_name(
+    include_name: Optional[Callable[[str], bool]],
+    enum_filter: Optional["EnumFilter"],
+) -> Optional[Callable[[str], bool]]:
+    """Return a callable applying both ``include_name`` and ``enum_filter``."""
+    if enum_filter is None:
+        return include_name
+    if include_name is None:
+        return enum_filter.include_name
+
+    filter_include_name = enum_filter.include_name
+    extra_include_name = include_name
+
+    def combined(name: str) -> bool:
+        return filter_include_name(name) and extra_include_name(name)
+
+    return combined
+
+
+def _decode_defined_enums(
+    rows: Iterable[Any],
+    include_name: Optional[Callable[[str], bool]],
+) -> EnumNamesToValues:
+    """Decode ``_ALL_ENUMS_SQL`` rows into an enum index."""
+    if include_name is None:
+        include_name = _include_all
+
+    return {
+        enum_name: tuple(values)
+        for enum_name, _, values in rows
+        if include_name(enum_name)
+    }
+
+
+def _decode_defined_enums_by_schema(
+    rows: Iterable[Any],
+    include_name: Optional[Callable[[str], bool]],
+) -> SchemaNamesToEnums:
+    """Decode ``_ALL_ENUMS_FOR_SCHEMAS_SQL`` rows into a per-schema enum index."""
+    if include_name is None:
+        include_name = _include_all
+
+    schema_to_enums: Dict[str, EnumNamesToValues] = {}
+    for schema, enum_name, _, values in rows:
+        if include_name(enum_name):
+            schema_to_enums.setdefault(schema, {})[enum_name] = tuple(values)
+    return schema_to_enums
+
+
+def _format_catalog_fingerprint(row: Any) -> str:
+    count, max_oid, digest = row
+    return f"{count}:{max_oid}:{digest}"
+
+
+def get_all_enums(
+    connection: "Connection",
+    schema: str,
+    enum_filter: Optional["EnumFilter"] = None,
+) -> Any:
+    """Query PostgreSQL for all enum types and their values in a schema."""
+    sql, params = _filter_enums_sql(_ALL_ENUMS_SQL, {"schema": schema}, enum_filter)
+    return connection.execute(sqlalchemy.text(sql), params)
+
+
+def get_all_enums_for_schemas(
+    connection: "Connection",
+    schemas: Sequence[str],
+    enum_filter: Optional["EnumFilter"] = None,
+) -> Any:
+    """Query PostgreSQL for all enum types and their values in several schemas."""
+    sql, params = _filter_enums_sql(
+        _ALL_ENUMS_FOR_SCHEMAS_SQL, {"schemas": list(schemas)}, enum_filter
+    )
+    return connection.execute(sqlalchemy.text(sql), params)
+
+
+def get_catalog_fingerprint(connection: "Connection", schemas: Sequence[str]) -> str:
+    """
+    Return a compact fingerprint of the enum catalog for several schemas.
+
+    The fingerprint combines the number of labels, the highest pg_enum oid and
+    an aggregate hash of every (type, label, sort order) so any added, renamed
+    or reordered label changes it. Enum types without labels are included.
+    """
+    row = connection.execute(
+        sqlalchemy.text(_CATALOG_FINGERPRINT_SQL), {"schemas": list(schemas)}
+    ).one()
+    return _format_catalog_fingerprint(row)
+
+
+def iter_defined_enums(
+    connection: "Connection",
+    schemas: Sequence[str],
+    enum_filter: Optional["EnumFilter"] = None,
+    batch_size: int = 1000,
+) -> Iterator[Tuple[str, str, Tuple[str, ...]]]:
     """
-    return connection.execute(sqlalchemy.text(sql), {"schema": schema})
+    Stream PostgreSQL defined enumeration types through a server-side cursor.
+
+    Rows are fetched ``batch_size`` at a time, so memory stays bounded no
+    matter how many enum types the schemas contain. The result must be
+    consumed before the connection is used for anything else.
+
+    Args:
+        connection: SQLAlchemy connection instance
+        schemas: Schema names (e.g. ["public", "tenant_1"])
+        enum_filter: Optional declarative filter, pushed into the query
+        batch_size: Number of rows fetched per round-trip
+
+    Yields:
+        (schema, enum name, values) for every enum type
+    """
+    if not schemas:
+        return
+
+    sql, params = _filter_enums_sql(
+        _ALL_ENUMS_FOR_SCHEMAS_SQL, {"schemas": list(schemas)}, enum_filter
+    )
+    # yield_per is not available for Core statements on SQLAlchemy 1.4;
+    # partitions() fetches the same fixed-size batches from the cursor
+    statement = sqlalchemy.text(sql).execution_options(stream_results=True)
+    result = connection.execute(statement, params)
+    try:
+        for partition in result.partitions(batch_size):
+            for schema, enum_name, _, values in partition:
+                yield schema, enum_name, tuple(values)
+    finally:
+        result.close()
+
+
+def get_missing_enum_values(
+    connection: "Connection",
+    declared_enums_by_schema: SchemaNamesToEnums,
+    instrumentation: Optional["Instrumentation"] = None,
+) -> MissingEnumValues:
+    """
+    Let PostgreSQL compute which declared labels are missing from existing enums.
+
+    The declared index is sent as one JSON parameter and anti-joined against
+    pg_enum, so only the missing labels come back instead of every label of
+    every enum. Enum types that do not exist in the database, or that already
+    have every declared label, are absent from the result.
+
+    Args:
+        connection: SQLAlchemy connection instance
+        declared_enums_by_schema: Declared enums per schema, as returned by
+            ``get_declared_enums_by_schema``
+        instrumentation: Optional receiver of the query timing and counters
+
+    Returns:
+        Dict mapping (schema, enum name) to the missing labels and the last
+        label of the type in database order (None if it has no labels)
+    """
+    declared = [
+        {"schema_name": schema, "type_name": name, "labels": list(values)}
+        for schema, enums in declared_enums_by_schema.items()
+        for name, values in enums.items()
+        if values
+    ]
+    if not declared:
+        return {}
+
+    params = {"declared": json.dumps(declared)}
+    with span(instrumentation, PHASE_CATALOG_QUERY):
+        rows = list(
+            connection.execute(sqlalchemy.text(_MISSING_ENUM_VALUES_SQL), params)
+        )
+    if instrumentation is not None:
+        instrumentation.count(COUNTER_SCHEMAS_QUERIED, len(declared_enums_by_schema))
+        instrumentation.count(COUNTER_ROWS_FETCHED, len(rows))
+
+    missing: Dict[Tuple[str, str], Set[str]] = {}
+    tails: Dict[Tuple[str, str], Optional[str]] = {}
+    for schema, name, label, tail in rows:
+        missing.setdefault((schema, name), set()).add(label)
+        tails[(schema, name)] = tail
+
+    return {key: (frozenset(labels), tails[key]) for key, labels in missing.items()}
+
+
+def _cached_enum_labels(connection: "Connection") -> Optional[ExistingEnumLabels]:
+    """Return the labels cached for the current transaction, if any."""
+    cached = connection.info.get(_EXISTING_LABELS_INFO_KEY)
+    if cached is None:
+        return None
+
+    transaction_ref, existing = cached
+    transaction = connection.get_transaction()
+    if transaction is None or transaction_ref() is not transaction:
+        return None
+    return cast(ExistingEnumLabels, existing)
+
+
+def _decode_existing_enum_labels(rows: Iterable[Any]) -> ExistingEnumLabels:
+    existing: ExistingEnumLabels = {}
+    for schema, enum_name, label in rows:
+        existing.setdefault((schema, enum_name), set()).add(label)
+    return existing
+
+
+def get_existing_enum_labels(connection: "Connection") -> ExistingEnumLabels:
+    """
+    Return the labels of every enum type, read once per transaction.
+
+    The result is cached in ``connection.info`` for the current transaction;
+    operations that add labels through :func:`record_enum_labels` keep it
+    current, so repeated pre-checks within a migration cost no further
+    queries. ``connection.info`` outlives the checkout, so the labels are read
+    again once the transaction ended, e.g. after a failed migration rolled
+    back the labels it recorded.
+    """
+    existing = _cached_enum_labels(connection)
+    if existing is not None:
+        return existing
+
+    existing = _decode_existing_enum_labels(
+        connection.execute(sqlalchemy.text(_ALL_ENUM_LABELS_SQL))
+    )
+    transaction = connection.get_transaction()
+    if transaction is None:
+        # Nothing to scope the cache to
+        connection.info.pop(_EXISTING_LABELS_INFO_KEY, None)
+    else:
+        connection.info[_EXISTING_LABELS_INFO_KEY] = (
+            weakref.ref(transaction),
+            existing,
+        )
+    return existing
+
+
+def record_enum_labels(
+    connection: "Connection", schema: str, enum_name: str, labels: Iterable[str]
+) -> None:
+    """Add ``labels`` to the cached labels of a type, if they were read."""
+    existing = _cached_enum_labels(connection)
+    if existing is not None:
+        existing.setdefault((schema, enum_name), set()).update(labels)
 
 
 def get_defined_enums(
     connection: "Connection",
     schema: str,
     include_name: Optional[Callable[[str], bool]] = None,
+    enum_filter: Optional["EnumFilter"] = None,
 ) -> EnumNamesToValues:
     """
     Return a dict mapping PostgreSQL defined enumeration types to their values.
@@ -55,20 +412,108 @@ def get_defined_enums(
         connection: SQLAlchemy connection instance
         schema: Schema name (e.g. "public")
         include_name: Optional filter function for enum names
+        enum_filter: Optional declarative filter, pushed into the query
 
     Returns:
         Dict mapping enum names to their values: {"my_enum": ("a", "b", "c")}
     """
-    if include_name is None:
+    return _decode_defined_enums(
+        get_all_enums(connection, schema, enum_filter),
+        _combine_include_name(include_name, enum_filter),
+    )
 
-        def include_name(_: str) -> bool:
-            return True
 
-    return {
-        enum_name: tuple(values)
-        for enum_name, values in (
-            (_extract_enum_name(name, schema), values)
-            for name, values in get_all_enums(connection, schema)
-        )
-        if include_name(enum_name)
-    }
+def get_defined_enums_by_schema(
+    connection: "Connection",
+    schemas: Sequence[str],
+    include_name: Optional[Callable[[str], bool]] = None,
+    instrumentation: Optional["Instrumentation"] = None,
+    enum_filter: Optional["EnumFilter"] = None,
+) -> SchemaNamesToEnums:
+    """
+    Return PostgreSQL defined enumeration types for several schemas at once.
+
+    All schemas are introspected with a single catalog query. Schemas that
+    contain no enum types are absent from the result.
+
+    Args:
+        connection: SQLAlchemy connection instance
+        schemas: Schema names (e.g. ["public", "tenant_1"])
+        include_name: Optional filter function for enum names
+        instrumentation: Optional receiver of query/decode timings and counters
+        enum_filter: Optional declarative filter, pushed into the query
+
+    Returns:
+        Dict mapping schema names to enum names to their values:
+        {"public": {"my_enum": ("a", "b", "c")}}
+    """
+    if not schemas:
+        return {}
+
+    include_name = _combine_include_name(include_name, enum_filter)
+
+    # Fetch all rows up front so query and decode time are reported apart
+    with span(instrumentation, PHASE_CATALOG_QUERY):
+        rows = list(get_all_enums_for_schemas(connection, schemas, enum_filter))
+    if instrumentation is not None:
+        instrumentation.count(COUNTER_SCHEMAS_QUERIED, len(schemas))
+        instrumentation.count(COUNTER_ROWS_FETCHED, len(rows))
+
+    with span(instrumentation, PHASE_DECODE):
+        return _decode_defined_enums_by_schema(rows, include_name)
+
+
+def get_defined_enums_parallel(
+    engine: "Engine",
+    schemas: Sequence[str],
+    include_name: Optional[Callable[[str], bool]] = None,
+    max_workers: int = 4,
+    instrumentation: Optional["Instrumentation"] = None,
+    enum_filter: Optional["EnumFilter"] = None,
+) -> SchemaNamesToEnums:
+    """
+    Return PostgreSQL defined enumeration types, one query per schema in parallel.
+
+    Each schema is introspected on its own short-lived connection checked out
+    from ``engine``, with at most ``max_workers`` queries in flight. This is
+    meant for setups where the single multi-schema query cannot be used, e.g.
+    per-schema permissions. Results are merged in the order of ``schemas`` and
+    schemas that contain no enum types are absent from the result.
+
+    Args:
+        engine: SQLAlchemy engine to check connections out from
+        schemas: Schema names (e.g. ["public", "tenant_1"])
+        include_name: Optional filter function for enum names
+        max_workers: Maximum number of concurrent connections
+        instrumentation: Optional receiver of query/decode timings and counters
+        enum_filter: Optional declarative filter, pushed into the queries
+
+    Returns:
+        Dict mapping schema names to enum names to their values:
+        {"public": {"my_enum": ("a", "b", "c")}}
+    """
+
+    def fetch(schema: str) -> List[Any]:
+        with engine.connect() as connection:
+            return list(get_all_enums(connection, schema, enum_filter))
+
+    if not schemas:
+        return {}
+
+    include_name = _combine_include_name(include_name, enum_filter)
+
+    # Workers only fetch rows; decoding happens here once connections are back
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        with span(instrumentation, PHASE_CATALOG_QUERY):
+            results = list(executor.map(fetch, schemas))
+    if instrumentation is not None:
+        instrumentation.count(COUNTER_SCHEMAS_QUERIED, len(schemas))
+        instrumentation.count(COUNTER_ROWS_FETCHED, sum(len(rows) for rows in results))
+
+    schema_to_enums: SchemaNamesToEnums = {}
+    with span(instrumentation, PHASE_DECODE):
+        for schema, rows in zip(schemas, results):
+            enums = _decode_defined_enums(rows, include_name)
+            if enums:
+                schema_to_enums[schema] = enums
+    return schema_to_enums
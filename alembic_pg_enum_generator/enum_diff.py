@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import AbstractSet, List, Optional, Sequence, Set
+
+
+@dataclass(frozen=True)
+class EnumValueAddition:
+    """A label missing from a PostgreSQL enum, with its placement.
+
+    ``before``/``after`` name the existing label the new one must be placed
+    next to so the database order follows the declared order. Both are None
+    when the label is simply appended at the end.
+    """
+
+    value: str
+    before: Optional[str] = None
+    after: Optional[str] = None
+
+
+def diff_enum_values(
+    declared: Sequence[str], defined: Sequence[str]
+) -> List[EnumValueAddition]:
+    """
+    Return the declared labels missing from the defined enum, in declared order.
+
+    Runs in O(len(declared) + len(defined)) using a hashed label index. Each
+    missing label is placed after its nearest preceding label in declared
+    order (which exists by the time it is added). Labels declared before every
+    existing label are placed before the first existing one instead.
+
+    Args:
+        declared: Labels declared in SQLAlchemy, in declared order
+        defined: Labels defined in PostgreSQL, in enumsortorder
+
+    Returns:
+        List of additions in the order they have to be applied
+    """
+    defined_labels = set(defined)
+    missing = {value for value in declared if value not in defined_labels}
+    # Last label in database order; appending after it needs no placement
+    tail = defined[-1] if defined else None
+    return place_missing_values(declared, missing, tail)
+
+
+def place_missing_values(
+    declared: Sequence[str], missing: AbstractSet[str], tail: Optional[str]
+) -> List[EnumValueAddition]:
+    """
+    Return placed additions for labels already known to be missing.
+
+    This is the placement half of ``diff_enum_values`` for callers that got the
+    missing labels elsewhere, e.g. from a server-side diff, without the full
+    list of defined labels.
+
+    Args:
+        declared: Labels declared in SQLAlchemy, in declared order
+        missing: Declared labels that do not exist in PostgreSQL
+        tail: Last label in database order, None for an enum without labels
+
+    Returns:
+        List of additions in the order they have to be applied
+    """
+    first_existing = next((value for value in declared if value not in missing), None)
+
+    additions: List[EnumValueAddition] = []
+    added: Set[str] = set()
+    previous: Optional[str] = None
+
+    for value in declared:
+        if value not in missing or value in added:
+            previous = value
+            continue
+
+        if previous is None:
+            addition = EnumValueAddition(value, before=first_existing)
+        elif previous == tail:
+            addition = EnumValueAddition(value)
+        else:
+            addition = EnumValueAddition(value, after=previous)
+
+        if addition.before is None and addition.after is None:
+            tail = value
+
+        additions.append(addition)
+        added.add(value)
+        previous = value
+
+    return additions
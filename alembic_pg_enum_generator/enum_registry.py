@@ -0,0 +1,157 @@
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+
+import sqlalchemy
+from sqlalchemy import MetaData, event
+
+from .declared_enums import _declared_enum_type
+from .types import EnumNamesToValues, SchemaNamesToEnums
+
+# (schema, enum name); schema is None for enums that use the default schema
+EnumKey = Tuple[Optional[str], str]
+
+
+class DeclaredEnumRegistry:
+    """
+    Opt-in live index of declared enums, maintained from SQLAlchemy events.
+
+    Once a ``MetaData`` is tracked, every table attached to it and every column
+    attached to one of its tables is indexed as it is created, so comparisons
+    never need to rescan ``metadata.tables``. Enum types are bound to their
+    column before the column reaches a table, which is why column attachment is
+    the point where they are picked up. Their name and schema are only read
+    when the index is queried: enums taking the schema of their table or
+    metadata do not have it yet when the column attaches.
+
+    Listeners are global to SQLAlchemy; call ``close()`` (or use the registry as
+    a context manager) when it is no longer needed.
+
+    Usage:
+        registry = DeclaredEnumRegistry(Base.metadata)
+        set_configuration(Config(declared_enum_registry=registry))
+    """
+
+    def __init__(self, metadata: Union[MetaData, List[MetaData], None] = None):
+        self._metadata: weakref.WeakSet[MetaData] = weakref.WeakSet()
+        # Resolved enum types and their labels, in declaration order
+        self._enums: weakref.WeakKeyDictionary[sqlalchemy.Enum, Tuple[str, ...]] = (
+            weakref.WeakKeyDictionary()
+        )
+        # (schema, name) index, rebuilt on lookup once an attach changed it
+        self._keyed: Dict[EnumKey, Tuple[str, ...]] = {}
+        self._version = 0
+        self._keyed_version = 0
+        self._listening = False
+        # Keep references to the bound methods so event.remove() can find them
+        self._table_listener = self._on_table_attach
+        self._column_listener = self._on_column_attach
+
+        if metadata is not None:
+            metadata_list = metadata if isinstance(metadata, list) else [metadata]
+            for item in metadata_list:
+                self.track(item)
+
+    def __enter__(self) -> "DeclaredEnumRegistry":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __contains__(self, key: EnumKey) -> bool:
+        return key in self._index()
+
+    def track(self, metadata: MetaData) -> None:
+        """Index the tables already in ``metadata`` and follow later additions."""
+        if not self._listening:
+            event.listen(sqlalchemy.Table, "after_parent_attach", self._table_listener)
+            event.listen(
+                sqlalchemy.Column, "after_parent_attach", self._column_listener
+            )
+            self._listening = True
+
+        self._metadata.add(metadata)
+        for table in metadata.tables.values():
+            self._add_table(table)
+
+    def refresh(self) -> None:
+        """Rebuild the index from scratch, e.g. after tables were removed."""
+        self._enums.clear()
+        self._version += 1
+        for metadata in list(self._metadata):
+            for table in metadata.tables.values():
+                self._add_table(table)
+
+    def close(self) -> None:
+        """Stop listening to SQLAlchemy events."""
+        if self._listening:
+            event.remove(sqlalchemy.Table, "after_parent_attach", self._table_listener)
+            event.remove(
+                sqlalchemy.Column, "after_parent_attach", self._column_listener
+            )
+            self._listening = False
+
+    def get(self, name: str, schema: Optional[str] = None) -> Optional[Tuple[str, ...]]:
+        """Return the declared values of an enum, or None if it is unknown."""
+        return self._index().get((schema, name))
+
+    def by_schema(
+        self,
+        default_schema: str,
+        include_name: Optional[Callable[[str], bool]] = None,
+    ) -> SchemaNamesToEnums:
+        """
+        Return the index in the same shape as ``get_declared_enums_by_schema``.
+
+        Args:
+            default_schema: Default schema name, used for enums without a schema
+            include_name: Optional filter function for enum names
+        """
+        schema_to_enums: Dict[str, EnumNamesToValues] = {}
+        for (schema, enum_name), values in self._index().items():
+            if include_name is not None and not include_name(enum_name):
+                continue
+            enum_name_to_values = schema_to_enums.setdefault(
+                schema or default_schema, {}
+            )
+            if enum_name not in enum_name_to_values:
+                enum_name_to_values[enum_name] = values
+        return schema_to_enums
+
+    def _index(self) -> Dict[EnumKey, Tuple[str, ...]]:
+        """Return the tracked enums keyed on (schema, name)."""
+        if self._keyed_version != self._version:
+            # Schemas are read here rather than in the attach handlers, since
+            # enums taking the table or metadata schema get it after the
+            # column attached
+            keyed: Dict[EnumKey, Tuple[str, ...]] = {}
+            for enum_type, values in list(self._enums.items()):
+                keyed.setdefault((enum_type.schema, cast(str, enum_type.name)), values)
+            self._keyed = keyed
+            self._keyed_version = self._version
+        return self._keyed
+
+    def _on_table_attach(self, table: sqlalchemy.Table, parent: Any) -> None:
+        if parent in self._metadata:
+            self._add_table(table)
+
+    def _on_column_attach(self, column: sqlalchemy.Column, parent: Any) -> None:
+        if getattr(parent, "metadata", None) in self._metadata:
+            self._add_column(column)
+
+    def _add_table(self, table: sqlalchemy.Table) -> None:
+        for column in table.columns:
+            self._add_column(column)
+
+    def _add_column(self, column: sqlalchemy.Column) -> None:
+        declared = _declared_enum_type(column.type)
+        if declared is None:
+            return
+
+        enum_type, values = declared
+        if enum_type not in self._enums:
+            self._enums[enum_type] = values
+        # Attaching may also have given a known enum its schema
+        self._version += 1
@@ -0,0 +1,126 @@
+import fnmatch
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+# Characters with a special meaning in SQL LIKE patterns
+_LIKE_SPECIAL = re.compile(r"([\\%_])")
+
+
+def _compile(patterns: Sequence[str], regex: bool) -> Optional[Pattern[str]]:
+    """Compile patterns into one alternation matched against the whole name."""
+    if not patterns:
+        return None
+    if regex:
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def _glob_to_like(pattern: str) -> Optional[str]:
+    """Translate a glob to an equivalent LIKE pattern, if there is one."""
+    if "[" in pattern:
+        # Character classes have no LIKE equivalent
+        return None
+    escaped = _LIKE_SPECIAL.sub(r"\\\1", pattern)
+    return escaped.replace("*", "%").replace("?", "_")
+
+
+def _globs_to_like(patterns: Sequence[str]) -> Optional[List[str]]:
+    like_patterns = []
+    for pattern in patterns:
+        like_pattern = _glob_to_like(pattern)
+        if like_pattern is None:
+            return None
+        like_patterns.append(like_pattern)
+    return like_patterns
+
+
+@dataclass(frozen=True)
+class EnumFilter:
+    """
+    Declarative include/exclude lists for enum and schema names.
+
+    Patterns are shell-style globs (``*_status``) or, with ``regex=True``,
+    regular expressions; both must match the whole name. A name is included
+    when it matches any include pattern (or there are none) and no exclude
+    pattern. Results are memoized per name.
+
+    Glob enum name patterns are also pushed into the catalog query, so enum
+    types that are filtered out are never fetched.
+    """
+
+    include: Sequence[str] = ()
+    exclude: Sequence[str] = ()
+    include_schemas: Sequence[str] = ()
+    exclude_schemas: Sequence[str] = ()
+    regex: bool = False
+
+    _include: Optional[Pattern[str]] = field(init=False, repr=False, compare=False)
+    _exclude: Optional[Pattern[str]] = field(init=False, repr=False, compare=False)
+    _include_schemas: Optional[Pattern[str]] = field(
+        init=False, repr=False, compare=False
+    )
+    _exclude_schemas: Optional[Pattern[str]] = field(
+        init=False, repr=False, compare=False
+    )
+    _names: Dict[str, bool] = field(init=False, repr=False, compare=False)
+    _schemas: Dict[str, bool] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for name in ("include", "exclude", "include_schemas", "exclude_schemas"):
+            patterns = tuple(getattr(self, name))
+            object.__setattr__(self, name, patterns)
+            object.__setattr__(self, f"_{name}", _compile(patterns, self.regex))
+        object.__setattr__(self, "_names", {})
+        object.__setattr__(self, "_schemas", {})
+
+    def include_name(self, name: str) -> bool:
+        """Return whether an enum name passes the filter."""
+        try:
+            return self._names[name]
+        except KeyError:
+            included = self._names[name] = self._matches(
+                name, self._include, self._exclude
+            )
+            return included
+
+    def include_schema(self, schema: str) -> bool:
+        """Return whether a schema name passes the filter."""
+        try:
+            return self._schemas[schema]
+        except KeyError:
+            included = self._schemas[schema] = self._matches(
+                schema, self._include_schemas, self._exclude_schemas
+            )
+            return included
+
+    def like_patterns(self) -> Tuple[Optional[List[str]], List[str]]:
+        """
+        Return the enum name filter as SQL LIKE patterns.
+
+        Returns:
+            ``(include, exclude)`` where ``include`` is None when the include
+            list cannot be expressed with LIKE (or is empty) and ``exclude``
+            only holds patterns that translate exactly. Names passing these
+            patterns still have to pass ``include_name``.
+        """
+        if self.regex:
+            return None, []
+
+        include = _globs_to_like(self.include) if self.include else None
+        exclude = [
+            like_pattern
+            for like_pattern in map(_glob_to_like, self.exclude)
+            if like_pattern is not None
+        ]
+        return include, exclude
+
+    @staticmethod
+    def _matches(
+        name: str,
+        include: Optional[Pattern[str]],
+        exclude: Optional[Pattern[str]],
+    ) -> bool:
+        if include is not None and include.fullmatch(name) is None:
+            return False
+        return exclude is None or exclude.fullmatch(name) is None
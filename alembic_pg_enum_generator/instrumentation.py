@@ -0,0 +1,75 @@
+"""
+Instrumentation hooks for the enum autogenerate pass.
+
+Set ``Config.instrumentation`` to an ``Instrumentation`` subclass to receive
+per-phase timings and counters from ``compare_enums_for_additions``. When no
+instrumentation is configured none of the hooks run.
+"""
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Dict, Iterator, Optional
+
+# Phases, reported through ``Instrumentation.span``
+PHASE_METADATA_WALK = "metadata_walk"
+PHASE_CATALOG_QUERY = "catalog_query"
+PHASE_DECODE = "decode"
+PHASE_DIFF = "diff"
+PHASE_EMIT = "emit"
+
+# Counters, reported through ``Instrumentation.count``
+COUNTER_TABLES_SCANNED = "tables_scanned"
+COUNTER_ENUM_COLUMNS = "enum_columns"
+COUNTER_SCHEMAS_QUERIED = "schemas_queried"
+COUNTER_ROWS_FETCHED = "rows_fetched"
+COUNTER_OPS_PRODUCED = "ops_produced"
+
+# Shared no-op span used while instrumentation is disabled
+_NO_SPAN = nullcontext()
+
+
+class Instrumentation:
+    """
+    Receiver for phase timings and counters; all hooks default to no-ops.
+
+    Override ``record`` and ``count`` to forward measurements to a metrics
+    backend, or ``span`` itself to open spans in a tracer.
+    """
+
+    @contextmanager
+    def span(self, phase: str) -> Iterator[None]:
+        """Time the enclosed block and report it to ``record``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def record(self, phase: str, seconds: float) -> None:
+        """Called with the duration of every completed phase."""
+
+    def count(self, name: str, value: int) -> None:
+        """Called with counter increments."""
+
+
+def span(
+    instrumentation: Optional[Instrumentation], phase: str
+) -> ContextManager[None]:
+    """Return a span for ``phase`` on ``instrumentation``, or a no-op if None."""
+    if instrumentation is None:
+        return _NO_SPAN
+    return instrumentation.span(phase)
+
+
+class RecordingInstrumentation(Instrumentation):
+    """Instrumentation that accumulates timings and counters in memory."""
+
+    def __init__(self) -> None:
+        self.timings: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def count(self, name: str, value: int) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
@@ -0,0 +1,164 @@
+import random
+import time
+import warnings
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
+
+import sqlalchemy
+import sqlalchemy.exc
+
+from .config import get_configuration
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+# SQLSTATE raised when lock_timeout expires
+_LOCK_NOT_AVAILABLE = "55P03"
+
+# The current lock_timeout, and whether the transaction already wrote (and so
+# holds locks until it ends)
+_CURRENT_LOCK_TIMEOUT_SQL = (
+    "SELECT current_setting('lock_timeout'), txid_current_if_assigned() IS NOT NULL"
+)
+_SET_LOCK_TIMEOUT_SQL = "SELECT set_config('lock_timeout', :value, :is_local)"
+
+
+class LockRetryReport(NamedTuple):
+    """Outcome of one statement run under a :class:`LockRetryPolicy`."""
+
+    statement: str
+    attempts: int
+    # Seconds from the first attempt until success or giving up
+    waited: float
+    succeeded: bool
+
+
+@dataclass(frozen=True)
+class LockRetryPolicy:
+    """
+    Bounded waiting for the enum type lock.
+
+    Each attempt waits at most ``lock_timeout`` seconds for the lock, so the
+    queries queued behind ``ALTER TYPE`` are released quickly when a
+    long-running transaction holds the type. Failed attempts are retried
+    after a jittered exponential backoff until ``deadline`` seconds have
+    passed, after which the lock timeout error is raised. ``on_report`` is
+    called once per statement with a :class:`LockRetryReport`.
+
+    Retries only keep other sessions moving when the additions run outside the
+    migration transaction (``strategy="autocommit"`` or a revision split off
+    by :func:`split_enum_additions`). Inside a transaction that already ran
+    DDL, the locks it took stay held while the retries back off, and a
+    ``UserWarning`` is issued.
+    """
+
+    lock_timeout: float = 1.0
+    deadline: float = 60.0
+    initial_backoff: float = 0.1
+    max_backoff: float = 5.0
+    on_report: Optional[Callable[[LockRetryReport], None]] = None
+
+    def backoff(self, attempt: int) -> float:
+        """Return the full-jitter delay after failed attempt ``attempt``."""
+        ceiling = min(self.max_backoff, self.initial_backoff * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+def _is_lock_timeout(error: sqlalchemy.exc.DBAPIError) -> bool:
+    orig = error.orig
+    # psycopg2 exposes pgcode, psycopg 3 and asyncpg sqlstate
+    code = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return code == _LOCK_NOT_AVAILABLE
+
+
+def _in_autocommit(connection: "Connection") -> bool:
+    # Alembic's autocommit_block switches the isolation level this way
+    isolation_level = connection.get_execution_options().get("isolation_level")
+    return bool(isolation_level == "AUTOCOMMIT")
+
+
+def _set_lock_timeout(connection: "Connection", value: str, is_local: bool) -> None:
+    connection.execute(
+        sqlalchemy.text(_SET_LOCK_TIMEOUT_SQL),
+        {"value": value, "is_local": is_local},
+    )
+
+
+def _attempt(
+    connection: "Connection", statement: Any, lock_timeout: str, original: str
+) -> None:
+    """Run ``statement`` once with ``lock_timeout``, restoring ``original``."""
+    if _in_autocommit(connection):
+        # No transaction to scope the setting to; reset it on the session
+        _set_lock_timeout(connection, lock_timeout, is_local=False)
+        try:
+            connection.execute(statement)
+        finally:
+            _set_lock_timeout(connection, original, is_local=False)
+        return
+
+    # A savepoint keeps the migration transaction usable after a timeout and
+    # undoes the local setting; on success it is restored explicitly since it
+    # would otherwise last until the transaction ends
+    with connection.begin_nested():
+        _set_lock_timeout(connection, lock_timeout, is_local=True)
+        connection.execute(statement)
+        _set_lock_timeout(connection, original, is_local=True)
+
+
+def execute_with_lock_retry(
+    connection: "Connection", statement: str, policy: LockRetryPolicy
+) -> None:
+    """
+    Execute ``statement`` with a short ``lock_timeout``, retrying on timeouts.
+
+    Inside a transaction every attempt runs in a savepoint with ``SET LOCAL``
+    semantics; in autocommit mode the session setting is changed and reset.
+    Errors other than lock timeouts are raised immediately.
+    """
+    lock_timeout = f"{max(1, round(policy.lock_timeout * 1000))}ms"
+    text = sqlalchemy.text(statement)
+    original, holds_locks = connection.execute(
+        sqlalchemy.text(_CURRENT_LOCK_TIMEOUT_SQL)
+    ).one()
+    if holds_locks and not _in_autocommit(connection):
+        warnings.warn(
+            "Retrying enum value additions inside a transaction that already "
+            "holds locks; other sessions stay blocked on them while it waits. "
+            "Use strategy='autocommit' or split_enum_additions to run them in "
+            "their own transaction.",
+            stacklevel=2,
+        )
+    start = time.monotonic()
+    attempts = 0
+
+    while True:
+        attempts += 1
+        try:
+            _attempt(connection, text, lock_timeout, original)
+        except sqlalchemy.exc.DBAPIError as error:
+            waited = time.monotonic() - start
+            remaining = policy.deadline - waited
+            if not _is_lock_timeout(error) or remaining <= 0:
+                if policy.on_report is not None:
+                    policy.on_report(
+                        LockRetryReport(statement, attempts, waited, False)
+                    )
+                raise
+            time.sleep(min(policy.backoff(attempts), remaining))
+            continue
+
+        if policy.on_report is not None:
+            policy.on_report(
+                LockRetryReport(statement, attempts, time.monotonic() - start, True)
+            )
+        return
+
+
+def execute_add_value_statement(connection: "Connection", statement: str) -> None:
+    """Execute an enum addition under the configured lock retry policy, if any."""
+    policy = get_configuration().lock_retry
+    if policy is None:
+        connection.execute(sqlalchemy.text(statement))
+    else:
+        execute_with_lock_retry(connection, statement, policy)
@@ -0,0 +1,145 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import alembic.operations.ops
+
+from .add_enum_value_op import AddEnumValueOp
+from .add_enum_values_block_op import AddEnumValuesBlockOp
+from .add_enum_values_op import AddEnumValuesOp
+from .connection import TRANSACTIONAL_ADD_VALUE_VERSION_NUM, get_server_version_num
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+EnumType = Tuple[Optional[str], str]
+
+
+class EnumValuesApplyError(RuntimeError):
+    """Raised when the additions to some enum types failed."""
+
+    def __init__(self, errors: Dict[EnumType, Exception], applied: List[EnumType]):
+        self.errors = errors
+        self.applied = applied
+        super().__init__(
+            f"Adding enum values failed for {len(errors)} type(s): "
+            + "; ".join(
+                f"{_format_type(enum_type)}: {error}"
+                for enum_type, error in errors.items()
+            )
+        )
+
+
+def _format_type(enum_type: EnumType) -> str:
+    schema, enum_name = enum_type
+    return f"{schema}.{enum_name}" if schema else enum_name
+
+
+def _canonical_key(enum_type: EnumType) -> Tuple[str, str]:
+    schema, enum_name = enum_type
+    return schema or "", enum_name
+
+
+def group_ops_by_type(
+    ops: Iterable[alembic.operations.ops.MigrateOperation],
+) -> Dict[EnumType, AddEnumValuesOp]:
+    """
+    Group enum value operations into one ``AddEnumValuesOp`` per type.
+
+    Values keep their relative order within a type; types are returned in
+    canonical (schema, name) order. Block operations are flattened.
+
+    Raises:
+        TypeError: If an operation is not an enum value operation
+        ValueError: If values of one type have different ``if_not_exists`` or
+            ``skip_existing`` flags
+    """
+    value_ops: Dict[EnumType, List[AddEnumValueOp]] = {}
+
+    def add(op: alembic.operations.ops.MigrateOperation) -> None:
+        if isinstance(op, AddEnumValuesBlockOp):
+            for wrapped_op in op.ops:
+                add(wrapped_op)
+        elif isinstance(op, AddEnumValuesOp):
+            for value_op in op.to_value_ops():
+                add(value_op)
+        elif isinstance(op, AddEnumValueOp):
+            value_ops.setdefault((op.enum_schema, op.enum_name), []).append(op)
+        else:
+            raise TypeError(f"Not an enum value operation: {op!r}")
+
+    for op in ops:
+        add(op)
+
+    return {
+        enum_type: AddEnumValuesOp.from_value_ops(value_ops[enum_type])
+        for enum_type in sorted(value_ops, key=_canonical_key)
+    }
+
+
+def apply_enum_value_ops_parallel(
+    engine: "Engine",
+    ops: Iterable[alembic.operations.ops.MigrateOperation],
+    max_workers: int = 4,
+) -> List[EnumType]:
+    """
+    Apply enum value operations with one worker per enum type.
+
+    Alterations of different enum types take independent locks, so the
+    operations are grouped by (schema, name) and each type is altered on its
+    own connection checked out from ``engine``, with at most ``max_workers``
+    types in flight. Types are submitted in canonical (schema, name) order.
+
+    On PostgreSQL 12+ all values of a type are added in one transaction, so
+    each type is either fully altered or untouched. Older servers cannot add
+    values in a transaction; their values are committed one by one, so a
+    failed type may be partially altered (rerun with ``skip_existing`` or
+    ``if_not_exists`` to finish it).
+
+    Args:
+        engine: SQLAlchemy engine to check connections out from
+        ops: AddEnumValueOp, AddEnumValuesOp or AddEnumValuesBlockOp instances
+        max_workers: Maximum number of concurrent connections
+
+    Returns:
+        The altered (schema, name) pairs in canonical order
+
+    Raises:
+        EnumValuesApplyError: after all types were attempted, if any failed;
+            ``errors`` maps each failed type to its exception
+    """
+    groups = group_ops_by_type(ops)
+
+    def apply(op: AddEnumValuesOp) -> None:
+        with engine.connect() as connection:
+            with connection.begin():
+                if (
+                    get_server_version_num(connection)
+                    >= TRANSACTIONAL_ADD_VALUE_VERSION_NUM
+                ):
+                    op.execute(connection)
+                    return
+            # Values cannot be added in a transaction; each one commits alone
+            op.execute(connection.execution_options(isolation_level="AUTOCOMMIT"))
+
+    if not groups:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            enum_type: executor.submit(apply, op) for enum_type, op in groups.items()
+        }
+
+    applied: List[EnumType] = []
+    errors: Dict[EnumType, Exception] = {}
+    for enum_type, future in futures.items():
+        error = future.exception()
+        if error is None:
+            applied.append(enum_type)
+        elif isinstance(error, Exception):
+            errors[enum_type] = error
+        else:
+            raise error
+
+    if errors:
+        raise EnumValuesApplyError(errors, applied)
+    return applied
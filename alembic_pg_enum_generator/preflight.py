@@ -0,0 +1,211 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+import sqlalchemy
+
+from .config import get_configuration
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+# Sessions holding or awaiting a lock on any of the given enum types.
+# ALTER TYPE ... ADD VALUE takes an ExclusiveLock on the type object until
+# commit, so these sessions would block it or queue up behind it.
+_ENUM_LOCK_BLOCKERS_SQL = """
+    SELECT
+        a.pid,
+        n.nspname,
+        t.typname,
+        l.mode,
+        l.granted,
+        a.state,
+        EXTRACT(EPOCH FROM now() - a.xact_start),
+        left(a.query, 200)
+    FROM unnest(CAST(:schemas AS text[]), CAST(:names AS text[]))
+        AS d(schema_name, type_name)
+    JOIN pg_catalog.pg_namespace n ON n.nspname = d.schema_name::name
+    JOIN pg_catalog.pg_type t
+        ON t.typnamespace = n.oid AND t.typname = d.type_name::name
+    JOIN pg_catalog.pg_locks l
+        ON l.locktype = 'object'
+        AND l.classid = 'pg_catalog.pg_type'::regclass
+        AND l.objid = t.oid
+    JOIN pg_catalog.pg_stat_activity a ON a.pid = l.pid
+    WHERE l.pid <> pg_backend_pid()
+    ORDER BY a.xact_start NULLS LAST, a.pid
+"""
+
+# connection.info key holding the enum types checked by an enclosing batch
+_CHECKED_TYPES_INFO_KEY = "alembic_pg_enum_generator.preflight_checked_types"
+
+
+class EnumLockBlocker(NamedTuple):
+    """A session holding or awaiting a lock on an enum type."""
+
+    pid: int
+    enum_schema: str
+    enum_name: str
+    mode: str
+    granted: bool
+    state: Optional[str]
+    # Seconds since the session's transaction started; None outside one
+    transaction_age: Optional[float]
+    query: Optional[str]
+
+    def describe(self) -> str:
+        age = (
+            "no transaction"
+            if self.transaction_age is None
+            else f"transaction age {self.transaction_age:.1f}s"
+        )
+        lock = "holds" if self.granted else "awaits"
+        return (
+            f"pid {self.pid} {lock} {self.mode} on "
+            f"{self.enum_schema}.{self.enum_name} ({age}, state {self.state!r})"
+        )
+
+
+class EnumLockBlockedError(RuntimeError):
+    """Raised when enum types stay locked by other sessions."""
+
+    def __init__(self, blockers: List[EnumLockBlocker]):
+        self.blockers = blockers
+        super().__init__(
+            "Enum types are locked by other sessions: "
+            + "; ".join(blocker.describe() for blocker in blockers)
+        )
+
+
+@dataclass(frozen=True)
+class PreflightPolicy:
+    """
+    Check for sessions locking the enum types before altering them.
+
+    With ``wait`` set, the check is repeated every ``poll_interval`` seconds
+    until no session locks the types (a quiet window) or ``wait`` seconds
+    have passed; the default aborts on the first blocker.
+    """
+
+    wait: float = 0.0
+    poll_interval: float = 1.0
+
+
+def find_enum_lock_blockers(
+    connection: "Connection", enum_types: Iterable[Tuple[str, str]]
+) -> List[EnumLockBlocker]:
+    """
+    Return the other sessions holding or awaiting locks on enum types.
+
+    All types are checked with a single pg_locks/pg_stat_activity query.
+
+    Args:
+        connection: SQLAlchemy connection instance
+        enum_types: (schema, enum name) pairs
+    """
+    schemas: List[str] = []
+    names: List[str] = []
+    for schema, enum_name in dict.fromkeys(enum_types):
+        schemas.append(schema)
+        names.append(enum_name)
+    if not names:
+        return []
+
+    result = connection.execute(
+        sqlalchemy.text(_ENUM_LOCK_BLOCKERS_SQL),
+        {"schemas": schemas, "names": names},
+    )
+    return [
+        EnumLockBlocker(
+            pid,
+            schema,
+            enum_name,
+            mode,
+            granted,
+            state,
+            None if age is None else float(age),
+            query,
+        )
+        for pid, schema, enum_name, mode, granted, state, age, query in result
+    ]
+
+
+def wait_for_quiet_enum_types(
+    connection: "Connection",
+    enum_types: Iterable[Tuple[str, str]],
+    policy: PreflightPolicy,
+) -> None:
+    """
+    Return once no other session locks the enum types.
+
+    Raises:
+        EnumLockBlockedError: if the types are still locked after
+            ``policy.wait`` seconds
+    """
+    enum_types = list(enum_types)
+    deadline = time.monotonic() + policy.wait
+    while True:
+        blockers = find_enum_lock_blockers(connection, enum_types)
+        if not blockers:
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise EnumLockBlockedError(blockers)
+        time.sleep(min(policy.poll_interval, remaining))
+
+
+def preflight_enum_types(
+    connection: "Connection", enum_types: Iterable[Tuple[str, str]]
+) -> None:
+    """
+    Run the configured pre-flight check for one batch of enum types, if any.
+
+    Types already checked by an enclosing :func:`preflight_batch` are skipped.
+    """
+    policy = get_configuration().preflight
+    if policy is None:
+        return
+
+    checked: AbstractSet[Tuple[str, str]] = connection.info.get(
+        _CHECKED_TYPES_INFO_KEY, frozenset()
+    )
+    unchecked = [enum_type for enum_type in enum_types if enum_type not in checked]
+    if unchecked:
+        wait_for_quiet_enum_types(connection, unchecked, policy)
+
+
+@contextmanager
+def preflight_batch(
+    connection: "Connection", enum_types: Iterable[Tuple[str, str]]
+) -> Iterator[None]:
+    """
+    Check all enum types of a batch once, before any of them is altered.
+
+    Operations inside the block skip their own check for these types, so a
+    batch costs one pg_locks/pg_stat_activity query and at most one wait.
+    """
+    enum_types = list(enum_types)
+    preflight_enum_types(connection, enum_types)
+
+    previous = connection.info.get(_CHECKED_TYPES_INFO_KEY)
+    connection.info[_CHECKED_TYPES_INFO_KEY] = frozenset(enum_types) | (
+        previous or frozenset()
+    )
+    try:
+        yield
+    finally:
+        # connection.info outlives the checkout; never leave the marker behind
+        if previous is None:
+            connection.info.pop(_CHECKED_TYPES_INFO_KEY, None)
+        else:
+            connection.info[_CHECKED_TYPES_INFO_KEY] = previous
@@ -0,0 +1,151 @@
+from typing import Any, List, Optional, Sequence, Tuple
+
+from alembic.operations.ops import (
+    DowngradeOps,
+    ExecuteSQLOp,
+    MigrateOperation,
+    MigrationScript,
+    UpgradeOps,
+)
+from alembic.util import rev_id as generate_rev_id
+
+from .add_enum_value_op import NO_OP_REVERSE_SQL, AddEnumValueOp
+from .add_enum_values_block_op import STRATEGY_AUTOCOMMIT, AddEnumValuesBlockOp
+from .add_enum_values_op import AddEnumValuesOp
+
+
+def _is_enum_addition(op: MigrateOperation) -> bool:
+    return isinstance(op, (AddEnumValueOp, AddEnumValuesOp, AddEnumValuesBlockOp))
+
+
+def _is_enum_addition_reverse(op: MigrateOperation) -> bool:
+    return isinstance(op, ExecuteSQLOp) and op.sqltext == NO_OP_REVERSE_SQL
+
+
+def _lift_enum_additions(
+    upgrade_ops: UpgradeOps,
+) -> Tuple[List[MigrateOperation], List[MigrateOperation]]:
+    """Split top-level ops into (enum additions, everything else)."""
+    additions: List[MigrateOperation] = []
+    remaining: List[MigrateOperation] = []
+    for op in upgrade_ops.ops:
+        if isinstance(op, AddEnumValuesBlockOp):
+            additions.extend(op.ops)
+        elif _is_enum_addition(op):
+            additions.append(op)
+        else:
+            remaining.append(op)
+    return additions, remaining
+
+
+def _block(
+    additions: Sequence[MigrateOperation], strategy: str
+) -> List[MigrateOperation]:
+    return [AddEnumValuesBlockOp(additions, strategy=strategy)] if additions else []
+
+
+def split_enum_additions(
+    context: Any,
+    revision: Any,
+    directives: List[MigrationScript],
+    strategy: str = STRATEGY_AUTOCOMMIT,
+) -> None:
+    """
+    ``process_revision_directives`` hook moving enum additions to their own revision.
+
+    Every enum value addition of the autogenerated revision is lifted into a
+    new revision placed right before it, where the additions run in one
+    ``op.add_enum_values_block`` (``autocommit`` by default). The original
+    revision keeps the remaining DDL in a single transaction and now revises
+    the enum revision. Revisions without enum additions are left alone, and a
+    revision holding nothing but enum additions is only wrapped in the block.
+
+    Usage in env.py::
+
+        context.configure(
+            ...,
+            process_revision_directives=split_enum_additions,
+        )
+    """
+    if not directives:
+        return
+    script = directives[-1]
+
+    lifted = [_lift_enum_additions(ops) for ops in script.upgrade_ops_list]
+    if not any(additions for additions, _ in lifted):
+        return
+
+    enum_script = _find_enum_script(directives, script)
+    if enum_script is None and not any(remaining for _, remaining in lifted):
+        # Nothing else to keep transactional; no need for a second revision
+        for upgrade_ops, (additions, _) in zip(script.upgrade_ops_list, lifted):
+            upgrade_ops.ops = _block(additions, strategy)
+        return
+
+    if enum_script is None:
+        enum_script = _new_enum_script(script)
+        directives.insert(len(directives) - 1, enum_script)
+        script.head = enum_script.rev_id
+        script.splice = False
+        script.depends_on = None
+
+    # Multi-database environments call the hook once per database with one
+    # more ops container each time; keep the containers of both revisions
+    # aligned with the upgrade/downgrade tokens of the template
+    for index, (upgrade_ops, downgrade_ops) in enumerate(
+        zip(script.upgrade_ops_list, script.downgrade_ops_list)
+    ):
+        if index == len(enum_script.upgrade_ops_list):
+            enum_script.upgrade_ops_list.append(
+                UpgradeOps([], upgrade_token=upgrade_ops.upgrade_token)
+            )
+            enum_script.downgrade_ops_list.append(
+                DowngradeOps([], downgrade_token=downgrade_ops.downgrade_token)
+            )
+
+        additions, remaining = lifted[index]
+        if not additions:
+            continue
+        enum_script.upgrade_ops_list[index].ops = _block(additions, strategy)
+        enum_script.downgrade_ops_list[index].ops = [
+            op for op in downgrade_ops.ops if _is_enum_addition_reverse(op)
+        ]
+        upgrade_ops.ops = remaining
+        downgrade_ops.ops = [
+            op for op in downgrade_ops.ops if not _is_enum_addition_reverse(op)
+        ]
+
+
+def _find_enum_script(
+    directives: List[MigrationScript], script: MigrationScript
+) -> Optional[MigrationScript]:
+    """Return the enum revision split off ``script`` by an earlier call."""
+    for directive in directives:
+        if directive.rev_id == script.head and getattr(
+            directive, "_enum_additions", False
+        ):
+            return directive
+    return None
+
+
+def _new_enum_script(script: MigrationScript) -> MigrationScript:
+    enum_script = MigrationScript(
+        rev_id=generate_rev_id(),
+        upgrade_ops=UpgradeOps([]),
+        downgrade_ops=DowngradeOps([]),
+        message=(
+            f"add enum values for {script.message}"
+            if script.message
+            else "add enum values"
+        ),
+        imports=set(script.imports),
+        head=script.head,
+        splice=script.splice,
+        version_path=script.version_path,
+        depends_on=script.depends_on,
+    )
+    # Containers are added per upgrade token by split_enum_additions
+    enum_script.upgrade_ops_list.clear()
+    enum_script.downgrade_ops_list.clear()
+    enum_script._enum_additions = True  # type: ignore[attr-defined]
+    return enum_script
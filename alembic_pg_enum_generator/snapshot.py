@@ -0,0 +1,113 @@
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, Tuple
+
+from .defined_enums import get_catalog_fingerprint, get_defined_enums_by_schema
+from .types import EnumNamesToValues, SchemaNamesToEnums
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+# Bump whenever the snapshot file layout changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Enum catalog of a database captured for offline comparison."""
+
+    enums: SchemaNamesToEnums
+    fingerprint: Optional[str] = None
+    default_schema: Optional[str] = None
+    # Schemas the snapshot was captured for, including those without enums
+    schemas: Optional[Tuple[str, ...]] = None
+
+    def get_defined_enums_by_schema(
+        self,
+        schemas: Sequence[str],
+        include_name: Optional[Callable[[str], bool]] = None,
+    ) -> SchemaNamesToEnums:
+        """Return the snapshot in the shape of ``get_defined_enums_by_schema``."""
+        schema_to_enums: Dict[str, EnumNamesToValues] = {}
+        for schema in schemas:
+            enums = {
+                name: values
+                for name, values in self.enums.get(schema, {}).items()
+                if include_name is None or include_name(name)
+            }
+            if enums:
+                schema_to_enums[schema] = enums
+        return schema_to_enums
+
+
+def export_catalog_snapshot(
+    connection: "Connection",
+    schemas: Sequence[str],
+    path: Optional[str] = None,
+) -> CatalogSnapshot:
+    """
+    Capture the enum catalog of a live database, optionally writing it to ``path``.
+
+    Args:
+        connection: SQLAlchemy connection instance
+        schemas: Schema names to capture (e.g. ["public"])
+        path: Optional file to write the snapshot to
+
+    Returns:
+        The captured snapshot
+    """
+    snapshot = CatalogSnapshot(
+        enums=get_defined_enums_by_schema(connection, schemas),
+        fingerprint=get_catalog_fingerprint(connection, schemas),
+        default_schema=connection.dialect.default_schema_name,
+        schemas=tuple(schemas),
+    )
+    if path is not None:
+        dump_catalog_snapshot(snapshot, path)
+    return snapshot
+
+
+def dump_catalog_snapshot(snapshot: CatalogSnapshot, path: str) -> None:
+    """Write a snapshot as compact JSON with stable ordering."""
+    payload = {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "fingerprint": snapshot.fingerprint,
+        "default_schema": snapshot.default_schema,
+        "captured_schemas": (
+            None if snapshot.schemas is None else list(snapshot.schemas)
+        ),
+        "schemas": {
+            schema: {name: list(values) for name, values in enums.items()}
+            for schema, enums in snapshot.enums.items()
+        },
+    }
+    with open(path, "w", encoding="utf-8") as snapshot_file:
+        json.dump(payload, snapshot_file, sort_keys=True, separators=(",", ":"))
+        snapshot_file.write("\n")
+
+
+def load_catalog_snapshot(path: str) -> CatalogSnapshot:
+    """Read a snapshot written by ``dump_catalog_snapshot``."""
+    with open(path, encoding="utf-8") as snapshot_file:
+        payload = json.load(snapshot_file)
+
+    version = payload.get("version")
+    if version != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported catalog snapshot version {version!r} in {path}; "
+            f"expected {SNAPSHOT_FORMAT_VERSION}"
+        )
+
+    return CatalogSnapshot(
+        enums={
+            schema: {name: tuple(values) for name, values in enums.items()}
+            for schema, enums in payload["schemas"].items()
+        },
+        fingerprint=payload.get("fingerprint"),
+        default_schema=payload.get("default_schema"),
+        schemas=(
+            None
+            if payload.get("captured_schemas") is None
+            else tuple(payload["captured_schemas"])
+        ),
+    )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum as PyEnum
-from typing import Dict, Optional, Tuple
+from typing import Dict, FrozenSet, Optional, Set, Tuple
 
 from sqlalchemy import ARRAY, Enum
 
@@ -49,3 +49,8 @@ class TableReference:
 
 
 EnumNamesToValues = Dict[str, Tuple[str, ...]]
+SchemaNamesToEnums = Dict[str, EnumNamesToValues]
+# (schema, enum name) -> (labels missing in the database, last database label)
+MissingEnumValues = Dict[Tuple[str, str], Tuple[FrozenSet[str], Optional[str]]]
+# (schema, enum name) -> labels currently in the database
+ExistingEnumLabels = Dict[Tuple[str, str], Set[str]]
@@ -0,0 +1,137 @@
+"""
+Compare the legacy and the aggregated enum catalog queries on a live database.
+
+The legacy query ran a correlated ``ARRAY(SELECT ... FROM pg_enum)`` subplan
+per enum type, formatted names with ``format_type`` and stripped schema
+prefixes and quotes in Python. The current query aggregates labels with a
+single join and returns raw names. Both are timed against a scratch schema
+filled with enum types, which is dropped afterwards. Needs a PostgreSQL
+driver (e.g. psycopg2) and a role that can create schemas.
+
+Usage:
+    python benchmarks/bench_catalog_query.py --dsn postgresql://localhost/bench
+    python benchmarks/bench_catalog_query.py --dsn ... --types 5000 --labels 20
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import sqlalchemy
+
+from alembic_pg_enum_generator.defined_enums import get_defined_enums_by_schema
+
+SCHEMA = "bench_enum_catalog"
+
+_LEGACY_ENUMS_FOR_SCHEMAS_SQL = """
+    SELECT
+        n.nspname,
+        pg_catalog.format_type(t.oid, NULL),
+        ARRAY(SELECT enumlabel
+              FROM pg_catalog.pg_enum
+              WHERE enumtypid = t.oid
+              ORDER BY enumsortorder)
+    FROM pg_catalog.pg_type t
+    JOIN pg_catalog.pg_namespace n ON n.oid = t.typnamespace
+    WHERE
+        t.typtype = 'e'
+        AND n.nspname = ANY(:schemas)
+"""
+
+
+def _legacy_extract_enum_name(enum_name: str, schema: str) -> str:
+    schema_prefix = f"{schema}."
+    quoted_schema_prefix = f'"{schema}".'
+    if enum_name.startswith(schema_prefix):
+        enum_name = enum_name[len(schema_prefix) :]
+    elif enum_name.startswith(quoted_schema_prefix):
+        enum_name = enum_name[len(quoted_schema_prefix) :]
+    if enum_name.startswith('"') and enum_name.endswith('"'):
+        enum_name = enum_name[1:-1]
+    return enum_name
+
+
+def legacy_get_defined_enums_by_schema(
+    connection: sqlalchemy.engine.Connection, schemas: List[str]
+) -> Dict[str, Dict[str, Any]]:
+    result: Dict[str, Dict[str, Any]] = {}
+    for schema, name, values in connection.execute(
+        sqlalchemy.text(_LEGACY_ENUMS_FOR_SCHEMAS_SQL), {"schemas": schemas}
+    ):
+        enum_name = _legacy_extract_enum_name(name, schema)
+        result.setdefault(schema, {})[enum_name] = tuple(values)
+    return result
+
+
+def create_fixture(
+    connection: sqlalchemy.engine.Connection, types: int, labels: int
+) -> None:
+    connection.execute(sqlalchemy.text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    connection.execute(sqlalchemy.text(f"CREATE SCHEMA {SCHEMA}"))
+    values = ", ".join(f"'label_{index}'" for index in range(labels))
+    # Mixed-case names exercise the quoting the legacy query had to undo
+    for index in range(types):
+        name = f'"Enum_{index}"' if index % 10 == 0 else f"enum_{index}"
+        connection.execute(
+            sqlalchemy.text(f"CREATE TYPE {SCHEMA}.{name} AS ENUM ({values})")
+        )
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", required=True, help="SQLAlchemy database URL")
+    parser.add_argument("--types", type=int, default=2_000)
+    parser.add_argument("--labels", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    engine = sqlalchemy.create_engine(args.dsn)
+    try:
+        with engine.begin() as connection:
+            create_fixture(connection, args.types, args.labels)
+
+        with engine.connect() as connection:
+            legacy = legacy_get_defined_enums_by_schema(connection, [SCHEMA])
+            current = get_defined_enums_by_schema(connection, [SCHEMA])
+            if legacy != current:
+                sys.exit("Legacy and aggregated queries disagree")
+
+            report = {
+                "types": args.types,
+                "labels": args.labels,
+                "server_version": ".".join(
+                    map(str, connection.dialect.server_version_info or ())
+                ),
+                "legacy_seconds": best_of(
+                    lambda: legacy_get_defined_enums_by_schema(connection, [SCHEMA]),
+                    args.repeat,
+                ),
+                "aggregated_seconds": best_of(
+                    lambda: get_defined_enums_by_schema(connection, [SCHEMA]),
+                    args.repeat,
+                ),
+            }
+    finally:
+        with engine.begin() as connection:
+            connection.execute(
+                sqlalchemy.text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            )
+        engine.dispose()
+
+    report["speedup"] = report["legacy_seconds"] / report["aggregated_seconds"]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
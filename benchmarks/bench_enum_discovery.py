@@ -0,0 +1,314 @@
+"""
+Scale benchmarks for enum discovery, diffing and rendering.
+
+Builds synthetic SQLAlchemy metadata (plain, ``ARRAY(Enum)`` and
+``TypeDecorator``-wrapped enum columns) and a matching fake catalog spread
+over many schemas, then times the library's hot paths against an in-memory
+stand-in for the database. Results, including throughput and peak memory, are
+written as JSON so runs can be compared between releases.
+
+Usage:
+    python benchmarks/bench_enum_discovery.py --scale small
+    python benchmarks/bench_enum_discovery.py --scale large --output bench_output.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import alembic
+import sqlalchemy
+from sqlalchemy import ARRAY, Column, Enum, Integer, MetaData, Table
+from sqlalchemy.types import TypeDecorator
+
+import alembic_pg_enum_generator
+from alembic_pg_enum_generator.add_enum_value_op import render_add_enum_value_op
+from alembic_pg_enum_generator.compare_dispatch import compare_enums_for_additions
+from alembic_pg_enum_generator.config import Config, set_configuration
+from alembic_pg_enum_generator.declared_enums import (
+    get_declared_enums,
+    get_declared_enums_by_schema,
+)
+from alembic_pg_enum_generator.defined_enums import get_defined_enums_by_schema
+from alembic_pg_enum_generator.instrumentation import RecordingInstrumentation
+
+
+@dataclass(frozen=True)
+class Scale:
+    tables: int
+    schemas: int
+    enums: int
+    max_labels: int
+    # Enum types that only exist in the database
+    extra_enums: int
+
+
+SCALES = {
+    "small": Scale(tables=1_000, schemas=10, enums=50, max_labels=100, extra_enums=100),
+    "medium": Scale(
+        tables=10_000, schemas=100, enums=500, max_labels=1_000, extra_enums=2_000
+    ),
+    "large": Scale(
+        tables=100_000, schemas=600, enums=2_000, max_labels=10_000, extra_enums=20_000
+    ),
+}
+
+LABEL_COUNTS = (10, 100, 1_000, 10_000)
+
+
+class WrappedEnum(TypeDecorator):  # type: ignore[type-arg]
+    impl = Enum
+    cache_ok = True
+
+
+class FakeDialect:
+    name = "postgresql"
+    default_schema_name = "schema_0"
+    server_version_info = (16, 0)
+
+
+class FakeCatalogConnection:
+    """In-memory stand-in answering the library's catalog queries."""
+
+    def __init__(self, catalog: Dict[str, Dict[str, Tuple[str, ...]]]):
+        self.catalog = catalog
+        self.dialect = FakeDialect()
+        self.rows_fetched = 0
+
+    def execute(self, statement: Any, params: Optional[Dict[str, Any]] = None) -> Any:
+        params = params or {}
+        if "schemas" in params:
+            schemas = params["schemas"]
+            rows = [
+                (schema, name, oid, list(labels))
+                for schema in schemas
+                for oid, (name, labels) in enumerate(
+                    self.catalog.get(schema, {}).items()
+                )
+            ]
+        else:
+            schema = params["schema"]
+            rows = [
+                (name, oid, list(labels))
+                for oid, (name, labels) in enumerate(
+                    self.catalog.get(schema, {}).items()
+                )
+            ]
+        self.rows_fetched += len(rows)
+        return rows
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float
+    items: int
+    items_per_second: float
+    peak_memory_bytes: int
+
+
+def build_fixture(
+    scale: Scale,
+) -> Tuple[MetaData, Dict[str, Dict[str, Tuple[str, ...]]]]:
+    """Return synthetic metadata and a catalog that lags behind it."""
+    metadata = MetaData()
+    label_counts = [count for count in LABEL_COUNTS if count <= scale.max_labels]
+
+    enum_types = []
+    catalog: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+    for index in range(scale.enums):
+        schema = f"schema_{index % scale.schemas}"
+        labels = tuple(
+            f"label_{label}" for label in range(label_counts[index % len(label_counts)])
+        )
+        enum_types.append(Enum(*labels, name=f"enum_{index}", schema=schema))
+        # Every tenth label is new in the models
+        catalog.setdefault(schema, {})[f"enum_{index}"] = tuple(
+            label for position, label in enumerate(labels) if position % 10 != 5
+        )
+
+    for index in range(scale.extra_enums):
+        schema = f"schema_{index % scale.schemas}"
+        catalog.setdefault(schema, {})[f"db_only_{index}"] = ("a", "b", "c")
+
+    for index in range(scale.tables):
+        schema = f"schema_{index % scale.schemas}"
+        enum_type = enum_types[index % len(enum_types)]
+        other_type = enum_types[(index * 7 + 3) % len(enum_types)]
+        Table(
+            f"table_{index}",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("status", enum_type),
+            Column("tags", ARRAY(other_type)),
+            Column(
+                "wrapped",
+                WrappedEnum(
+                    *enum_type.enums, name=enum_type.name, schema=enum_type.schema
+                ),
+            ),
+            schema=schema,
+        )
+
+    return metadata, catalog
+
+
+def measure(
+    name: str, func: Callable[[], int], repeat: int, trace_memory: bool
+) -> Result:
+    """Time ``func`` (best of ``repeat``) and record its peak memory."""
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        items = func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = 0
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return Result(
+        name=name,
+        seconds=best,
+        items=items,
+        items_per_second=items / best if best else 0.0,
+        peak_memory_bytes=peak,
+    )
+
+
+def run(scale_name: str, repeat: int, trace_memory: bool) -> Dict[str, Any]:
+    scale = SCALES[scale_name]
+    set_configuration(Config())
+
+    build_start = time.perf_counter()
+    metadata, catalog = build_fixture(scale)
+    build_seconds = time.perf_counter() - build_start
+
+    schemas = [f"schema_{index}" for index in range(scale.schemas)]
+    columns = sum(len(table.columns) for table in metadata.tables.values())
+    connection = FakeCatalogConnection(catalog)
+
+    class AutogenContext:
+        pass
+
+    autogen_context = AutogenContext()
+    autogen_context.metadata = metadata  # type: ignore[attr-defined]
+    autogen_context.connection = connection  # type: ignore[attr-defined]
+
+    class UpgradeOps:
+        def __init__(self) -> None:
+            self.ops: List[Any] = []
+
+    def declared_single_schema() -> int:
+        get_declared_enums(metadata, schema="schema_0", default_schema="schema_0")
+        return columns
+
+    def declared_by_schema() -> int:
+        get_declared_enums_by_schema(metadata, default_schema="schema_0")
+        return columns
+
+    def defined_by_schema() -> int:
+        connection.rows_fetched = 0
+        get_defined_enums_by_schema(connection, schemas)  # type: ignore[arg-type]
+        return connection.rows_fetched
+
+    last_ops: List[Any] = []
+
+    def compare() -> int:
+        upgrade_ops = UpgradeOps()
+        compare_enums_for_additions(
+            autogen_context,  # type: ignore[arg-type]
+            upgrade_ops,  # type: ignore[arg-type]
+            schemas,
+        )
+        last_ops[:] = upgrade_ops.ops
+        return columns
+
+    def render() -> int:
+        for op in last_ops:
+            render_add_enum_value_op(None, op)  # type: ignore[arg-type]
+        return len(last_ops)
+
+    results = [
+        measure("get_declared_enums", declared_single_schema, repeat, trace_memory),
+        measure(
+            "get_declared_enums_by_schema", declared_by_schema, repeat, trace_memory
+        ),
+        measure("get_defined_enums_by_schema", defined_by_schema, repeat, trace_memory),
+        measure("compare_enums_for_additions", compare, repeat, trace_memory),
+        measure("render_add_enum_value_op", render, repeat, trace_memory),
+    ]
+
+    # One instrumented comparison for the per-phase breakdown
+    instrumentation = RecordingInstrumentation()
+    set_configuration(Config(instrumentation=instrumentation))
+    compare()
+    set_configuration(Config())
+
+    return {
+        "scale": scale_name,
+        "parameters": asdict(scale),
+        "fixture": {
+            "build_seconds": build_seconds,
+            "tables": len(metadata.tables),
+            "columns": columns,
+            "catalog_types": sum(len(enums) for enums in catalog.values()),
+            "ops": len(last_ops),
+        },
+        "environment": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "alembic_pg_enum_generator": alembic_pg_enum_generator.__version__,
+            "alembic": alembic.__version__,
+            "sqlalchemy": sqlalchemy.__version__,
+        },
+        "results": [asdict(result) for result in results],
+        "phases": {
+            "seconds": instrumentation.timings,
+            "counters": instrumentation.counters,
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="skip peak memory tracing"
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run(args.scale, args.repeat, trace_memory=not args.no_memory)
+
+    for result in report["results"]:
+        print(
+            f"{result['name']:<32} {result['seconds'] * 1000:>10.2f} ms "
+            f"{result['items_per_second']:>14.0f} items/s "
+            f"{result['peak_memory_bytes'] / 1024 / 1024:>8.1f} MiB",
+            file=sys.stderr,
+        )
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 from unittest.mock import Mock
 
+import pytest
 import sqlalchemy
 
 from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
@@ -36,7 +37,7 @@ class TestAddEnumValueOp:
 
     def test_execute_with_schema(self):
         """Test execute method with schema."""
-        mock_connection = Mock()
+        mock_connection = Mock(info={})
         op = AddEnumValueOp("public", "user_status", "pending")
 
         op.execute(mock_connection)
@@ -50,7 +51,7 @@ class TestAddEnumValueOp:
 
     def test_execute_without_schema(self):
         """Test execute method without schema."""
-        mock_connection = Mock()
+        mock_connection = Mock(info={})
         op = AddEnumValueOp(None, "user_status", "pending")
 
         op.execute(mock_connection)
@@ -64,7 +65,7 @@ class TestAddEnumValueOp:
 
     def test_execute_with_special_characters(self):
         """Test execute method with special characters in value."""
-        mock_connection = Mock()
+        mock_connection = Mock(info={})
         op = AddEnumValueOp("public", "user_status", "pending-review")
 
         op.execute(mock_connection)
@@ -131,3 +132,102 @@ class TestAddEnumValueOp:
 
         expected = "op.execute(\"ALTER TYPE my-schema.user_status ADD VALUE 'pending-review'\")"
         assert result == expected
+
+    def test_init_defaults_to_append(self):
+        """Test that no placement is set by default."""
+        op = AddEnumValueOp("public", "user_status", "pending")
+
+        assert op.before is None
+        assert op.after is None
+
+    def test_init_rejects_before_and_after(self):
+        """Test that before and after are mutually exclusive."""
+        with pytest.raises(ValueError):
+            AddEnumValueOp("public", "priority", "medium", before="high", after="low")
+
+    def test_execute_with_before(self):
+        """Test execute method with BEFORE placement."""
+        mock_connection = Mock(info={})
+        op = AddEnumValueOp("public", "priority", "lowest", before="low")
+
+        op.execute(mock_connection)
+
+        call_args = mock_connection.execute.call_args[0][0]
+        assert "ALTER TYPE public.priority ADD VALUE 'lowest' BEFORE 'low'" in str(
+            call_args
+        )
+
+    def test_execute_with_after(self):
+        """Test execute method with AFTER placement."""
+        mock_connection = Mock(info={})
+        op = AddEnumValueOp("public", "priority", "medium", after="low")
+
+        op.execute(mock_connection)
+
+        call_args = mock_connection.execute.call_args[0][0]
+        assert "ALTER TYPE public.priority ADD VALUE 'medium' AFTER 'low'" in str(
+            call_args
+        )
+
+    def test_render_function_with_placement(self):
+        """Test the render function with BEFORE/AFTER placement."""
+        from alembic_pg_enum_generator.add_enum_value_op import render_add_enum_value_op
+
+        mock_autogen_context = Mock()
+
+        after_op = AddEnumValueOp("public", "priority", "medium", after="low")
+        before_op = AddEnumValueOp(None, "priority", "lowest", before="low")
+
+        assert render_add_enum_value_op(mock_autogen_context, after_op) == (
+            "op.execute(\"ALTER TYPE public.priority ADD VALUE 'medium' AFTER 'low'\")"
+        )
+        assert render_add_enum_value_op(mock_autogen_context, before_op) == (
+            "op.execute(\"ALTER TYPE priority ADD VALUE 'lowest' BEFORE 'low'\")"
+        )
+
+    def test_if_not_exists(self):
+        """Test that IF NOT EXISTS is rendered into the statement."""
+        from alembic_pg_enum_generator.add_enum_value_op import render_add_enum_value_op
+
+        op = AddEnumValueOp(
+            "public", "priority", "medium", after="low", if_not_exists=True
+        )
+
+        assert op.to_sql() == (
+            "ALTER TYPE public.priority ADD VALUE IF NOT EXISTS 'medium' AFTER 'low'"
+        )
+        assert render_add_enum_value_op(Mock(), op) == f'op.execute("{op.to_sql()}")'
+
+    def test_skip_existing_uses_cached_labels(self):
+        """Test that existing labels are skipped after a single catalog read."""
+        mock_connection = Mock(info={})
+        mock_connection.dialect.default_schema_name = "public"
+        mock_connection.execute.return_value = [("public", "priority", "low")]
+
+        AddEnumValueOp(None, "priority", "low", skip_existing=True).execute(
+            mock_connection
+        )
+        AddEnumValueOp("public", "priority", "high", skip_existing=True).execute(
+            mock_connection
+        )
+        AddEnumValueOp("public", "priority", "high", skip_existing=True).execute(
+            mock_connection
+        )
+
+        statements = [str(c.args[0]) for c in mock_connection.execute.call_args_list]
+        assert len(statements) == 2
+        assert "pg_enum" in statements[0]
+        assert statements[1] == "ALTER TYPE public.priority ADD VALUE 'high'"
+
+    def test_render_skip_existing(self):
+        """Test that pre-checked ops render as op.add_enum_value calls."""
+        from alembic_pg_enum_generator.add_enum_value_op import render_add_enum_value_op
+
+        op = AddEnumValueOp(
+            "public", "priority", "medium", after="low", skip_existing=True
+        )
+
+        assert render_add_enum_value_op(Mock(), op) == (
+            "op.add_enum_value('public', 'priority', 'medium', after='low', "
+            "skip_existing=True)"
+        )
@@ -0,0 +1,159 @@
+"""Tests for add_enum_values_block_op module."""
+
+import io
+from unittest.mock import Mock, patch
+
+import pytest
+from alembic.autogenerate import render_python_code
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from alembic.operations.ops import UpgradeOps
+
+from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
+from alembic_pg_enum_generator.add_enum_values_block_op import (
+    AddEnumValuesBlockOp,
+    uses_autocommit,
+)
+from alembic_pg_enum_generator.config import Config
+from alembic_pg_enum_generator.preflight import PreflightPolicy
+
+
+def _offline_operations():
+    output = io.StringIO()
+    context = MigrationContext.configure(
+        dialect_name="postgresql", opts={"as_sql": True, "output_buffer": output}
+    )
+    return Operations(context), output
+
+
+class TestUsesAutocommit:
+    @pytest.mark.parametrize(
+        "strategy, server_version_num, expected",
+        [
+            ("auto", 110012, True),
+            ("auto", 120000, False),
+            ("auto", None, True),
+            ("transaction", 110012, False),
+            ("autocommit", 160002, True),
+        ],
+    )
+    def test_strategies(self, strategy, server_version_num, expected):
+        """Test the strategy decision per server version."""
+        assert uses_autocommit(strategy, server_version_num) is expected
+
+    def test_unknown_strategy(self):
+        """Test that unknown strategies are rejected."""
+        with pytest.raises(ValueError):
+            AddEnumValuesBlockOp([], strategy="sometimes")
+
+
+class TestAddEnumValuesBlockOp:
+    def test_render(self):
+        """Test that wrapped ops are rendered inside a with block."""
+        op = AddEnumValuesBlockOp(
+            [
+                AddEnumValueOp("public", "priority", "high"),
+                AddEnumValueOp("public", "user_status", "pending"),
+            ]
+        )
+
+        rendered = render_python_code(UpgradeOps(ops=[op]))
+
+        assert (
+            "    with op.add_enum_values_block(strategy='auto'):\n"
+            "        op.execute(\"ALTER TYPE public.priority ADD VALUE 'high'\")\n"
+            "        op.execute(\"ALTER TYPE public.user_status ADD VALUE 'pending'\")\n"
+        ) in rendered
+
+    def test_offline_auto_uses_one_autocommit_block(self):
+        """Test that an unknown server version gets a single autocommit block."""
+        operations, output = _offline_operations()
+
+        with operations.add_enum_values_block(strategy="auto"):
+            operations.add_enum_values("public", "priority", ["high", "critical"])
+            operations.add_enum_value("public", "user_status", "pending")
+
+        statements = [s.strip() for s in output.getvalue().split(";") if s.strip()]
+        assert statements == [
+            "COMMIT",
+            "ALTER TYPE public.priority ADD VALUE 'high'",
+            "ALTER TYPE public.priority ADD VALUE 'critical'",
+            "ALTER TYPE public.user_status ADD VALUE 'pending'",
+            "BEGIN",
+        ]
+
+    def test_transaction_strategy_keeps_transaction(self):
+        """Test that the transaction strategy does not commit."""
+        operations, output = _offline_operations()
+
+        with operations.add_enum_values_block(strategy="transaction"):
+            operations.add_enum_value("public", "user_status", "pending")
+
+        assert "COMMIT" not in output.getvalue()
+
+    def test_online_auto_reads_version_once(self):
+        """Test that the server version is queried once per connection."""
+        connection = Mock(info={})
+        connection.execute.return_value.scalar_one.return_value = "150004"
+        operations = Mock()
+        operations.get_context.return_value.as_sql = False
+        operations.get_bind.return_value = connection
+
+        for _ in range(2):
+            with AddEnumValuesBlockOp.add_enum_values_block(operations, "auto"):
+                pass
+
+        connection.execute.assert_called_once()
+        operations.get_context.return_value.autocommit_block.assert_not_called()
+
+    def test_render_enum_types_with_preflight(self):
+        """Test that the altered types are rendered when a pre-flight is set."""
+        op = AddEnumValuesBlockOp(
+            [
+                AddEnumValueOp("public", "priority", "high"),
+                AddEnumValueOp("public", "priority", "critical"),
+                AddEnumValueOp("public", "user_status", "pending"),
+            ]
+        )
+
+        with patch(
+            "alembic_pg_enum_generator.add_enum_values_block_op.get_configuration",
+            return_value=Config(preflight=PreflightPolicy()),
+        ):
+            rendered = render_python_code(UpgradeOps(ops=[op]))
+
+        assert (
+            "with op.add_enum_values_block(strategy='auto', "
+            "enum_types=[('public', 'priority'), ('public', 'user_status')]):"
+        ) in rendered
+
+    def test_online_preflight_runs_once_per_block(self):
+        """Test that the block checks all of its types with one query."""
+        connection = Mock(info={})
+        connection.dialect.default_schema_name = "public"
+        connection.execute.return_value = []
+        operations = Mock()
+        operations.get_context.return_value.as_sql = False
+        operations.get_bind.return_value = connection
+
+        with patch(
+            "alembic_pg_enum_generator.preflight.get_configuration",
+            return_value=Config(preflight=PreflightPolicy()),
+        ):
+            with AddEnumValuesBlockOp.add_enum_values_block(
+                operations,
+                "transaction",
+                enum_types=[(None, "priority"), ("tenant", "user_status")],
+            ):
+                AddEnumValueOp(None, "priority", "high").execute(connection)
+                AddEnumValueOp("tenant", "user_status", "a").execute(connection)
+
+        first, *rest = connection.execute.call_args_list
+        assert first.args[1] == {
+            "schemas": ["public", "tenant"],
+            "names": ["priority", "user_status"],
+        }
+        assert [str(c.args[0]) for c in rest] == [
+            "ALTER TYPE priority ADD VALUE 'high'",
+            "ALTER TYPE tenant.user_status ADD VALUE 'a'",
+        ]
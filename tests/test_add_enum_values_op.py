@@ -0,0 +1,221 @@
+"""Tests for add_enum_values_op module."""
+
+from unittest.mock import Mock
+
+import pytest
+from alembic.autogenerate import render_python_code
+from alembic.operations.ops import UpgradeOps
+from sqlalchemy.engine import Connection
+
+from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
+from alembic_pg_enum_generator.add_enum_values_op import (
+    AddEnumValuesOp,
+    add_enum_values,
+    group_add_enum_value_ops,
+)
+from alembic_pg_enum_generator.connection import _SERVER_VERSION_INFO_KEY
+
+
+class TestAddEnumValuesOp:
+    def test_init_rejects_both_placements(self):
+        """Test that a value cannot be placed both before and after a label."""
+        with pytest.raises(ValueError):
+            AddEnumValuesOp(
+                "public",
+                "priority",
+                ["medium"],
+                before={"medium": "high"},
+                after={"medium": "low"},
+            )
+
+    def test_to_value_ops_round_trip(self):
+        """Test conversion to and from single-value operations."""
+        op = AddEnumValuesOp(
+            "public", "priority", ["lowest", "critical"], before={"lowest": "low"}
+        )
+
+        value_ops = op.to_value_ops()
+
+        assert [(o.value, o.before, o.after) for o in value_ops] == [
+            ("lowest", "low", None),
+            ("critical", None, None),
+        ]
+        regrouped = AddEnumValuesOp.from_value_ops(value_ops)
+        assert regrouped.values == op.values
+        assert regrouped.before == op.before
+        assert regrouped.after == op.after
+
+    def test_to_sql_single_block_from_pg12(self):
+        """Test that PostgreSQL 12+ gets all values in one DO block."""
+        op = AddEnumValuesOp("public", "priority", ["a", "b"], after={"b": "a"})
+
+        assert op.to_sql(120004) == [
+            "DO $add_enum_values$ BEGIN"
+            " ALTER TYPE public.priority ADD VALUE 'a';"
+            " ALTER TYPE public.priority ADD VALUE 'b' AFTER 'a';"
+            " END $add_enum_values$"
+        ]
+
+    @pytest.mark.parametrize("server_version_num", [None, 110009])
+    def test_to_sql_statement_per_value_before_pg12(self, server_version_num):
+        """Test that older or unknown servers get one statement per value."""
+        op = AddEnumValuesOp("public", "priority", ["a", "b"])
+
+        assert op.to_sql(server_version_num) == [
+            "ALTER TYPE public.priority ADD VALUE 'a'",
+            "ALTER TYPE public.priority ADD VALUE 'b'",
+        ]
+
+    def test_to_sql_quote_collision_falls_back(self):
+        """Test that a label containing the dollar quote is not put in a block."""
+        op = AddEnumValuesOp("public", "odd", ["$add_enum_values$", "b"])
+
+        assert len(op.to_sql(160000)) == 2
+
+    def test_execute_single_round_trip(self):
+        """Test that execute sends one statement on PostgreSQL 12+."""
+        connection = Mock(info={_SERVER_VERSION_INFO_KEY: 150002})
+        op = AddEnumValuesOp("public", "priority", ["a", "b", "c"])
+
+        op.execute(connection)
+
+        connection.execute.assert_called_once()
+
+    def test_execute_reads_server_version_num(self):
+        """Test that execute asks the server for its version when not cached."""
+        connection = Mock(info={})
+        connection.execute.return_value.scalar_one.return_value = "110022"
+        op = AddEnumValuesOp("public", "priority", ["a", "b"])
+
+        op.execute(connection)
+
+        statements = [str(c.args[0]) for c in connection.execute.call_args_list]
+        assert statements == [
+            "SELECT current_setting('server_version_num')",
+            "ALTER TYPE public.priority ADD VALUE 'a'",
+            "ALTER TYPE public.priority ADD VALUE 'b'",
+        ]
+
+    def test_implementation_online_uses_server_version(self):
+        """Test that online migrations get one DO block from PostgreSQL 12."""
+        operations = Mock()
+        operations.get_context.return_value.as_sql = False
+        operations.get_bind.return_value = Mock(
+            spec=Connection, info={_SERVER_VERSION_INFO_KEY: 160001}
+        )
+        op = AddEnumValuesOp("public", "priority", ["a", "b"])
+
+        add_enum_values(operations, op)
+
+        (statement,) = [c.args[0] for c in operations.execute.call_args_list]
+        assert statement.startswith("DO $add_enum_values$")
+
+    def test_implementation_offline_statement_per_value(self):
+        """Test that offline runs, without a server version, add values one by one."""
+        operations = Mock()
+        operations.get_context.return_value.as_sql = True
+        op = AddEnumValuesOp("public", "priority", ["a", "b"])
+
+        add_enum_values(operations, op)
+
+        assert [c.args[0] for c in operations.execute.call_args_list] == [
+            "ALTER TYPE public.priority ADD VALUE 'a'",
+            "ALTER TYPE public.priority ADD VALUE 'b'",
+        ]
+
+    def test_render(self):
+        """Test rendering as a compact op.add_enum_values call."""
+        op = AddEnumValuesOp(
+            "public", "priority", ["lowest", "medium"], before={"lowest": "low"}
+        )
+
+        rendered = render_python_code(UpgradeOps(ops=[op]))
+
+        assert (
+            "    op.add_enum_values(\n"
+            "        'public',\n"
+            "        'priority',\n"
+            "        ['lowest', 'medium'],\n"
+            "        before={'lowest': 'low'},\n"
+            "    )\n"
+        ) in rendered
+
+    def test_if_not_exists_in_block(self):
+        """Test that IF NOT EXISTS is kept inside the DO block."""
+        op = AddEnumValuesOp("public", "priority", ["a", "b"], if_not_exists=True)
+
+        (statement,) = op.to_sql(130000)
+
+        assert statement.count("ADD VALUE IF NOT EXISTS") == 2
+
+    def test_skip_existing_drops_present_values(self):
+        """Test that values already in the database are not added again."""
+        connection = Mock(info={_SERVER_VERSION_INFO_KEY: 110000})
+        connection.execute.return_value = [("public", "priority", "a")]
+        op = AddEnumValuesOp(
+            "public", "priority", ["a", "b"], after={"b": "a"}, skip_existing=True
+        )
+
+        op.execute(connection)
+        op.execute(connection)
+
+        statements = [str(c.args[0]) for c in connection.execute.call_args_list]
+        assert statements[1:] == ["ALTER TYPE public.priority ADD VALUE 'b' AFTER 'a'"]
+
+    def test_skip_existing_implementation_offline(self):
+        """Test that offline runs emit the statements without a pre-check."""
+        operations = Mock()
+        operations.get_context.return_value.as_sql = True
+        op = AddEnumValuesOp(
+            "public", "priority", ["a"], if_not_exists=True, skip_existing=True
+        )
+
+        add_enum_values(operations, op)
+
+        operations.get_bind.assert_not_called()
+        operations.execute.assert_called_once_with(
+            "ALTER TYPE public.priority ADD VALUE IF NOT EXISTS 'a'"
+        )
+
+
+class TestGroupAddEnumValueOps:
+    def test_groups_consecutive_ops_per_type(self):
+        """Test that only types with several values are grouped."""
+        ops = [
+            AddEnumValueOp("public", "priority", "lowest", before="low"),
+            AddEnumValueOp("public", "priority", "critical"),
+            AddEnumValueOp("public", "user_status", "pending"),
+            AddEnumValueOp("tenant", "priority", "critical"),
+        ]
+
+        grouped = group_add_enum_value_ops(ops)
+
+        assert len(grouped) == 3
+        assert isinstance(grouped[0], AddEnumValuesOp)
+        assert grouped[0].values == ["lowest", "critical"]
+        assert grouped[1:] == ops[2:]
+
+    def test_does_not_group_mixed_flags(self):
+        """Test that ops with different flags stay separate."""
+        ops = [
+            AddEnumValueOp("public", "priority", "a", skip_existing=True),
+            AddEnumValueOp("public", "priority", "b", skip_existing=True),
+            AddEnumValueOp("public", "priority", "c"),
+        ]
+
+        grouped = group_add_enum_value_ops(ops)
+
+        assert len(grouped) == 2
+        assert grouped[0].values == ["a", "b"]
+        assert grouped[0].skip_existing
+        assert grouped[1] is ops[2]
+
+    def test_from_value_ops_rejects_mixed_flags(self):
+        """Test that combining ops with different flags is refused."""
+        ops = [
+            AddEnumValueOp("public", "priority", "a", if_not_exists=True),
+            AddEnumValueOp("public", "priority", "b"),
+        ]
+
+        with pytest.raises(ValueError, match="priority"):
+            AddEnumValuesOp.from_value_ops(ops)
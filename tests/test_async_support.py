@@ -0,0 +1,241 @@
+"""Tests for async_support module."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
+from alembic_pg_enum_generator.add_enum_values_op import AddEnumValuesOp
+from alembic_pg_enum_generator.async_support import (
+    execute_add_enum_value_ops_async,
+    get_catalog_fingerprint_async,
+    get_defined_enums_async,
+    get_defined_enums_by_schema_async,
+    get_defined_enums_for_databases_async,
+)
+from alembic_pg_enum_generator.config import Config
+from alembic_pg_enum_generator.connection import _SERVER_VERSION_INFO_KEY
+from alembic_pg_enum_generator.filters import EnumFilter
+from alembic_pg_enum_generator.lock_retry import LockRetryPolicy
+from alembic_pg_enum_generator.preflight import PreflightPolicy
+
+
+def async_connection(rows):
+    """Return an AsyncConnection stand-in whose execute returns ``rows``."""
+    connection = Mock()
+    connection.execute = AsyncMock(return_value=rows)
+    return connection
+
+
+class TestAsyncIntrospection:
+    def test_get_defined_enums_async(self):
+        """Test single-schema async introspection."""
+        connection = async_connection(
+            [
+                ("user_status", 16385, ["active", "inactive"]),
+                ("priority", 16390, ["low"]),
+            ]
+        )
+
+        result = asyncio.run(
+            get_defined_enums_async(
+                connection, "public", include_name=lambda n: n.endswith("_status")
+            )
+        )
+
+        assert result == {"user_status": ("active", "inactive")}
+        assert connection.execute.await_args.args[1] == {"schema": "public"}
+
+    def test_get_defined_enums_async_enum_filter(self):
+        """Test that the filter also applies to names it cannot push down."""
+        connection = async_connection(
+            [("user_status", 16385, ["active"]), ("user_state", 16390, ["on"])]
+        )
+
+        result = asyncio.run(
+            get_defined_enums_async(
+                connection, "public", enum_filter=EnumFilter(include=["user_stat[u]s"])
+            )
+        )
+
+        assert "include_patterns" not in connection.execute.await_args.args[1]
+        assert result == {"user_status": ("active",)}
+
+    def test_get_defined_enums_by_schema_async(self):
+        """Test multi-schema async introspection in one query."""
+        connection = async_connection(
+            [
+                ("public", "user_status", 16385, ["active"]),
+                ("tenant_1", "user_status", 16392, ["active", "pending"]),
+            ]
+        )
+
+        result = asyncio.run(
+            get_defined_enums_by_schema_async(connection, ["public", "tenant_1"])
+        )
+
+        connection.execute.assert_awaited_once()
+        assert result == {
+            "public": {"user_status": ("active",)},
+            "tenant_1": {"user_status": ("active", "pending")},
+        }
+
+    def test_get_defined_enums_by_schema_async_enum_filter(self):
+        """Test that an enum filter is pushed into the query and applied."""
+        connection = async_connection(
+            [
+                ("public", "user_status", 16385, ["active"]),
+                ("public", "order_status", 16390, ["open"]),
+            ]
+        )
+
+        result = asyncio.run(
+            get_defined_enums_by_schema_async(
+                connection,
+                ["public"],
+                include_name=lambda n: n.startswith("user_"),
+                enum_filter=EnumFilter(include=["*_status"]),
+            )
+        )
+
+        sql, params = connection.execute.await_args.args
+        assert "LIKE ANY(:include_patterns)" in str(sql)
+        assert params["include_patterns"] == ["%\\_status"]
+        assert result == {"public": {"user_status": ("active",)}}
+
+    def test_get_defined_enums_by_schema_async_no_schemas(self):
+        """Test that no query is awaited without schemas."""
+        connection = async_connection([])
+
+        assert asyncio.run(get_defined_enums_by_schema_async(connection, [])) == {}
+        connection.execute.assert_not_awaited()
+
+    def test_get_catalog_fingerprint_async(self):
+        """Test the async catalog fingerprint probe."""
+        result = Mock()
+        result.one.return_value = (3, 16400, "abc")
+        connection = async_connection(result)
+
+        fingerprint = asyncio.run(get_catalog_fingerprint_async(connection, ["public"]))
+
+        assert fingerprint == "3:16400:abc"
+
+    def test_get_defined_enums_for_databases_async(self):
+        """Test that several databases are introspected on one event loop."""
+        primary = async_connection([("public", "user_status", 16385, ["active"])])
+        analytics = async_connection([("public", "region", 16385, ["eu", "us"])])
+
+        result = asyncio.run(
+            get_defined_enums_for_databases_async(
+                {"primary": primary, "analytics": analytics}, ["public"]
+            )
+        )
+
+        assert result == {
+            "primary": {"public": {"user_status": ("active",)}},
+            "analytics": {"public": {"region": ("eu", "us")}},
+        }
+
+
+def run_sync_connection(sync_connection):
+    """Return an AsyncConnection stand-in running ``run_sync`` on ``sync_connection``."""
+    connection = Mock()
+    connection.run_sync = AsyncMock(
+        side_effect=lambda fn, *args: fn(sync_connection, *args)
+    )
+    return connection
+
+
+class TestAsyncApply:
+    def test_execute_add_enum_value_ops_async(self):
+        """Test that ops are applied in order with their placement."""
+        sync_connection = Mock(info={_SERVER_VERSION_INFO_KEY: 110000})
+        ops = [
+            AddEnumValueOp("public", "priority", "medium", after="low"),
+            AddEnumValuesOp("public", "priority", ["critical", "blocker"]),
+        ]
+
+        asyncio.run(
+            execute_add_enum_value_ops_async(run_sync_connection(sync_connection), ops)
+        )
+
+        statements = [str(c.args[0]) for c in sync_connection.execute.call_args_list]
+        assert statements == [
+            "ALTER TYPE public.priority ADD VALUE 'medium' AFTER 'low'",
+            "ALTER TYPE public.priority ADD VALUE 'critical'",
+            "ALTER TYPE public.priority ADD VALUE 'blocker'",
+        ]
+
+    def test_execute_add_enum_value_ops_async_skip_existing(self):
+        """Test that existing labels are skipped after one catalog read."""
+        sync_connection = Mock(info={})
+        sync_connection.dialect.default_schema_name = "public"
+        sync_connection.execute.side_effect = [
+            [("public", "priority", "low"), ("public", "priority", "medium")],
+            None,
+        ]
+        ops = [
+            AddEnumValueOp(None, "priority", "medium", skip_existing=True),
+            AddEnumValueOp("public", "priority", "high", skip_existing=True),
+            AddEnumValueOp("public", "priority", "high", skip_existing=True),
+        ]
+
+        asyncio.run(
+            execute_add_enum_value_ops_async(run_sync_connection(sync_connection), ops)
+        )
+
+        statements = [str(c.args[0]) for c in sync_connection.execute.call_args_list]
+        assert len(statements) == 2
+        assert statements[1] == "ALTER TYPE public.priority ADD VALUE 'high'"
+
+    def test_execute_add_enum_value_ops_async_lock_retry(self):
+        """Test that the configured lock retry policy applies to async applies."""
+        sync_connection = MagicMock(info={})
+        sync_connection.get_execution_options.return_value = {}
+        sync_connection.execute.return_value.one.return_value = ("0", False)
+        reports = []
+
+        with patch(
+            "alembic_pg_enum_generator.lock_retry.get_configuration",
+            return_value=Config(lock_retry=LockRetryPolicy(on_report=reports.append)),
+        ):
+            asyncio.run(
+                execute_add_enum_value_ops_async(
+                    run_sync_connection(sync_connection),
+                    [AddEnumValueOp("public", "priority", "high")],
+                )
+            )
+
+        sync_connection.begin_nested.assert_called_once()
+        assert [report.statement for report in reports] == [
+            "ALTER TYPE public.priority ADD VALUE 'high'"
+        ]
+
+    def test_execute_add_enum_value_ops_async_preflight_once(self):
+        """Test that one pre-flight query covers every type of the call."""
+        sync_connection = Mock(info={_SERVER_VERSION_INFO_KEY: 150000})
+        sync_connection.dialect.default_schema_name = "public"
+        sync_connection.execute.return_value = []
+        ops = [
+            AddEnumValueOp(None, "priority", "high"),
+            AddEnumValueOp(None, "priority", "critical"),
+            AddEnumValuesOp("tenant", "user_status", ["a", "b"]),
+        ]
+
+        with patch(
+            "alembic_pg_enum_generator.preflight.get_configuration",
+            return_value=Config(preflight=PreflightPolicy()),
+        ):
+            asyncio.run(
+                execute_add_enum_value_ops_async(
+                    run_sync_connection(sync_connection), ops
+                )
+            )
+
+        first, *rest = sync_connection.execute.call_args_list
+        assert "pg_catalog.pg_locks" in str(first.args[0])
+        assert first.args[1] == {
+            "schemas": ["public", "tenant"],
+            "names": ["priority", "user_status"],
+        }
+        assert all("pg_locks" not in str(c.args[0]) for c in rest)
+        assert len(rest) == 3
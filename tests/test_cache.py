@@ -0,0 +1,247 @@
+"""Tests for cache module."""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+import alembic_pg_enum_generator.cache
+from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
+from alembic_pg_enum_generator.cache import CatalogSnapshotCache, EnumComparisonCache
+from alembic_pg_enum_generator.compare_dispatch import compare_enums_for_additions
+from alembic_pg_enum_generator.config import Config
+
+
+@pytest.fixture(autouse=True)
+def clear_in_process_snapshots():
+    """Reset in-process catalog snapshots around each test."""
+    alembic_pg_enum_generator.cache._catalog_snapshots.clear()
+    yield
+    alembic_pg_enum_generator.cache._catalog_snapshots.clear()
+
+
+class TestEnumComparisonCache:
+    def test_make_key_is_stable(self, tmp_path):
+        """Test that equal inputs produce equal keys regardless of dict order."""
+        cache = EnumComparisonCache(str(tmp_path))
+
+        key1 = cache.make_key(
+            ["public"], {"public": {"a": ("x",), "b": ("y",)}}, "1:2:abc"
+        )
+        key2 = cache.make_key(
+            ["public"], {"public": {"b": ("y",), "a": ("x",)}}, "1:2:abc"
+        )
+
+        assert key1 == key2
+
+    def test_make_key_changes_with_inputs(self, tmp_path):
+        """Test that declared enums and catalog fingerprint are part of the key."""
+        cache = EnumComparisonCache(str(tmp_path))
+        declared = {"public": {"a": ("x",)}}
+
+        base = cache.make_key(["public"], declared, "1:2:abc")
+
+        assert base != cache.make_key(
+            ["public"], {"public": {"a": ("x", "y")}}, "1:2:abc"
+        )
+        assert base != cache.make_key(["public"], declared, "2:3:def")
+        assert base != cache.make_key(["public", "other"], declared, "1:2:abc")
+
+    def test_miss_returns_none(self, tmp_path):
+        """Test that unknown keys are a miss."""
+        cache = EnumComparisonCache(str(tmp_path))
+
+        assert cache.load("missing") is None
+
+    def test_store_and_load_roundtrip(self, tmp_path):
+        """Test that stored operations are restored with their placement."""
+        cache = EnumComparisonCache(str(tmp_path / "nested"))
+        ops = [
+            AddEnumValueOp("public", "priority", "medium", after="low"),
+            AddEnumValueOp("public", "priority", "critical"),
+        ]
+
+        cache.store("key", ops)
+        loaded = cache.load("key")
+
+        assert [
+            (op.enum_schema, op.enum_name, op.value, op.before, op.after)
+            for op in loaded
+        ] == [
+            ("public", "priority", "medium", None, "low"),
+            ("public", "priority", "critical", None, None),
+        ]
+
+    def test_store_empty_result(self, tmp_path):
+        """Test that a no-op comparison is cached as an empty list."""
+        cache = EnumComparisonCache(str(tmp_path))
+
+        cache.store("key", [])
+
+        assert cache.load("key") == []
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test that unreadable entries are treated as a miss."""
+        cache = EnumComparisonCache(str(tmp_path))
+        (tmp_path / "key.json").write_text("{not json")
+
+        assert cache.load("key") is None
+
+
+class TestCatalogSnapshotCache:
+    def test_in_process_roundtrip(self):
+        """Test that snapshots are reused in memory without a directory."""
+        snapshots = CatalogSnapshotCache()
+        key = snapshots.make_key(["public"], "1:2:abc")
+
+        assert snapshots.load(key) is None
+        snapshots.store(key, {"public": {"status": ("a",)}})
+
+        assert CatalogSnapshotCache().load(key) == {"public": {"status": ("a",)}}
+
+    def test_make_key_ignores_schema_order(self):
+        """Test that the same set of schemas maps to one snapshot."""
+        snapshots = CatalogSnapshotCache()
+
+        assert snapshots.make_key(["a", "b"], "f") == snapshots.make_key(
+            ["b", "a"], "f"
+        )
+        assert snapshots.make_key(["a"], "f") != snapshots.make_key(["a"], "g")
+
+    def test_on_disk_roundtrip(self, tmp_path):
+        """Test that snapshots survive the process through the directory."""
+        snapshots = CatalogSnapshotCache(str(tmp_path))
+        key = snapshots.make_key(["public"], "1:2:abc")
+        snapshots.store(key, {"public": {"status": ("a", "b")}})
+
+        alembic_pg_enum_generator.cache._catalog_snapshots.clear()
+
+        assert CatalogSnapshotCache(str(tmp_path)).load(key) == {
+            "public": {"status": ("a", "b")}
+        }
+
+    def test_in_process_snapshots_are_bounded(self):
+        """Test that the oldest in-process snapshots are evicted."""
+        snapshots = CatalogSnapshotCache()
+        limit = alembic_pg_enum_generator.cache.MAX_IN_PROCESS_SNAPSHOTS
+
+        for index in range(limit + 1):
+            snapshots.store(f"key-{index}", {})
+
+        assert snapshots.load("key-0") is None
+        assert snapshots.load(f"key-{limit}") == {}
+
+
+class TestCompareWithCache:
+    def _autogen_context(self):
+        autogen_context = Mock()
+        autogen_context.connection.dialect.name = "postgresql"
+        autogen_context.connection.dialect.default_schema_name = "public"
+        return autogen_context
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_catalog_fingerprint")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_cache_hit_skips_catalog_fetch(
+        self,
+        mock_get_defined,
+        mock_get_declared,
+        mock_get_fingerprint,
+        mock_get_config,
+        tmp_path,
+    ):
+        """Test that a second run with unchanged inputs is served from cache."""
+        mock_get_config.return_value = Config(cache_dir=str(tmp_path))
+        mock_get_fingerprint.return_value = "2:100:abc"
+        mock_get_declared.return_value = {"public": {"status": ("a", "b")}}
+        mock_get_defined.return_value = {"public": {"status": ("a",)}}
+
+        first_ops = Mock(ops=[])
+        compare_enums_for_additions(self._autogen_context(), first_ops, ["public"])
+
+        second_ops = Mock(ops=[])
+        compare_enums_for_additions(self._autogen_context(), second_ops, ["public"])
+
+        mock_get_defined.assert_called_once()
+        assert [op.value for op in first_ops.ops] == ["b"]
+        assert [op.value for op in second_ops.ops] == ["b"]
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_catalog_fingerprint")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_catalog_change_invalidates(
+        self,
+        mock_get_defined,
+        mock_get_declared,
+        mock_get_fingerprint,
+        mock_get_config,
+        tmp_path,
+    ):
+        """Test that a changed catalog fingerprint forces a full comparison."""
+        mock_get_config.return_value = Config(cache_dir=str(tmp_path))
+        mock_get_declared.return_value = {"public": {"status": ("a", "b")}}
+        mock_get_defined.return_value = {"public": {"status": ("a",)}}
+
+        mock_get_fingerprint.return_value = "1:100:abc"
+        compare_enums_for_additions(self._autogen_context(), Mock(ops=[]), ["public"])
+
+        mock_get_fingerprint.return_value = "2:101:def"
+        mock_get_defined.return_value = {"public": {"status": ("a", "b")}}
+        upgrade_ops = Mock(ops=[])
+        compare_enums_for_additions(self._autogen_context(), upgrade_ops, ["public"])
+
+        assert mock_get_defined.call_count == 2
+        assert upgrade_ops.ops == []
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_catalog_fingerprint")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_cache_disabled_by_default(
+        self, mock_get_defined, mock_get_fingerprint, mock_get_config
+    ):
+        """Test that no fingerprint is taken without a cache directory."""
+        mock_get_config.return_value = Config()
+        mock_get_defined.return_value = {}
+
+        compare_enums_for_additions(self._autogen_context(), Mock(ops=[]), ["public"])
+
+        mock_get_fingerprint.assert_not_called()
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_catalog_fingerprint")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_snapshot_reused_while_fingerprint_matches(
+        self,
+        mock_get_defined,
+        mock_get_declared,
+        mock_get_fingerprint,
+        mock_get_config,
+    ):
+        """Test that an unchanged catalog is not fetched twice."""
+        mock_get_config.return_value = Config(
+            reuse_catalog_snapshots=True,
+            include_name=lambda name: name.endswith("_status"),
+        )
+        mock_get_fingerprint.return_value = "2:100:abc"
+        mock_get_declared.return_value = {"public": {"user_status": ("a", "b")}}
+        mock_get_defined.return_value = {
+            "public": {"user_status": ("a",), "priority": ("low",)}
+        }
+
+        compare_enums_for_additions(self._autogen_context(), Mock(ops=[]), ["public"])
+        upgrade_ops = Mock(ops=[])
+        compare_enums_for_additions(self._autogen_context(), upgrade_ops, ["public"])
+
+        # Full fetch happens once and is unfiltered so the snapshot is reusable
+        mock_get_defined.assert_called_once()
+        assert mock_get_defined.call_args.kwargs.get("include_name") is None
+        assert [op.value for op in upgrade_ops.ops] == ["b"]
+
+        # A changed catalog pays for the full fetch again
+        mock_get_fingerprint.return_value = "3:101:def"
+        compare_enums_for_additions(self._autogen_context(), Mock(ops=[]), ["public"])
+        assert mock_get_defined.call_count == 2
@@ -1,9 +1,15 @@
 """Tests for compare_dispatch module."""
 
+import threading
 from unittest.mock import Mock, patch
 
+import pytest
+
 from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
+from alembic_pg_enum_generator.add_enum_values_block_op import AddEnumValuesBlockOp
+from alembic_pg_enum_generator.add_enum_values_op import AddEnumValuesOp
 from alembic_pg_enum_generator.compare_dispatch import compare_enums_for_additions
+from alembic_pg_enum_generator.config import Config
 
 
 class MockUpgradeOps:
@@ -23,14 +29,18 @@ class MockAutogenContext:
 
 class TestCompareEnumsForAdditions:
     @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_no_new_values(self, mock_get_defined, mock_get_declared, mock_get_config):
         """Test when there are no new enum values to add."""
         # Setup mocks
-        mock_get_config.return_value = Mock(include_name=None)
-        mock_get_declared.return_value = {"user_status": ("active", "inactive")}
-        mock_get_defined.return_value = {"user_status": ("active", "inactive")}
+        mock_get_config.return_value = Config(include_name=None)
+        mock_get_declared.return_value = {
+            "public": {"user_status": ("active", "inactive")}
+        }
+        mock_get_defined.return_value = {
+            "public": {"user_status": ("active", "inactive")}
+        }
 
         autogen_context = MockAutogenContext()
         upgrade_ops = MockUpgradeOps()
@@ -41,19 +51,23 @@ class TestCompareEnumsForAdditions:
         assert len(upgrade_ops.ops) == 0
 
     @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_single_new_value(
         self, mock_get_defined, mock_get_declared, mock_get_config
     ):
         """Test when there is a single new enum value to add."""
         # Setup mocks
-        mock_get_config.return_value = Mock(include_name=None)
+        mock_get_config.return_value = Config(include_name=None)
         mock_get_declared.return_value = {
-            "user_status": ("active", "inactive", "pending")  # Has new 'pending'
+            "public": {
+                "user_status": ("active", "inactive", "pending")  # Has new 'pending'
+            }
         }
         mock_get_defined.return_value = {
-            "user_status": ("active", "inactive")  # Missing 'pending'
+            "public": {
+                "user_status": ("active", "inactive")  # Missing 'pending'
+            }
         }
 
         autogen_context = MockAutogenContext()
@@ -70,23 +84,27 @@ class TestCompareEnumsForAdditions:
         assert op.value == "pending"
 
     @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_multiple_new_values(
         self, mock_get_defined, mock_get_declared, mock_get_config
     ):
         """Test when there are multiple new enum values to add."""
         # Setup mocks
-        mock_get_config.return_value = Mock(include_name=None)
+        mock_get_config.return_value = Config(include_name=None)
         mock_get_declared.return_value = {
-            "user_status": (
-                "active",
-                "inactive",
-                "pending",
-                "suspended",
-            )  # Two new values
+            "public": {
+                "user_status": (
+                    "active",
+                    "inactive",
+                    "pending",
+                    "suspended",
+                )  # Two new values
+            }
+        }
+        mock_get_defined.return_value = {
+            "public": {"user_status": ("active", "inactive")}
         }
-        mock_get_defined.return_value = {"user_status": ("active", "inactive")}
 
         autogen_context = MockAutogenContext()
         upgrade_ops = MockUpgradeOps()
@@ -108,19 +126,23 @@ class TestCompareEnumsForAdditions:
             assert op.enum_name == "user_status"
 
     @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_multiple_enums(self, mock_get_defined, mock_get_declared, mock_get_config):
         """Test when multiple enums have new values."""
         # Setup mocks
-        mock_get_config.return_value = Mock(include_name=None)
+        mock_get_config.return_value = Config(include_name=None)
         mock_get_declared.return_value = {
-            "user_status": ("active", "inactive", "pending"),
-            "order_status": ("draft", "submitted", "shipped"),
+            "public": {
+                "user_status": ("active", "inactive", "pending"),
+                "order_status": ("draft", "submitted", "shipped"),
+            }
         }
         mock_get_defined.return_value = {
-            "user_status": ("active", "inactive"),
-            "order_status": ("draft", "submitted"),
+            "public": {
+                "user_status": ("active", "inactive"),
+                "order_status": ("draft", "submitted"),
+            }
         }
 
         autogen_context = MockAutogenContext()
@@ -141,21 +163,25 @@ class TestCompareEnumsForAdditions:
         assert ops_by_enum["order_status"].value == "shipped"
 
     @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_enum_not_in_database(
         self, mock_get_defined, mock_get_declared, mock_get_config
     ):
         """Test when enum exists in code but not in database (should be skipped)."""
         # Setup mocks
-        mock_get_config.return_value = Mock(include_name=None)
+        mock_get_config.return_value = Config(include_name=None)
         mock_get_declared.return_value = {
-            "user_status": ("active", "inactive", "pending"),
-            "new_enum": ("value1", "value2"),  # Enum not in database
+            "public": {
+                "user_status": ("active", "inactive", "pending"),
+                "new_enum": ("value1", "value2"),  # Enum not in database
+            }
         }
         mock_get_defined.return_value = {
-            "user_status": ("active", "inactive")
-            # "new_enum" not in database
+            "public": {
+                "user_status": ("active", "inactive")
+                # "new_enum" not in database
+            }
         }
 
         autogen_context = MockAutogenContext()
@@ -180,18 +206,20 @@ class TestCompareEnumsForAdditions:
         assert len(upgrade_ops.ops) == 0
 
     @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_none_schema_handling(
         self, mock_get_defined, mock_get_declared, mock_get_config
     ):
         """Test handling of None schema (should use default)."""
         # Setup mocks
-        mock_get_config.return_value = Mock(include_name=None)
+        mock_get_config.return_value = Config(include_name=None)
         mock_get_declared.return_value = {
-            "user_status": ("active", "inactive", "pending")
+            "public": {"user_status": ("active", "inactive", "pending")}
+        }
+        mock_get_defined.return_value = {
+            "public": {"user_status": ("active", "inactive")}
         }
-        mock_get_defined.return_value = {"user_status": ("active", "inactive")}
 
         autogen_context = MockAutogenContext()
         upgrade_ops = MockUpgradeOps()
@@ -206,19 +234,27 @@ class TestCompareEnumsForAdditions:
         assert op.value == "pending"
 
     @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_removed_values_ignored(
         self, mock_get_defined, mock_get_declared, mock_get_config
     ):
         """Test that removed enum values are ignored (add-only behavior)."""
         # Setup mocks
-        mock_get_config.return_value = Mock(include_name=None)
+        mock_get_config.return_value = Config(include_name=None)
         mock_get_declared.return_value = {
-            "user_status": ("active", "pending")  # Missing 'inactive' from code
+            "public": {
+                "user_status": ("active", "pending")  # Missing 'inactive' from code
+            }
         }
         mock_get_defined.return_value = {
-            "user_status": ("active", "inactive", "suspended")  # Has extra values in DB
+            "public": {
+                "user_status": (
+                    "active",
+                    "inactive",
+                    "suspended",
+                )  # Has extra values in DB
+            }
         }
 
         autogen_context = MockAutogenContext()
@@ -232,17 +268,17 @@ class TestCompareEnumsForAdditions:
         assert op.value == "pending"
 
     @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums")
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_configuration_include_name_filter(
         self, mock_get_defined, mock_get_declared, mock_get_config
     ):
         """Test that configuration include_name filter is passed through."""
         # Setup mocks
         include_name_filter = Mock()
-        mock_get_config.return_value = Mock(include_name=include_name_filter)
-        mock_get_declared.return_value = {}
-        mock_get_defined.return_value = {}
+        mock_get_config.return_value = Config(include_name=include_name_filter)
+        mock_get_declared.return_value = {"public": {}}
+        mock_get_defined.return_value = {"public": {"user_status": ("active",)}}
 
         autogen_context = MockAutogenContext()
         upgrade_ops = MockUpgradeOps()
@@ -252,12 +288,309 @@ class TestCompareEnumsForAdditions:
         # Verify the filter was passed to both functions
         mock_get_declared.assert_called_once_with(
             metadata=[autogen_context.metadata],
-            schema="public",
             default_schema="public",
             include_name=include_name_filter,
+            instrumentation=None,
         )
         mock_get_defined.assert_called_once_with(
             connection=autogen_context.connection,
-            schema="public",
+            schemas=["public"],
             include_name=include_name_filter,
+            instrumentation=None,
+            enum_filter=None,
+        )
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_multiple_schemas_single_catalog_query(
+        self, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that all schemas are introspected with a single catalog call."""
+        mock_get_config.return_value = Config(include_name=None)
+        mock_get_declared.return_value = {
+            "public": {"user_status": ("active", "pending")},
+            "tenant_2": {"user_status": ("active", "pending")},
+        }
+        mock_get_defined.return_value = {"tenant_2": {"user_status": ("active",)}}
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(
+            autogen_context, upgrade_ops, [None, "tenant_1", "tenant_2", "public"]
+        )
+
+        # One catalog call covering every schema, default schema deduplicated
+        mock_get_defined.assert_called_once_with(
+            connection=autogen_context.connection,
+            schemas=["public", "tenant_1", "tenant_2"],
+            include_name=None,
+            instrumentation=None,
+            enum_filter=None,
+        )
+
+        # Metadata is walked once for all schemas
+        mock_get_declared.assert_called_once()
+
+        assert len(upgrade_ops.ops) == 1
+        op = upgrade_ops.ops[0]
+        assert op.enum_schema == "tenant_2"
+        assert op.value == "pending"
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_new_values_carry_declared_placement(
+        self, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that ops keep the declared order with BEFORE/AFTER placement."""
+        mock_get_config.return_value = Config(include_name=None)
+        mock_get_declared.return_value = {
+            "public": {"priority": ("lowest", "low", "medium", "high", "critical")}
+        }
+        mock_get_defined.return_value = {"public": {"priority": ("low", "high")}}
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        placements = [(op.value, op.before, op.after) for op in upgrade_ops.ops]
+        assert placements == [
+            ("lowest", "low", None),
+            ("medium", None, "low"),
+            ("critical", None, None),
+        ]
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_parallel")
+    def test_parallel_introspection(
+        self, mock_get_parallel, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that introspection_workers fans out over the connection's engine."""
+        mock_get_config.return_value = Config(introspection_workers=8)
+        mock_get_declared.return_value = {"tenant_1": {"status": ("a", "b")}}
+        mock_get_parallel.return_value = {"tenant_1": {"status": ("a",)}}
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(
+            autogen_context, upgrade_ops, ["public", "tenant_1"]
         )
+
+        mock_get_defined.assert_not_called()
+        mock_get_parallel.assert_called_once_with(
+            engine=autogen_context.connection.engine,
+            schemas=["public", "tenant_1"],
+            include_name=None,
+            max_workers=8,
+            instrumentation=None,
+            enum_filter=None,
+        )
+        assert [op.value for op in upgrade_ops.ops] == ["b"]
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_pipelined_overlaps_walk_and_fetch(
+        self, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that the metadata walk runs while the catalog fetch is in flight."""
+        mock_get_config.return_value = Config(pipelined=True)
+        fetch_started = threading.Event()
+        walk_done = threading.Event()
+        threads = {}
+
+        def fetch(**kwargs):
+            threads["fetch"] = threading.current_thread()
+            fetch_started.set()
+            # Still in flight until the walk finished on the other thread
+            assert walk_done.wait(timeout=5)
+            return {"public": {"user_status": ("active",)}}
+
+        def walk(**kwargs):
+            threads["walk"] = threading.current_thread()
+            assert fetch_started.wait(timeout=5)
+            walk_done.set()
+            return {"public": {"user_status": ("active", "pending")}}
+
+        mock_get_defined.side_effect = fetch
+        mock_get_declared.side_effect = walk
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        assert threads["walk"] is threading.main_thread()
+        assert threads["fetch"] is not threading.main_thread()
+        assert [op.value for op in upgrade_ops.ops] == ["pending"]
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_pipelined_propagates_fetch_errors(
+        self, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that a failing background fetch fails the comparison."""
+        mock_get_config.return_value = Config(pipelined=True)
+        mock_get_defined.side_effect = RuntimeError("connection lost")
+        mock_get_declared.return_value = {}
+
+        with pytest.raises(RuntimeError, match="connection lost"):
+            compare_enums_for_additions(
+                MockAutogenContext(), MockUpgradeOps(), ["public"]
+            )
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_missing_enum_values")
+    def test_server_side_diff(
+        self, mock_get_missing, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that only the server-computed deltas are turned into ops."""
+        mock_get_config.return_value = Config(server_side_diff=True)
+        mock_get_declared.return_value = {
+            "public": {"priority": ("lowest", "low", "medium", "high", "critical")},
+            "other": {"ignored": ("a",)},
+        }
+        mock_get_missing.return_value = {
+            ("public", "priority"): (
+                frozenset({"lowest", "medium", "critical"}),
+                "high",
+            )
+        }
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        mock_get_defined.assert_not_called()
+        mock_get_missing.assert_called_once_with(
+            autogen_context.connection,
+            {"public": {"priority": ("lowest", "low", "medium", "high", "critical")}},
+            instrumentation=None,
+        )
+        placements = [(op.value, op.before, op.after) for op in upgrade_ops.ops]
+        assert placements == [
+            ("lowest", "low", None),
+            ("medium", None, "low"),
+            ("critical", None, None),
+        ]
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.iter_defined_enums")
+    def test_streaming_catalog(
+        self, mock_iter_defined, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that streamed rows are diffed and emitted in declared order."""
+        mock_get_config.return_value = Config(stream_catalog_batch_size=100)
+        mock_get_declared.return_value = {
+            "public": {"user_status": ("a", "b"), "priority": ("low", "high")},
+        }
+        mock_iter_defined.return_value = iter(
+            [
+                ("public", "priority", ("low",)),
+                ("public", "undeclared", ("x",)),
+                ("public", "user_status", ("a",)),
+            ]
+        )
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        mock_get_defined.assert_not_called()
+        mock_iter_defined.assert_called_once_with(
+            autogen_context.connection, ["public"], enum_filter=None, batch_size=100
+        )
+        assert [(op.enum_name, op.value) for op in upgrade_ops.ops] == [
+            ("user_status", "b"),
+            ("priority", "high"),
+        ]
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_group_enum_values(
+        self, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that several new values of one type become one grouped op."""
+        mock_get_config.return_value = Config(group_enum_values=True)
+        mock_get_declared.return_value = {
+            "public": {
+                "priority": ("lowest", "low", "medium", "high"),
+                "user_status": ("active", "pending"),
+            }
+        }
+        mock_get_defined.return_value = {
+            "public": {"priority": ("low", "high"), "user_status": ("active",)}
+        }
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        grouped, single = upgrade_ops.ops
+        assert isinstance(grouped, AddEnumValuesOp)
+        assert grouped.enum_name == "priority"
+        assert grouped.values == ["lowest", "medium"]
+        assert grouped.before == {"lowest": "low"}
+        assert grouped.after == {"medium": "low"}
+        assert isinstance(single, AddEnumValueOp)
+        assert single.value == "pending"
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_idempotent_ops(self, mock_get_defined, mock_get_declared, mock_get_config):
+        """Test that emitted ops carry the configured idempotency options."""
+        mock_get_config.return_value = Config(
+            add_value_if_not_exists=True, skip_existing_values=True
+        )
+        mock_get_declared.return_value = {"public": {"user_status": ("a", "b")}}
+        mock_get_defined.return_value = {"public": {"user_status": ("a",)}}
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        (op,) = upgrade_ops.ops
+        assert op.if_not_exists is True
+        assert op.skip_existing is True
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_add_value_strategy_wraps_ops(
+        self, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that all additions are wrapped in one block op."""
+        mock_get_config.return_value = Config(add_value_strategy="autocommit")
+        mock_get_declared.return_value = {
+            "public": {"user_status": ("a", "b"), "priority": ("low", "high")}
+        }
+        mock_get_defined.return_value = {
+            "public": {"user_status": ("a",), "priority": ("low",)}
+        }
+
+        autogen_context = MockAutogenContext()
+        upgrade_ops = MockUpgradeOps()
+
+        compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        (block,) = upgrade_ops.ops
+        assert isinstance(block, AddEnumValuesBlockOp)
+        assert block.strategy == "autocommit"
+        assert [op.value for op in block.ops] == ["b", "high"]
@@ -1,13 +1,18 @@
 """Tests for declared_enums module."""
 
+import gc
 from enum import Enum as PyEnum
+from unittest.mock import Mock, patch
 
 from sqlalchemy import ARRAY, Column, Enum, Integer, MetaData, String, Table
 from sqlalchemy.types import TypeDecorator
 
 from alembic_pg_enum_generator.declared_enums import (
+    _declared_enum,
+    _non_enum_type_classes,
     column_type_is_enum,
     get_declared_enums,
+    get_declared_enums_by_schema,
     get_enum_values,
 )
 
@@ -249,3 +254,158 @@ class TestGetDeclaredEnums:
 
         assert "user_status" in declared_enums
         assert "order_status" in declared_enums
+
+
+class TestGetDeclaredEnumsBySchema:
+    def test_get_declared_enums_by_schema_partitions(self):
+        """Test that enums are partitioned by their resolved schema."""
+        metadata = MetaData()
+
+        Table(
+            "users",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("status", Enum(TestStatus, name="user_status", native_enum=True)),
+            Column(
+                "order_status",
+                Enum(
+                    OrderStatus,
+                    name="order_status",
+                    native_enum=True,
+                    schema="other_schema",
+                ),
+            ),
+        )
+
+        declared_enums = get_declared_enums_by_schema(
+            metadata=metadata, default_schema="public"
+        )
+
+        assert declared_enums == {
+            "public": {"user_status": ("active", "inactive", "pending")},
+            "other_schema": {"order_status": ("draft", "submitted")},
+        }
+
+    def test_get_declared_enums_by_schema_single_pass(self):
+        """Test that each table is visited once for all schemas."""
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("status", Enum(TestStatus, name="user_status", native_enum=True)),
+        )
+
+        visited = []
+        tables = metadata.tables
+
+        class CountingTables(dict):
+            def values(self):
+                visited.append(True)
+                return tables.values()
+
+        metadata_mock = Mock(tables=CountingTables())
+        declared_enums = get_declared_enums_by_schema(
+            metadata=[metadata_mock], default_schema="public"
+        )
+
+        assert len(visited) == 1
+        assert "user_status" in declared_enums["public"]
+
+    def test_get_declared_enums_by_schema_with_filter(self):
+        """Test filtering enums by name while indexing."""
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("status", Enum(TestStatus, name="user_status", native_enum=True)),
+            Column(
+                "priority", Enum(OrderStatus, name="user_priority", native_enum=True)
+            ),
+        )
+
+        declared_enums = get_declared_enums_by_schema(
+            metadata=metadata,
+            default_schema="public",
+            include_name=lambda name: name.endswith("_status"),
+        )
+
+        assert declared_enums == {
+            "public": {"user_status": ("active", "inactive", "pending")}
+        }
+
+
+class NestedDecorator(TypeDecorator):
+    """TypeDecorator wrapping another TypeDecorator."""
+
+    impl = CustomTypeDecorator
+    cache_ok = True
+
+
+class ArrayDecorator(TypeDecorator):
+    """TypeDecorator wrapping an array of enums."""
+
+    impl = ARRAY(Enum("a", "b", name="tag_kind"))
+    cache_ok = True
+
+
+class TestDeclaredEnumClassification:
+    def test_shared_type_classified_once(self):
+        """Test that labels are extracted once per shared type object."""
+        metadata = MetaData()
+        status = Enum(TestStatus, name="shared_status")
+        for index in range(5):
+            Table(f"table_{index}", metadata, Column("status", status))
+
+        with patch(
+            "alembic_pg_enum_generator.declared_enums.get_enum_values",
+            wraps=get_enum_values,
+        ) as mock_get_enum_values:
+            get_declared_enums_by_schema(metadata, default_schema="public")
+            get_declared_enums_by_schema(metadata, default_schema="public")
+
+        assert mock_get_enum_values.call_count == 1
+
+    def test_non_enum_classes_cached_negatively(self):
+        """Test that plain column type classes are remembered as non-enums."""
+        assert _declared_enum(Integer()) is None
+        assert Integer in _non_enum_type_classes
+
+    def test_nested_wrappers_unwrapped(self):
+        """Test TypeDecorator and ARRAY chains of any depth."""
+        assert _declared_enum(NestedDecorator()) == (
+            "custom_status",
+            None,
+            ("active", "inactive", "pending"),
+        )
+        assert _declared_enum(ArrayDecorator()) == ("tag_kind", None, ("a", "b"))
+        assert _declared_enum(ARRAY(CustomTypeDecorator())) is not None
+
+    def test_non_native_enum_not_cached_by_class(self):
+        """Test that the Enum class itself is never cached as a non-enum."""
+        assert _declared_enum(Enum("a", name="plain", native_enum=False)) is None
+        assert _declared_enum(Enum("a", name="native")) == ("native", None, ("a",))
+
+    def test_schema_read_after_attach(self):
+        """Test that schemas inherited on attach are not cached stale."""
+        enum_type = Enum("a", name="inherited")
+        assert _declared_enum(enum_type) == ("inherited", None, ("a",))
+
+        Table("t", MetaData(schema="tenant_1"), Column("kind", enum_type))
+
+        assert _declared_enum(enum_type) == ("inherited", "tenant_1", ("a",))
+
+    def test_enum_collected_before_column_type(self):
+        """Test that a collected enum is resolved again instead of failing."""
+        column_type = CustomTypeDecorator()
+        assert _declared_enum(column_type)[0] == "custom_status"
+
+        # Drop the only reference to the memoized enum
+        column_type.impl = Enum(OrderStatus, name="order_status")
+        gc.collect()
+
+        assert _declared_enum(column_type) == (
+            "order_status",
+            None,
+            ("draft", "submitted"),
+        )
+        assert _declared_enum(column_type)[0] == "order_status"
@@ -1,46 +1,22 @@
 """Tests for defined_enums module."""
 
-from unittest.mock import Mock
+import json
+from unittest.mock import MagicMock, Mock
 
 from alembic_pg_enum_generator.defined_enums import (
-    _extract_enum_name,
     get_all_enums,
+    get_all_enums_for_schemas,
+    get_catalog_fingerprint,
     get_defined_enums,
+    get_defined_enums_by_schema,
+    get_defined_enums_parallel,
+    get_existing_enum_labels,
+    get_missing_enum_values,
+    iter_defined_enums,
+    record_enum_labels,
 )
 
 
-class TestExtractEnumName:
-    def test_extract_enum_name_no_schema(self):
-        """Test extracting enum name without schema prefix."""
-        result = _extract_enum_name("user_status", "public")
-        assert result == "user_status"
-
-    def test_extract_enum_name_with_schema(self):
-        """Test extracting enum name with schema prefix."""
-        result = _extract_enum_name("public.user_status", "public")
-        assert result == "user_status"
-
-    def test_extract_enum_name_with_quoted_schema(self):
-        """Test extracting enum name with quoted schema prefix."""
-        result = _extract_enum_name('"public".user_status', "public")
-        assert result == "user_status"
-
-    def test_extract_enum_name_with_quotes(self):
-        """Test extracting enum name with quotes around name."""
-        result = _extract_enum_name('"user_status"', "public")
-        assert result == "user_status"
-
-    def test_extract_enum_name_with_schema_and_quotes(self):
-        """Test extracting enum name with both schema and quotes."""
-        result = _extract_enum_name('"public"."user_status"', "public")
-        assert result == "user_status"
-
-    def test_extract_enum_name_different_schema(self):
-        """Test extracting enum name with different schema."""
-        result = _extract_enum_name("other_schema.user_status", "public")
-        assert result == "other_schema.user_status"  # Should not strip different schema
-
-
 class TestGetAllEnums:
     def test_get_all_enums_sql_query(self):
         """Test that get_all_enums executes the correct SQL query."""
@@ -60,6 +36,51 @@ class TestGetAllEnums:
         assert call_args.args[1] == {"schema": "public"}
         assert result == mock_result
 
+    def test_get_all_enums_single_aggregated_query(self):
+        """Test that labels are aggregated by a join, not a subquery per type."""
+        mock_connection = Mock()
+
+        get_all_enums(mock_connection, "public")
+
+        sql = str(mock_connection.execute.call_args.args[0])
+        assert "array_agg(e.enumlabel ORDER BY e.enumsortorder)" in sql
+        assert "LEFT JOIN pg_catalog.pg_enum e ON e.enumtypid = t.oid" in sql
+        assert "format_type" not in sql
+        assert "ARRAY(SELECT" not in sql
+        assert "{conditions}" not in sql
+
+
+class TestGetAllEnumsForSchemas:
+    def test_get_all_enums_for_schemas_sql_query(self):
+        """Test that all schemas are fetched with one query."""
+        mock_connection = Mock()
+        mock_result = Mock()
+        mock_connection.execute.return_value = mock_result
+
+        result = get_all_enums_for_schemas(mock_connection, ("public", "tenant_1"))
+
+        mock_connection.execute.assert_called_once()
+        call_args = mock_connection.execute.call_args
+
+        assert "n.nspname = ANY(:schemas)" in str(call_args.args[0])
+        assert call_args.args[1] == {"schemas": ["public", "tenant_1"]}
+        assert result == mock_result
+
+
+class TestGetCatalogFingerprint:
+    def test_get_catalog_fingerprint(self):
+        """Test that the fingerprint combines count, max oid and hash."""
+        mock_connection = Mock()
+        mock_connection.execute.return_value.one.return_value = (12, 16501, "abc")
+
+        result = get_catalog_fingerprint(mock_connection, ["public", "tenant_1"])
+
+        call_args = mock_connection.execute.call_args
+        assert "pg_catalog.pg_enum" in str(call_args.args[0])
+        assert "md5(string_agg(" in str(call_args.args[0])
+        assert call_args.args[1] == {"schemas": ["public", "tenant_1"]}
+        assert result == "12:16501:abc"
+
 
 class TestGetDefinedEnums:
     def test_get_defined_enums_empty_result(self):
@@ -75,7 +96,7 @@ class TestGetDefinedEnums:
         """Test get_defined_enums with single enum."""
         mock_connection = Mock()
         mock_connection.execute.return_value = [
-            ("user_status", ["active", "inactive", "pending"])
+            ("user_status", 16401, ["active", "inactive", "pending"])
         ]
 
         result = get_defined_enums(mock_connection, "public")
@@ -86,8 +107,8 @@ class TestGetDefinedEnums:
         """Test get_defined_enums with multiple enums."""
         mock_connection = Mock()
         mock_connection.execute.return_value = [
-            ("user_status", ["active", "inactive"]),
-            ("order_status", ["draft", "submitted", "shipped"]),
+            ("user_status", 16402, ["active", "inactive"]),
+            ("order_status", 16403, ["draft", "submitted", "shipped"]),
         ]
 
         result = get_defined_enums(mock_connection, "public")
@@ -97,28 +118,13 @@ class TestGetDefinedEnums:
             "order_status": ("draft", "submitted", "shipped"),
         }
 
-    def test_get_defined_enums_with_schema_prefix(self):
-        """Test get_defined_enums with schema prefixed enum names."""
-        mock_connection = Mock()
-        mock_connection.execute.return_value = [
-            ("public.user_status", ["active", "inactive"]),
-            ('"public".order_status', ["draft", "submitted"]),
-        ]
-
-        result = get_defined_enums(mock_connection, "public")
-
-        assert result == {
-            "user_status": ("active", "inactive"),
-            "order_status": ("draft", "submitted"),
-        }
-
     def test_get_defined_enums_with_filter(self):
         """Test get_defined_enums with include_name filter."""
         mock_connection = Mock()
         mock_connection.execute.return_value = [
-            ("user_status", ["active", "inactive"]),
-            ("user_priority", ["low", "high"]),
-            ("order_status", ["draft", "submitted"]),
+            ("user_status", 16404, ["active", "inactive"]),
+            ("user_priority", 16405, ["low", "high"]),
+            ("order_status", 16406, ["draft", "submitted"]),
         ]
 
         # Only include enums ending with '_status'
@@ -137,12 +143,12 @@ class TestGetDefinedEnums:
         }
         assert "user_priority" not in result
 
-    def test_get_defined_enums_with_quotes(self):
-        """Test get_defined_enums with quoted enum names."""
+    def test_get_defined_enums_raw_names(self):
+        """Test that raw type names are used as-is, without unquoting."""
         mock_connection = Mock()
         mock_connection.execute.return_value = [
-            ('"user_status"', ["active", "inactive"]),
-            ('"order-status"', ["draft", "submitted"]),  # Hyphenated name
+            ("user_status", 16385, ["active", "inactive"]),
+            ("order-status", 16390, ["draft", "submitted"]),  # Needs quoting in SQL
         ]
 
         result = get_defined_enums(mock_connection, "public")
@@ -155,7 +161,7 @@ class TestGetDefinedEnums:
     def test_get_defined_enums_empty_enum(self):
         """Test get_defined_enums with enum that has no values."""
         mock_connection = Mock()
-        mock_connection.execute.return_value = [("empty_status", [])]
+        mock_connection.execute.return_value = [("empty_status", 16407, [])]
 
         result = get_defined_enums(mock_connection, "public")
 
@@ -165,9 +171,9 @@ class TestGetDefinedEnums:
         """Test get_defined_enums with default include_name (no filter)."""
         mock_connection = Mock()
         mock_connection.execute.return_value = [
-            ("user_status", ["active"]),
-            ("_internal_enum", ["value"]),
-            ("123_numeric", ["test"]),
+            ("user_status", 16408, ["active"]),
+            ("_internal_enum", 16409, ["value"]),
+            ("123_numeric", 16410, ["test"]),
         ]
 
         result = get_defined_enums(mock_connection, "public")
@@ -177,3 +183,293 @@ class TestGetDefinedEnums:
         assert "user_status" in result
         assert "_internal_enum" in result
         assert "123_numeric" in result
+
+
+class TestGetDefinedEnumsBySchema:
+    def test_get_defined_enums_by_schema_partitions_rows(self):
+        """Test that rows are indexed by schema under their raw names."""
+        mock_connection = Mock()
+        mock_connection.execute.return_value = [
+            ("public", "user_status", 16385, ["active", "inactive"]),
+            ("tenant_1", "user_status", 16392, ["active"]),
+            ("tenant_1", "order-status", 16398, ["draft"]),
+        ]
+
+        result = get_defined_enums_by_schema(mock_connection, ["public", "tenant_1"])
+
+        mock_connection.execute.assert_called_once()
+        assert result == {
+            "public": {"user_status": ("active", "inactive")},
+            "tenant_1": {
+                "user_status": ("active",),
+                "order-status": ("draft",),
+            },
+        }
+
+    def test_get_defined_enums_by_schema_skips_empty_schemas(self):
+        """Test that schemas without enum types are absent from the result."""
+        mock_connection = Mock()
+        mock_connection.execute.return_value = [
+            ("public", "user_status", 16414, ["active"]),
+        ]
+
+        result = get_defined_enums_by_schema(mock_connection, ["public", "empty"])
+
+        assert result == {"public": {"user_status": ("active",)}}
+
+    def test_get_defined_enums_by_schema_with_filter(self):
+        """Test get_defined_enums_by_schema with include_name filter."""
+        mock_connection = Mock()
+        mock_connection.execute.return_value = [
+            ("public", "user_status", 16415, ["active"]),
+            ("public", "user_priority", 16416, ["low"]),
+        ]
+
+        result = get_defined_enums_by_schema(
+            mock_connection,
+            ["public"],
+            include_name=lambda name: name.endswith("_status"),
+        )
+
+        assert result == {"public": {"user_status": ("active",)}}
+
+    def test_get_defined_enums_by_schema_no_schemas(self):
+        """Test that no query is issued when there are no schemas."""
+        mock_connection = Mock()
+
+        result = get_defined_enums_by_schema(mock_connection, [])
+
+        assert result == {}
+        mock_connection.execute.assert_not_called()
+
+
+class TestIterDefinedEnums:
+    def test_streams_through_server_side_cursor(self):
+        """Test that rows are fetched in batches and yielded lazily."""
+        mock_connection = Mock()
+        result = mock_connection.execute.return_value
+        result.partitions.return_value = iter(
+            [
+                [("public", "user_status", 16385, ["active"])],
+                [("tenant_1", "priority", 16392, ["low", "high"])],
+            ]
+        )
+
+        rows = iter_defined_enums(
+            mock_connection, ["public", "tenant_1"], batch_size=50
+        )
+        mock_connection.execute.assert_not_called()
+
+        assert list(rows) == [
+            ("public", "user_status", ("active",)),
+            ("tenant_1", "priority", ("low", "high")),
+        ]
+        statement, params = mock_connection.execute.call_args.args
+        assert statement.get_execution_options() == {"stream_results": True}
+        assert params == {"schemas": ["public", "tenant_1"]}
+        result.partitions.assert_called_once_with(50)
+        result.close.assert_called_once()
+
+    def test_closes_cursor_when_abandoned(self):
+        """Test that stopping early releases the server-side cursor."""
+        mock_connection = Mock()
+        result = mock_connection.execute.return_value
+        result.partitions.return_value = iter(
+            [[("public", "a", 1, ["x"]), ("public", "b", 2, ["y"])]]
+        )
+
+        rows = iter_defined_enums(mock_connection, ["public"])
+        assert next(rows) == ("public", "a", ("x",))
+        rows.close()
+
+        result.close.assert_called_once()
+
+    def test_no_schemas(self):
+        """Test that no query is issued without schemas."""
+        mock_connection = Mock()
+
+        assert list(iter_defined_enums(mock_connection, [])) == []
+        mock_connection.execute.assert_not_called()
+
+
+class TestGetMissingEnumValues:
+    def test_sends_declared_index_as_one_parameter(self):
+        """Test that the declared index is sent as a single JSON parameter."""
+        mock_connection = Mock()
+        mock_connection.execute.return_value = []
+
+        get_missing_enum_values(
+            mock_connection,
+            {
+                "public": {"user_status": ("active", "pending"), "empty": ()},
+                "tenant_1": {"priority": ("low",)},
+            },
+        )
+
+        sql, params = mock_connection.execute.call_args.args
+        assert "jsonb_to_recordset(CAST(:declared AS jsonb))" in str(sql)
+        assert "NOT EXISTS" in str(sql)
+        assert json.loads(params["declared"]) == [
+            {
+                "schema_name": "public",
+                "type_name": "user_status",
+                "labels": ["active", "pending"],
+            },
+            {"schema_name": "tenant_1", "type_name": "priority", "labels": ["low"]},
+        ]
+
+    def test_groups_missing_labels_per_type(self):
+        """Test that returned deltas are grouped with the type's last label."""
+        mock_connection = Mock()
+        mock_connection.execute.return_value = [
+            ("public", "user_status", "pending", "active"),
+            ("public", "user_status", "archived", "active"),
+            ("tenant_1", "priority", "low", None),
+        ]
+
+        result = get_missing_enum_values(
+            mock_connection,
+            {
+                "public": {"user_status": ("active", "pending", "archived")},
+                "tenant_1": {"priority": ("low",)},
+            },
+        )
+
+        assert result == {
+            ("public", "user_status"): (frozenset({"pending", "archived"}), "active"),
+            ("tenant_1", "priority"): (frozenset({"low"}), None),
+        }
+
+    def test_no_declared_enums(self):
+        """Test that no query is issued without declared labels."""
+        mock_connection = Mock()
+
+        assert get_missing_enum_values(mock_connection, {"public": {}}) == {}
+        mock_connection.execute.assert_not_called()
+
+
+class TestGetExistingEnumLabels:
+    def test_read_once_per_transaction(self):
+        """Test that the labels are cached in connection.info."""
+        mock_connection = Mock(info={})
+        mock_connection.execute.return_value = [
+            ("public", "user_status", "active"),
+            ("public", "user_status", "pending"),
+        ]
+
+        first = get_existing_enum_labels(mock_connection)
+        second = get_existing_enum_labels(mock_connection)
+
+        assert first == {("public", "user_status"): {"active", "pending"}}
+        assert second is first
+        mock_connection.execute.assert_called_once()
+
+    def test_record_updates_cached_labels(self):
+        """Test that added labels are recorded only once the labels were read."""
+        mock_connection = Mock(info={})
+        record_enum_labels(mock_connection, "public", "user_status", ["archived"])
+        assert mock_connection.info == {}
+
+        mock_connection.execute.return_value = [("public", "user_status", "active")]
+        get_existing_enum_labels(mock_connection)
+        record_enum_labels(mock_connection, "public", "priority", ["low"])
+
+        assert get_existing_enum_labels(mock_connection) == {
+            ("public", "user_status"): {"active"},
+            ("public", "priority"): {"low"},
+        }
+
+    def test_reread_in_new_transaction(self):
+        """Test that labels recorded in a rolled back transaction are dropped."""
+        mock_connection = Mock(info={})
+        mock_connection.execute.return_value = [("public", "user_status", "active")]
+        get_existing_enum_labels(mock_connection)
+        record_enum_labels(mock_connection, "public", "user_status", ["archived"])
+
+        # The migration failed and rolled back; a retry runs in a new transaction
+        mock_connection.get_transaction.return_value = Mock()
+        record_enum_labels(mock_connection, "public", "user_status", ["stale"])
+
+        assert get_existing_enum_labels(mock_connection) == {
+            ("public", "user_status"): {"active"}
+        }
+        assert mock_connection.execute.call_count == 2
+
+    def test_not_cached_outside_transaction(self):
+        """Test that labels are read every time without a transaction."""
+        mock_connection = Mock(info={})
+        mock_connection.get_transaction.return_value = None
+        mock_connection.execute.return_value = [("public", "user_status", "active")]
+
+        get_existing_enum_labels(mock_connection)
+        get_existing_enum_labels(mock_connection)
+
+        assert mock_connection.info == {}
+        assert mock_connection.execute.call_count == 2
+
+
+class TestGetDefinedEnumsParallel:
+    def _engine(self, rows_by_schema):
+        """Return an engine whose connections answer per-schema queries."""
+        engine = Mock()
+        checked_out = []
+
+        def connect():
+            connection = MagicMock()
+            connection.__enter__.return_value = connection
+            connection.execute.side_effect = lambda sql, params: rows_by_schema[
+                params["schema"]
+            ]
+            checked_out.append(connection)
+            return connection
+
+        engine.connect.side_effect = connect
+        return engine, checked_out
+
+    def test_get_defined_enums_parallel_merges_in_schema_order(self):
+        """Test that per-schema results are merged deterministically."""
+        engine, checked_out = self._engine(
+            {
+                "tenant_2": [("user_status", 16410, ["a"])],
+                "public": [("user_status", 16411, ["a", "b"])],
+                "empty": [],
+            }
+        )
+
+        result = get_defined_enums_parallel(
+            engine, ["tenant_2", "public", "empty"], max_workers=3
+        )
+
+        assert list(result) == ["tenant_2", "public"]
+        assert result == {
+            "tenant_2": {"user_status": ("a",)},
+            "public": {"user_status": ("a", "b")},
+        }
+        # Every schema runs on its own short-lived connection
+        assert len(checked_out) == 3
+        for connection in checked_out:
+            connection.__exit__.assert_called_once()
+
+    def test_get_defined_enums_parallel_with_filter(self):
+        """Test that include_name is applied to every schema."""
+        engine, _ = self._engine(
+            {
+                "public": [
+                    ("user_status", 16412, ["a"]),
+                    ("user_priority", 16413, ["low"]),
+                ]
+            }
+        )
+
+        result = get_defined_enums_parallel(
+            engine, ["public"], include_name=lambda name: name.endswith("_status")
+        )
+
+        assert result == {"public": {"user_status": ("a",)}}
+
+    def test_get_defined_enums_parallel_no_schemas(self):
+        """Test that no connection is opened without schemas."""
+        engine = Mock()
+
+        assert get_defined_enums_parallel(engine, []) == {}
+        engine.connect.assert_not_called()
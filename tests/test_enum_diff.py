@@ -0,0 +1,107 @@
+"""Tests for enum_diff module."""
+
+from alembic_pg_enum_generator.enum_diff import (
+    EnumValueAddition,
+    diff_enum_values,
+    place_missing_values,
+)
+
+
+class TestDiffEnumValues:
+    def test_no_changes(self):
+        """Test that identical label lists produce no additions."""
+        assert diff_enum_values(("a", "b"), ("a", "b")) == []
+
+    def test_append_at_end(self):
+        """Test that labels declared after the last defined label are appended."""
+        result = diff_enum_values(("a", "b", "c", "d"), ("a", "b"))
+
+        assert result == [EnumValueAddition("c"), EnumValueAddition("d")]
+
+    def test_insert_in_middle(self):
+        """Test that a label inserted mid-list is placed after its predecessor."""
+        result = diff_enum_values(("low", "medium", "high"), ("low", "high"))
+
+        assert result == [EnumValueAddition("medium", after="low")]
+
+    def test_insert_at_start(self):
+        """Test that a label declared first is placed before the first existing."""
+        result = diff_enum_values(("new", "a", "b"), ("a", "b"))
+
+        assert result == [EnumValueAddition("new", before="a")]
+
+    def test_consecutive_inserts_chain(self):
+        """Test that consecutive new labels are placed after each other."""
+        result = diff_enum_values(("x", "y", "a", "m", "n", "b"), ("a", "b"))
+
+        assert result == [
+            EnumValueAddition("x", before="a"),
+            EnumValueAddition("y", after="x"),
+            EnumValueAddition("m", after="a"),
+            EnumValueAddition("n", after="m"),
+        ]
+
+    def test_mixed_insert_and_append(self):
+        """Test the README example: one insert and one append."""
+        result = diff_enum_values(
+            ("low", "medium", "high", "critical"), ("low", "high")
+        )
+
+        assert result == [
+            EnumValueAddition("medium", after="low"),
+            EnumValueAddition("critical"),
+        ]
+
+    def test_removed_values_ignored(self):
+        """Test that labels only present in the database are ignored."""
+        result = diff_enum_values(("active", "pending"), ("active", "inactive"))
+
+        assert result == [EnumValueAddition("pending", after="active")]
+
+    def test_empty_defined_enum(self):
+        """Test that every label is appended to an empty enum."""
+        result = diff_enum_values(("a", "b"), ())
+
+        assert result == [EnumValueAddition("a"), EnumValueAddition("b")]
+
+    def test_duplicate_declared_values(self):
+        """Test that a label declared twice is only added once."""
+        result = diff_enum_values(("a", "b", "b"), ("a",))
+
+        assert result == [EnumValueAddition("b")]
+
+    def test_large_enum(self):
+        """Test a large enum where every other label is new."""
+        declared = tuple(f"label_{i}" for i in range(10000))
+        defined = declared[::2]
+
+        result = diff_enum_values(declared, defined)
+
+        assert len(result) == 5000
+        assert result[0] == EnumValueAddition("label_1", after="label_0")
+        assert result[-1] == EnumValueAddition("label_9999")
+
+
+class TestPlaceMissingValues:
+    def test_matches_full_diff(self):
+        """Test that placement from missing labels and tail equals the full diff."""
+        cases = [
+            (("a", "b", "c", "d"), ("a", "b")),
+            (("low", "medium", "high"), ("low", "high")),
+            (("new", "a", "b"), ("a", "b")),
+            (("a", "x", "y", "b", "z"), ("b", "a")),
+            (("a", "b"), ()),
+        ]
+        for declared, defined in cases:
+            missing = {value for value in declared if value not in defined}
+            tail = defined[-1] if defined else None
+
+            assert place_missing_values(declared, missing, tail) == diff_enum_values(
+                declared, defined
+            )
+
+    def test_enum_without_labels(self):
+        """Test that every label is appended to an empty enum."""
+        result = place_missing_values(("a", "b"), {"a", "b"}, None)
+
+        assert result == [EnumValueAddition("a"), EnumValueAddition("b")]
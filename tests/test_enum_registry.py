@@ -0,0 +1,198 @@
+"""Tests for enum_registry module."""
+
+import warnings
+from enum import Enum as PyEnum
+from unittest.mock import Mock, patch
+
+from sqlalchemy import ARRAY, Column, Enum, Integer, MetaData, Table
+
+from alembic_pg_enum_generator.compare_dispatch import compare_enums_for_additions
+from alembic_pg_enum_generator.config import Config
+from alembic_pg_enum_generator.declared_enums import get_declared_enums_by_schema
+from alembic_pg_enum_generator.enum_registry import DeclaredEnumRegistry
+
+
+class UserStatus(PyEnum):
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+
+
+class TestDeclaredEnumRegistry:
+    def test_tracks_existing_tables(self):
+        """Test that tables defined before tracking are indexed."""
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("status", Enum(UserStatus, name="user_status")),
+        )
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            assert registry.get("user_status") == ("active", "inactive")
+            assert len(registry) == 1
+
+    def test_tracks_tables_added_later(self):
+        """Test that tables attached after tracking are indexed from events."""
+        metadata = MetaData()
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            Table(
+                "users",
+                metadata,
+                Column("status", Enum(UserStatus, name="user_status")),
+                Column(
+                    "tags", ARRAY(Enum("a", "b", name="user_tag", schema="tagging"))
+                ),
+            )
+
+            assert registry.get("user_status") == ("active", "inactive")
+            assert registry.get("user_tag", schema="tagging") == ("a", "b")
+
+    def test_tracks_appended_columns(self):
+        """Test that columns appended to a tracked table are indexed."""
+        metadata = MetaData()
+        table = Table("users", metadata, Column("id", Integer, primary_key=True))
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            assert len(registry) == 0
+
+            table.append_column(Column("status", Enum("x", "y", name="user_status")))
+
+            assert (None, "user_status") in registry
+
+    def test_ignores_untracked_metadata(self):
+        """Test that tables of other MetaData objects are not indexed."""
+        tracked = MetaData()
+        other = MetaData()
+
+        with DeclaredEnumRegistry(tracked) as registry:
+            Table("users", other, Column("status", Enum("x", name="user_status")))
+
+            assert registry.get("user_status") is None
+
+    def test_ignores_non_native_enums(self):
+        """Test that non-native enums are not indexed."""
+        metadata = MetaData()
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            Table(
+                "users",
+                metadata,
+                Column("status", Enum("x", name="user_status", native_enum=False)),
+            )
+
+            assert len(registry) == 0
+
+    def test_close_stops_listening(self):
+        """Test that a closed registry no longer receives events."""
+        metadata = MetaData()
+        registry = DeclaredEnumRegistry(metadata)
+        registry.close()
+
+        Table("users", metadata, Column("status", Enum("x", name="user_status")))
+
+        assert registry.get("user_status") is None
+
+    def test_refresh_rebuilds_index(self):
+        """Test that refresh drops enums of removed tables."""
+        metadata = MetaData()
+        table = Table("users", metadata, Column("status", Enum("x", name="status")))
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            metadata.remove(table)
+            registry.refresh()
+
+            assert len(registry) == 0
+
+    def test_by_schema(self):
+        """Test the schema-partitioned view with default schema and filter."""
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("status", Enum(UserStatus, name="user_status")),
+            Column("priority", Enum("low", name="user_priority")),
+            Column("region", Enum("eu", name="region_status", schema="geo")),
+        )
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            result = registry.by_schema(
+                default_schema="public",
+                include_name=lambda name: name.endswith("_status"),
+            )
+
+        assert result == {
+            "public": {"user_status": ("active", "inactive")},
+            "geo": {"region_status": ("eu",)},
+        }
+
+    def test_by_schema_matches_metadata_walk_for_metadata_schema(self):
+        """Test that enums taking the metadata schema are not indexed as default."""
+        metadata = MetaData(schema="tenant")
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            Table("users", metadata, Column("status", Enum("a", "b", name="st")))
+
+            result = registry.by_schema(default_schema="public")
+
+        assert result == {"tenant": {"st": ("a", "b")}}
+        assert result == get_declared_enums_by_schema(metadata, "public")
+
+    def test_by_schema_matches_metadata_walk_for_inherited_schema(self):
+        """Test that enums inheriting the table schema are not indexed as default."""
+        metadata = MetaData()
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            with warnings.catch_warnings():
+                # inherit_schema is deprecated on SQLAlchemy 2.1
+                warnings.simplefilter("ignore")
+                status = Enum("a", "b", name="st", inherit_schema=True)
+            Table("users", metadata, Column("status", status), schema="tenant")
+
+            result = registry.by_schema(default_schema="public")
+
+        assert result == {"tenant": {"st": ("a", "b")}}
+        assert result == get_declared_enums_by_schema(metadata, "public")
+        assert (None, "st") not in registry
+
+    def test_lookups_reuse_index_until_attach(self):
+        """Test that lookups only rebuild the index after tables attach."""
+        metadata = MetaData()
+        Table("users", metadata, Column("status", Enum("a", name="user_status")))
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            index = registry._index()
+            assert registry.get("user_status") == ("a",)
+            assert registry._index() is index
+
+            Table("orders", metadata, Column("state", Enum("x", name="state")))
+
+            assert registry.get("state") == ("x",)
+            assert registry._index() is not index
+
+
+class TestCompareWithRegistry:
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_configuration")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_declared_enums_by_schema")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_registry_replaces_metadata_walk(
+        self, mock_get_defined, mock_get_declared, mock_get_config
+    ):
+        """Test that a configured registry is used instead of walking metadata."""
+        metadata = MetaData()
+        Table("users", metadata, Column("status", Enum("a", "b", name="status")))
+
+        with DeclaredEnumRegistry(metadata) as registry:
+            mock_get_config.return_value = Config(declared_enum_registry=registry)
+            mock_get_defined.return_value = {"public": {"status": ("a",)}}
+
+            autogen_context = Mock(metadata=metadata)
+            autogen_context.connection.dialect.name = "postgresql"
+            autogen_context.connection.dialect.default_schema_name = "public"
+            upgrade_ops = Mock(ops=[])
+
+            compare_enums_for_additions(autogen_context, upgrade_ops, [None])
+
+        mock_get_declared.assert_not_called()
+        assert [op.value for op in upgrade_ops.ops] == ["b"]
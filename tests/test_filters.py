@@ -0,0 +1,171 @@
+"""Tests for filters module."""
+
+from unittest.mock import Mock, patch
+
+from sqlalchemy import Column, Enum, MetaData, Table
+
+from alembic_pg_enum_generator.cache import CatalogSnapshotCache
+from alembic_pg_enum_generator.compare_dispatch import compare_enums_for_additions
+from alembic_pg_enum_generator.config import Config
+from alembic_pg_enum_generator.defined_enums import (
+    get_all_enums,
+    get_defined_enums_by_schema,
+)
+from alembic_pg_enum_generator.filters import EnumFilter
+
+
+class TestEnumFilter:
+    def test_glob_include_and_exclude(self):
+        """Test glob patterns matched against the whole name."""
+        enum_filter = EnumFilter(include=["*_status"], exclude=["legacy_*"])
+
+        assert enum_filter.include_name("user_status") is True
+        assert enum_filter.include_name("legacy_status") is False
+        assert enum_filter.include_name("user_status_old") is False
+        assert enum_filter.include_name("priority") is False
+
+    def test_empty_include_matches_everything(self):
+        """Test that only excludes apply without include patterns."""
+        enum_filter = EnumFilter(exclude=["tmp_*"])
+
+        assert enum_filter.include_name("priority") is True
+        assert enum_filter.include_name("tmp_kind") is False
+
+    def test_regex_patterns(self):
+        """Test regular expression patterns."""
+        enum_filter = EnumFilter(include=[r"(user|order)_status"], regex=True)
+
+        assert enum_filter.include_name("order_status") is True
+        assert enum_filter.include_name("team_status") is False
+
+    def test_schema_patterns(self):
+        """Test schema include/exclude lists."""
+        enum_filter = EnumFilter(
+            include_schemas=["tenant_*"], exclude_schemas=["*_old"]
+        )
+
+        assert enum_filter.include_schema("tenant_1") is True
+        assert enum_filter.include_schema("tenant_1_old") is False
+        assert enum_filter.include_schema("public") is False
+
+    def test_results_memoized(self):
+        """Test that each name is matched once."""
+        enum_filter = EnumFilter(include=["*_status"])
+        enum_filter.include_name("user_status")
+
+        with patch.object(EnumFilter, "_matches") as mock_matches:
+            assert enum_filter.include_name("user_status") is True
+
+        mock_matches.assert_not_called()
+
+    def test_equal_filters_compare_equal(self):
+        """Test that pattern lists are normalized to tuples."""
+        assert EnumFilter(include=["a*"]) == EnumFilter(include=("a*",))
+
+    def test_like_patterns(self):
+        """Test translation of globs to LIKE patterns with escaping."""
+        enum_filter = EnumFilter(include=["*_status", "x?"], exclude=["a%b*"])
+
+        assert enum_filter.like_patterns() == (
+            ["%\\_status", "x_"],
+            ["a\\%b%"],
+        )
+
+    def test_like_patterns_not_pushed_down(self):
+        """Test patterns without an exact LIKE equivalent stay in Python."""
+        assert EnumFilter(include=["*_status", "[ab]*"]).like_patterns() == (
+            None,
+            [],
+        )
+        assert EnumFilter(exclude=["[ab]*", "tmp_*"]).like_patterns() == (
+            None,
+            ["tmp\\_%"],
+        )
+        assert EnumFilter(include=["x.*"], regex=True).like_patterns() == (None, [])
+
+
+class TestFilterPushdown:
+    def test_get_all_enums_adds_where_clause(self):
+        """Test that glob patterns end up in the catalog query."""
+        connection = Mock()
+
+        get_all_enums(
+            connection, "public", EnumFilter(include=["*_status"], exclude=["old_*"])
+        )
+
+        sql, params = connection.execute.call_args.args
+        assert "t.typname LIKE ANY(:include_patterns)" in str(sql)
+        assert "t.typname NOT LIKE ALL(:exclude_patterns)" in str(sql)
+        assert params == {
+            "schema": "public",
+            "include_patterns": ["%\\_status"],
+            "exclude_patterns": ["old\\_%"],
+        }
+
+    def test_get_defined_enums_by_schema_filters_rows(self):
+        """Test that rows are still matched in Python after the pushdown."""
+        connection = Mock()
+        connection.execute.return_value = [
+            ("public", "user_status", 16385, ["a"]),
+            ("public", "priority", 16390, ["low"]),
+        ]
+
+        result = get_defined_enums_by_schema(
+            connection,
+            ["public"],
+            include_name=lambda name: name != "order_status",
+            enum_filter=EnumFilter(include=["[u]*_status"]),
+        )
+
+        assert result == {"public": {"user_status": ("a",)}}
+        assert connection.execute.call_args.args[1] == {"schemas": ["public"]}
+
+    def test_conditions_precede_group_by(self):
+        """Test that pushed-down conditions land in the WHERE clause."""
+        connection = Mock()
+
+        get_all_enums(connection, "public", EnumFilter(include=["*_status"]))
+
+        sql = str(connection.execute.call_args.args[0])
+        assert sql.index("LIKE ANY(:include_patterns)") < sql.index("GROUP BY")
+
+    def test_snapshot_key_depends_on_filter(self):
+        """Test that filtered catalog snapshots are not shared across filters."""
+        snapshots = CatalogSnapshotCache()
+
+        assert snapshots.make_key(["public"], "1:2:abc") != snapshots.make_key(
+            ["public"], "1:2:abc", EnumFilter(include=["*_status"])
+        )
+
+
+class TestFilteredComparison:
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_compare_applies_filter(self, mock_get_defined):
+        """Test that schema and enum filters apply to both sides."""
+        mock_get_defined.return_value = {
+            "public": {"user_status": ("active",), "priority": ("low",)}
+        }
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("status", Enum("active", "pending", name="user_status")),
+            Column("priority", Enum("low", "high", name="priority")),
+        )
+        autogen_context = Mock(metadata=metadata)
+        autogen_context.connection.dialect.name = "postgresql"
+        autogen_context.connection.dialect.default_schema_name = "public"
+        upgrade_ops = Mock(ops=[])
+        enum_filter = EnumFilter(include=["*_status"], exclude_schemas=["archive"])
+
+        with patch(
+            "alembic_pg_enum_generator.compare_dispatch.get_configuration",
+            return_value=Config(enum_filter=enum_filter),
+        ):
+            compare_enums_for_additions(
+                autogen_context, upgrade_ops, ["public", "archive"]
+            )
+
+        assert mock_get_defined.call_args.kwargs["schemas"] == ["public"]
+        assert mock_get_defined.call_args.kwargs["enum_filter"] is enum_filter
+        assert [op.value for op in upgrade_ops.ops] == ["pending"]
@@ -0,0 +1,149 @@
+"""Tests for instrumentation module."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import Column, Enum, Integer, MetaData, Table
+
+from alembic_pg_enum_generator.compare_dispatch import compare_enums_for_additions
+from alembic_pg_enum_generator.config import Config
+from alembic_pg_enum_generator.declared_enums import get_declared_enums_by_schema
+from alembic_pg_enum_generator.defined_enums import get_defined_enums_by_schema
+from alembic_pg_enum_generator.instrumentation import (
+    Instrumentation,
+    RecordingInstrumentation,
+    span,
+)
+
+
+class TestRecordingInstrumentation:
+    def test_span_records_duration(self):
+        """Test that spans accumulate per phase."""
+        instrumentation = RecordingInstrumentation()
+
+        with instrumentation.span("diff"):
+            pass
+        with instrumentation.span("diff"):
+            pass
+
+        assert list(instrumentation.timings) == ["diff"]
+        assert instrumentation.timings["diff"] >= 0.0
+
+    def test_span_records_on_error(self):
+        """Test that a failing phase is still reported."""
+        instrumentation = RecordingInstrumentation()
+
+        with pytest.raises(RuntimeError):
+            with instrumentation.span("catalog_query"):
+                raise RuntimeError("boom")
+
+        assert "catalog_query" in instrumentation.timings
+
+    def test_count_accumulates(self):
+        """Test that counters are summed."""
+        instrumentation = RecordingInstrumentation()
+
+        instrumentation.count("rows_fetched", 2)
+        instrumentation.count("rows_fetched", 3)
+
+        assert instrumentation.counters == {"rows_fetched": 5}
+
+    def test_base_class_is_noop(self):
+        """Test that the base class can be used without overriding anything."""
+        instrumentation = Instrumentation()
+
+        with instrumentation.span("diff"):
+            instrumentation.count("ops_produced", 1)
+
+    def test_span_helper(self):
+        """Test that the helper delegates to instrumentation or does nothing."""
+        instrumentation = RecordingInstrumentation()
+
+        with span(None, "diff"):
+            pass
+        with span(instrumentation, "diff"):
+            pass
+
+        assert list(instrumentation.timings) == ["diff"]
+
+
+class TestInstrumentedFunctions:
+    def test_declared_walk_counters(self):
+        """Test that the metadata walk reports tables and enum columns."""
+        metadata = MetaData()
+        status = Enum("a", "b", name="status")
+        Table("one", metadata, Column("id", Integer), Column("status", status))
+        Table("two", metadata, Column("status", status))
+        instrumentation = RecordingInstrumentation()
+
+        get_declared_enums_by_schema(
+            metadata, default_schema="public", instrumentation=instrumentation
+        )
+
+        assert instrumentation.counters == {"tables_scanned": 2, "enum_columns": 2}
+        assert list(instrumentation.timings) == ["metadata_walk"]
+
+    def test_defined_query_and_decode_reported_apart(self):
+        """Test that catalog query and row decoding are separate phases."""
+        connection = Mock()
+        connection.execute.return_value = iter(
+            [("public", "status", 16385, ["a"]), ("tenant_1", "status", 16392, ["a"])]
+        )
+        instrumentation = RecordingInstrumentation()
+
+        result = get_defined_enums_by_schema(
+            connection, ["public", "tenant_1"], instrumentation=instrumentation
+        )
+
+        assert result == {"public": {"status": ("a",)}, "tenant_1": {"status": ("a",)}}
+        assert set(instrumentation.timings) == {"catalog_query", "decode"}
+        assert instrumentation.counters == {"schemas_queried": 2, "rows_fetched": 2}
+
+
+class TestInstrumentedComparison:
+    def teardown_method(self):
+        """Reset global configuration after each test."""
+        import alembic_pg_enum_generator.config
+
+        alembic_pg_enum_generator.config._configuration = None
+
+    def test_all_phases_and_counters(self):
+        """Test a full comparison run reports every phase and counter."""
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("id", Integer),
+            Column("status", Enum("active", "pending", name="user_status")),
+        )
+
+        autogen_context = Mock(metadata=metadata)
+        autogen_context.connection.dialect.name = "postgresql"
+        autogen_context.connection.dialect.default_schema_name = "public"
+        autogen_context.connection.execute.return_value = iter(
+            [("public", "user_status", 16385, ["active"])]
+        )
+        upgrade_ops = Mock(ops=[])
+        instrumentation = RecordingInstrumentation()
+
+        with patch(
+            "alembic_pg_enum_generator.compare_dispatch.get_configuration",
+            return_value=Config(instrumentation=instrumentation),
+        ):
+            compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        assert [op.value for op in upgrade_ops.ops] == ["pending"]
+        assert set(instrumentation.timings) == {
+            "metadata_walk",
+            "catalog_query",
+            "decode",
+            "diff",
+            "emit",
+        }
+        assert instrumentation.counters == {
+            "schemas_queried": 1,
+            "rows_fetched": 1,
+            "tables_scanned": 1,
+            "enum_columns": 1,
+            "ops_produced": 1,
+        }
@@ -49,7 +49,7 @@ class TestIntegration:
 
         alembic_pg_enum_generator.config._configuration = None
 
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_end_to_end_single_new_value(self, mock_get_defined):
         """Test complete flow from SQLAlchemy model to operation generation."""
         # Setup: Create SQLAlchemy metadata with enum
@@ -63,7 +63,9 @@ class TestIntegration:
         )
 
         # Mock: Database only has 'active', 'inactive'
-        mock_get_defined.return_value = {"user_status": ("active", "inactive")}
+        mock_get_defined.return_value = {
+            "public": {"user_status": ("active", "inactive")}
+        }
 
         # Execute: Run the comparison
         autogen_context = MockAutogenContext(metadata, {})
@@ -79,7 +81,7 @@ class TestIntegration:
         assert op.enum_name == "user_status"
         assert op.value == "pending"
 
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_end_to_end_multiple_enums(self, mock_get_defined):
         """Test complete flow with multiple enums and new values."""
         # Setup: Create SQLAlchemy metadata with multiple enums
@@ -103,8 +105,13 @@ class TestIntegration:
 
         # Mock: Database has partial values for both enums
         mock_get_defined.return_value = {
-            "user_status": ("active", "inactive"),  # Missing 'pending'
-            "order_status": ("draft", "submitted"),  # Missing 'processing', 'shipped'
+            "public": {
+                "user_status": ("active", "inactive"),  # Missing 'pending'
+                "order_status": (
+                    "draft",
+                    "submitted",
+                ),  # Missing 'processing', 'shipped'
+            }
         }
 
         # Execute: Run the comparison
@@ -129,7 +136,7 @@ class TestIntegration:
         assert "order_status" in ops_by_enum
         assert set(ops_by_enum["order_status"]) == {"processing", "shipped"}
 
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_end_to_end_with_filter(self, mock_get_defined):
         """Test complete flow with include_name filter."""
 
@@ -156,8 +163,10 @@ class TestIntegration:
 
         # Mock: Database has partial values
         mock_get_defined.return_value = {
-            "user_status": ("active", "inactive"),
-            "user_priority": ("draft", "submitted"),
+            "public": {
+                "user_status": ("active", "inactive"),
+                "user_priority": ("draft", "submitted"),
+            }
         }
 
         # Execute: Run the comparison
@@ -172,7 +181,7 @@ class TestIntegration:
         assert op.enum_name == "user_status"
         assert op.value == "pending"
 
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_end_to_end_no_operations_needed(self, mock_get_defined):
         """Test complete flow when no new values are needed."""
         # Setup: Create SQLAlchemy metadata
@@ -187,7 +196,9 @@ class TestIntegration:
 
         # Mock: Database already has all values
         mock_get_defined.return_value = {
-            "user_status": ("active", "inactive", "pending")  # All values present
+            "public": {
+                "user_status": ("active", "inactive", "pending")  # All values present
+            }
         }
 
         # Execute: Run the comparison
@@ -199,7 +210,7 @@ class TestIntegration:
         # Verify: No operations should be generated
         assert len(upgrade_ops.ops) == 0
 
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_end_to_end_new_enum_ignored(self, mock_get_defined):
         """Test that completely new enums are ignored (let Alembic handle)."""
         # Setup: Create SQLAlchemy metadata with enum
@@ -213,7 +224,7 @@ class TestIntegration:
         )
 
         # Mock: Database doesn't have the enum at all
-        mock_get_defined.return_value = {}  # Enum doesn't exist in DB
+        mock_get_defined.return_value = {"public": {}}  # Enum doesn't exist in DB
 
         # Execute: Run the comparison
         autogen_context = MockAutogenContext(metadata, {})
@@ -226,7 +237,7 @@ class TestIntegration:
 
     def test_operation_sql_generation(self):
         """Test that generated operations produce correct SQL."""
-        mock_connection = Mock()
+        mock_connection = Mock(info={})
 
         # Test with schema
         op = AddEnumValueOp("public", "user_status", "pending")
@@ -251,7 +262,7 @@ class TestIntegration:
         expected = "op.execute(\"ALTER TYPE public.user_status ADD VALUE 'pending'\")"
         assert rendered == expected
 
-    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums")
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
     def test_schema_none_handling(self, mock_get_defined):
         """Test handling of None schema in integration."""
         # Setup: Create SQLAlchemy metadata
@@ -265,7 +276,9 @@ class TestIntegration:
         )
 
         # Mock: Database has partial values
-        mock_get_defined.return_value = {"user_status": ("active", "inactive")}
+        mock_get_defined.return_value = {
+            "public": {"user_status": ("active", "inactive")}
+        }
 
         # Execute: Run with None schema (should use default)
         autogen_context = MockAutogenContext(metadata, {})
@@ -0,0 +1,191 @@
+"""Tests for lock_retry module."""
+
+import warnings
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+import sqlalchemy.exc
+
+from alembic_pg_enum_generator.add_enum_value_op import (
+    AddEnumValueOp,
+    render_add_enum_value_op,
+)
+from alembic_pg_enum_generator.config import Config
+from alembic_pg_enum_generator.lock_retry import (
+    LockRetryPolicy,
+    execute_with_lock_retry,
+)
+
+STATEMENT = "ALTER TYPE public.user_status ADD VALUE 'pending'"
+
+
+def _db_error(pgcode):
+    orig = Exception("error")
+    orig.pgcode = pgcode
+    return sqlalchemy.exc.OperationalError(STATEMENT, {}, orig)
+
+
+def _connection(alter_errors=(), isolation_level=None, holds_locks=False):
+    """Return a connection failing the ALTER TYPE with ``alter_errors`` in turn."""
+    connection = MagicMock()
+    connection.info = {}
+    connection.get_execution_options.return_value = (
+        {"isolation_level": isolation_level} if isolation_level else {}
+    )
+    errors = list(alter_errors)
+
+    def execute(statement, params=None):
+        sql = str(statement)
+        if sql.startswith("ALTER TYPE") and errors:
+            raise errors.pop(0)
+        result = Mock()
+        result.one.return_value = ("0", holds_locks)
+        return result
+
+    connection.execute.side_effect = execute
+    return connection
+
+
+def _executed(connection):
+    return [
+        (str(c.args[0]), c.args[1] if len(c.args) > 1 else None)
+        for c in connection.execute.call_args_list
+    ]
+
+
+class TestLockRetryPolicy:
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that delays stay within the exponential ceiling."""
+        policy = LockRetryPolicy(initial_backoff=0.1, max_backoff=0.3)
+
+        with patch("random.uniform", side_effect=lambda low, high: high):
+            assert [policy.backoff(attempt) for attempt in (1, 2, 3)] == [
+                0.1,
+                0.2,
+                0.3,
+            ]
+
+
+class TestExecuteWithLockRetry:
+    def test_savepoint_and_local_setting_in_transaction(self):
+        """Test that the timeout is set locally inside a savepoint and restored."""
+        connection = _connection()
+        reports = []
+
+        execute_with_lock_retry(
+            connection,
+            STATEMENT,
+            LockRetryPolicy(lock_timeout=0.5, on_report=reports.append),
+        )
+
+        connection.begin_nested.assert_called_once()
+        assert _executed(connection)[1:] == [
+            (
+                "SELECT set_config('lock_timeout', :value, :is_local)",
+                {"value": "500ms", "is_local": True},
+            ),
+            (STATEMENT, None),
+            (
+                "SELECT set_config('lock_timeout', :value, :is_local)",
+                {"value": "0", "is_local": True},
+            ),
+        ]
+        (report,) = reports
+        assert report.attempts == 1
+        assert report.succeeded is True
+
+    @patch("alembic_pg_enum_generator.lock_retry.time.sleep")
+    def test_retries_lock_timeouts(self, mock_sleep):
+        """Test that lock timeouts are retried after a backoff."""
+        connection = _connection([_db_error("55P03"), _db_error("55P03")])
+        reports = []
+
+        execute_with_lock_retry(
+            connection, STATEMENT, LockRetryPolicy(on_report=reports.append)
+        )
+
+        assert mock_sleep.call_count == 2
+        assert connection.begin_nested.call_count == 3
+        assert reports[0].attempts == 3
+        assert reports[0].succeeded is True
+
+    @patch("alembic_pg_enum_generator.lock_retry.time.sleep")
+    def test_gives_up_at_deadline(self, mock_sleep):
+        """Test that the lock timeout is raised once the deadline has passed."""
+        connection = _connection([_db_error("55P03")])
+        reports = []
+
+        with pytest.raises(sqlalchemy.exc.OperationalError):
+            execute_with_lock_retry(
+                connection,
+                STATEMENT,
+                LockRetryPolicy(deadline=0, on_report=reports.append),
+            )
+
+        mock_sleep.assert_not_called()
+        assert reports[0].attempts == 1
+        assert reports[0].succeeded is False
+
+    def test_other_errors_not_retried(self):
+        """Test that errors other than lock timeouts are raised immediately."""
+        connection = _connection([_db_error("42704")])
+
+        with pytest.raises(sqlalchemy.exc.OperationalError):
+            execute_with_lock_retry(connection, STATEMENT, LockRetryPolicy())
+
+        assert connection.begin_nested.call_count == 1
+
+    def test_autocommit_resets_session_setting(self):
+        """Test that the session setting is reset even when the attempt fails."""
+        connection = _connection([_db_error("42704")], isolation_level="AUTOCOMMIT")
+
+        with pytest.raises(sqlalchemy.exc.OperationalError):
+            execute_with_lock_retry(connection, STATEMENT, LockRetryPolicy())
+
+        connection.begin_nested.assert_not_called()
+        assert _executed(connection)[-1] == (
+            "SELECT set_config('lock_timeout', :value, :is_local)",
+            {"value": "0", "is_local": False},
+        )
+
+    def test_warns_when_transaction_holds_locks(self):
+        """Test that retrying in a transaction that already wrote warns."""
+        connection = _connection(holds_locks=True)
+
+        with pytest.warns(UserWarning, match="already holds locks"):
+            execute_with_lock_retry(connection, STATEMENT, LockRetryPolicy())
+
+    def test_no_warning_in_autocommit(self):
+        """Test that autocommit runs never warn about held locks."""
+        connection = _connection(holds_locks=True, isolation_level="AUTOCOMMIT")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            execute_with_lock_retry(connection, STATEMENT, LockRetryPolicy())
+
+
+class TestConfiguredLockRetry:
+    def test_op_execute_uses_configured_policy(self):
+        """Test that enum value ops apply the configured policy."""
+        connection = _connection()
+        reports = []
+
+        with patch(
+            "alembic_pg_enum_generator.lock_retry.get_configuration",
+            return_value=Config(lock_retry=LockRetryPolicy(on_report=reports.append)),
+        ):
+            AddEnumValueOp("public", "user_status", "pending").execute(connection)
+
+        assert [report.statement for report in reports] == [STATEMENT]
+
+    def test_render_as_operation_call(self):
+        """Test that ops render as calls so the policy applies at migration time."""
+        op = AddEnumValueOp("public", "user_status", "pending")
+
+        with patch(
+            "alembic_pg_enum_generator.add_enum_value_op.get_configuration",
+            return_value=Config(lock_retry=LockRetryPolicy()),
+        ):
+            rendered = render_add_enum_value_op(Mock(), op)
+
+        assert rendered == "op.add_enum_value('public', 'user_status', 'pending')"
@@ -0,0 +1,165 @@
+"""Tests for parallel_apply module."""
+
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
+from alembic_pg_enum_generator.add_enum_values_block_op import AddEnumValuesBlockOp
+from alembic_pg_enum_generator.add_enum_values_op import AddEnumValuesOp
+from alembic_pg_enum_generator.parallel_apply import (
+    EnumValuesApplyError,
+    apply_enum_value_ops_parallel,
+    group_ops_by_type,
+)
+
+
+def _engine(server_version_num="150004", failing_type=None):
+    """Return an engine whose connections record their executed statements."""
+    engine = Mock()
+    engine.connections = []
+
+    def connect():
+        connection = MagicMock()
+        connection.info = {}
+        connection.execution_options.return_value = connection
+        connection.statements = []
+
+        def execute(statement, params=None):
+            sql = str(statement)
+            connection.statements.append(sql)
+            if failing_type and failing_type in sql:
+                raise RuntimeError(f"cannot alter {failing_type}")
+            result = Mock()
+            result.scalar_one.return_value = server_version_num
+            return result
+
+        connection.execute.side_effect = execute
+        connection.__enter__.return_value = connection
+        engine.connections.append(connection)
+        return connection
+
+    engine.connect.side_effect = connect
+    return engine
+
+
+def _ddl(engine):
+    return sorted(
+        statement
+        for connection in engine.connections
+        for statement in connection.statements
+        if "current_setting" not in statement
+    )
+
+
+class TestGroupOpsByType:
+    def test_canonical_order_and_flattening(self):
+        """Test grouping per type in (schema, name) order, keeping value order."""
+        ops = [
+            AddEnumValueOp("tenant", "priority", "high"),
+            AddEnumValuesBlockOp(
+                [
+                    AddEnumValuesOp("public", "user_status", ["b", "a"]),
+                    AddEnumValueOp("tenant", "priority", "low", before="high"),
+                ]
+            ),
+        ]
+
+        groups = group_ops_by_type(ops)
+
+        assert list(groups) == [("public", "user_status"), ("tenant", "priority")]
+        assert groups["tenant", "priority"].values == ["high", "low"]
+        assert groups["tenant", "priority"].before == {"low": "high"}
+
+    def test_rejects_other_operations(self):
+        """Test that only enum value operations are accepted."""
+        with pytest.raises(TypeError):
+            group_ops_by_type([Mock()])
+
+    def test_rejects_mixed_flags_per_type(self):
+        """Test that one type's values must agree on skip_existing."""
+        ops = [
+            AddEnumValueOp("public", "priority", "high", skip_existing=True),
+            AddEnumValuesOp("public", "priority", ["critical"]),
+        ]
+
+        with pytest.raises(ValueError, match="skip_existing"):
+            group_ops_by_type(ops)
+
+    def test_keeps_matching_flags(self):
+        """Test that flags shared by all values of a type are kept."""
+        ops = [
+            AddEnumValueOp("public", "priority", "high", if_not_exists=True),
+            AddEnumValuesOp("public", "priority", ["critical"], if_not_exists=True),
+        ]
+
+        (op,) = group_ops_by_type(ops).values()
+
+        assert op.if_not_exists
+        assert not op.skip_existing
+
+
+class TestApplyEnumValueOpsParallel:
+    def test_one_transaction_per_type(self):
+        """Test that each type is altered in its own transaction from PG 12."""
+        engine = _engine()
+
+        applied = apply_enum_value_ops_parallel(
+            engine,
+            [
+                AddEnumValueOp("public", "priority", "high"),
+                AddEnumValueOp("public", "priority", "critical"),
+                AddEnumValueOp("public", "user_status", "pending"),
+            ],
+            max_workers=2,
+        )
+
+        assert applied == [("public", "priority"), ("public", "user_status")]
+        assert len(engine.connections) == 2
+        for connection in engine.connections:
+            connection.begin.assert_called_once()
+            connection.execution_options.assert_not_called()
+        assert _ddl(engine) == [
+            "ALTER TYPE public.user_status ADD VALUE 'pending'",
+            "DO $add_enum_values$ BEGIN"
+            " ALTER TYPE public.priority ADD VALUE 'high';"
+            " ALTER TYPE public.priority ADD VALUE 'critical';"
+            " END $add_enum_values$",
+        ]
+
+    def test_autocommit_before_pg12(self):
+        """Test that older servers get autocommit connections."""
+        engine = _engine(server_version_num="110012")
+
+        apply_enum_value_ops_parallel(
+            engine, [AddEnumValueOp("public", "user_status", "pending")]
+        )
+
+        (connection,) = engine.connections
+        connection.execution_options.assert_called_once_with(
+            isolation_level="AUTOCOMMIT"
+        )
+
+    def test_errors_aggregated_per_type(self):
+        """Test that one failing type does not stop the others."""
+        engine = _engine(failing_type="public.priority")
+
+        with pytest.raises(EnumValuesApplyError) as excinfo:
+            apply_enum_value_ops_parallel(
+                engine,
+                [
+                    AddEnumValueOp("public", "priority", "high"),
+                    AddEnumValueOp("public", "user_status", "pending"),
+                ],
+            )
+
+        assert list(excinfo.value.errors) == [("public", "priority")]
+        assert excinfo.value.applied == [("public", "user_status")]
+        assert "public.priority: cannot alter public.priority" in str(excinfo.value)
+
+    def test_no_ops(self):
+        """Test that no connection is opened without operations."""
+        engine = _engine()
+
+        assert apply_enum_value_ops_parallel(engine, []) == []
+        engine.connect.assert_not_called()
@@ -0,0 +1,147 @@
+"""Tests for preflight module."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
+from alembic_pg_enum_generator.add_enum_values_op import AddEnumValuesOp
+from alembic_pg_enum_generator.config import Config
+from alembic_pg_enum_generator.preflight import (
+    EnumLockBlockedError,
+    PreflightPolicy,
+    find_enum_lock_blockers,
+    preflight_batch,
+    wait_for_quiet_enum_types,
+)
+
+BLOCKER_ROW = (
+    4242,
+    "public",
+    "user_status",
+    "ExclusiveLock",
+    True,
+    "idle in transaction",
+    95.25,
+    "ALTER TYPE public.user_status ADD VALUE 'x'",
+)
+
+
+class TestFindEnumLockBlockers:
+    def test_single_query_for_all_types(self):
+        """Test that every type of a batch is checked in one query."""
+        connection = Mock()
+        connection.execute.return_value = [BLOCKER_ROW]
+
+        blockers = find_enum_lock_blockers(
+            connection,
+            [
+                ("public", "user_status"),
+                ("tenant", "priority"),
+                ("public", "user_status"),
+            ],
+        )
+
+        connection.execute.assert_called_once()
+        sql, params = connection.execute.call_args.args
+        assert "pg_catalog.pg_locks" in str(sql)
+        assert "pg_catalog.pg_stat_activity" in str(sql)
+        assert params == {
+            "schemas": ["public", "tenant"],
+            "names": ["user_status", "priority"],
+        }
+        (blocker,) = blockers
+        assert blocker.pid == 4242
+        assert blocker.transaction_age == 95.25
+
+    def test_no_types(self):
+        """Test that no query is issued without types."""
+        connection = Mock()
+
+        assert find_enum_lock_blockers(connection, []) == []
+        connection.execute.assert_not_called()
+
+
+class TestWaitForQuietEnumTypes:
+    def test_abort_reports_blocking_pids(self):
+        """Test that the error names the blocking PIDs and transaction ages."""
+        connection = Mock()
+        connection.execute.return_value = [BLOCKER_ROW]
+
+        with pytest.raises(EnumLockBlockedError) as excinfo:
+            wait_for_quiet_enum_types(
+                connection, [("public", "user_status")], PreflightPolicy()
+            )
+
+        assert excinfo.value.blockers[0].pid == 4242
+        assert "pid 4242 holds ExclusiveLock on public.user_status" in str(
+            excinfo.value
+        )
+        assert "transaction age 95.2s" in str(excinfo.value)
+
+    @patch("alembic_pg_enum_generator.preflight.time.sleep")
+    def test_waits_for_quiet_window(self, mock_sleep):
+        """Test that the check is repeated until no session locks the types."""
+        connection = Mock()
+        connection.execute.side_effect = [[BLOCKER_ROW], [BLOCKER_ROW], []]
+
+        wait_for_quiet_enum_types(
+            connection,
+            [("public", "user_status")],
+            PreflightPolicy(wait=60, poll_interval=0.5),
+        )
+
+        assert connection.execute.call_count == 3
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 0.5]
+
+
+class TestConfiguredPreflight:
+    def test_op_execute_checks_before_altering(self):
+        """Test that grouped ops run one pre-flight query before their DDL."""
+        connection = Mock(info={})
+        connection.execute.side_effect = [[BLOCKER_ROW], None]
+        op = AddEnumValuesOp("public", "user_status", ["a", "b"])
+
+        with patch(
+            "alembic_pg_enum_generator.preflight.get_configuration",
+            return_value=Config(preflight=PreflightPolicy()),
+        ):
+            with pytest.raises(EnumLockBlockedError):
+                op.execute(connection)
+
+        connection.execute.assert_called_once()
+
+    def test_batch_checks_once_for_all_ops(self):
+        """Test that ops inside a batch skip their own pre-flight query."""
+        connection = Mock(info={})
+        connection.execute.return_value = []
+        enum_types = [("public", "user_status"), ("public", "priority")]
+
+        with patch(
+            "alembic_pg_enum_generator.preflight.get_configuration",
+            return_value=Config(preflight=PreflightPolicy()),
+        ):
+            with preflight_batch(connection, enum_types):
+                AddEnumValueOp("public", "user_status", "a").execute(connection)
+                AddEnumValueOp("public", "user_status", "b").execute(connection)
+                AddEnumValueOp("public", "priority", "high").execute(connection)
+
+        statements = [str(c.args[0]) for c in connection.execute.call_args_list]
+        assert sum("pg_locks" in statement for statement in statements) == 1
+        assert len(statements) == 4
+        assert connection.info == {}
+
+    def test_batch_still_checks_other_types(self):
+        """Test that types outside the batch are checked by their op."""
+        connection = Mock(info={})
+        connection.execute.return_value = []
+
+        with patch(
+            "alembic_pg_enum_generator.preflight.get_configuration",
+            return_value=Config(preflight=PreflightPolicy()),
+        ):
+            with preflight_batch(connection, [("public", "user_status")]):
+                AddEnumValueOp("public", "priority", "high").execute(connection)
+
+        statements = [str(c.args[0]) for c in connection.execute.call_args_list]
+        assert sum("pg_locks" in statement for statement in statements) == 2
@@ -0,0 +1,106 @@
+"""Tests for revision module."""
+
+import sqlalchemy as sa
+from alembic.operations import ops
+
+from alembic_pg_enum_generator.add_enum_value_op import AddEnumValueOp
+from alembic_pg_enum_generator.add_enum_values_block_op import AddEnumValuesBlockOp
+from alembic_pg_enum_generator.revision import split_enum_additions
+
+
+def _script(upgrade, downgrade, message="add users"):
+    return ops.MigrationScript(
+        rev_id="bbbbbbbbbbbb",
+        upgrade_ops=ops.UpgradeOps(ops=upgrade),
+        downgrade_ops=ops.DowngradeOps(ops=downgrade),
+        message=message,
+        head="aaaaaaaaaaaa",
+    )
+
+
+def _create_table():
+    return ops.CreateTableOp("users", [sa.Column("id", sa.Integer)])
+
+
+class TestSplitEnumAdditions:
+    def test_lifts_additions_into_preceding_revision(self):
+        """Test that enum additions move to a new revision before the DDL."""
+        addition = AddEnumValueOp("public", "user_status", "pending")
+        create_table = _create_table()
+        script = _script(
+            [addition, create_table],
+            [ops.DropTableOp("users"), addition.reverse()],
+        )
+        directives = [script]
+
+        split_enum_additions(None, None, directives)
+
+        enum_script, main_script = directives
+        assert main_script is script
+        assert enum_script.head == "aaaaaaaaaaaa"
+        assert main_script.head == enum_script.rev_id
+        assert enum_script.message == "add enum values for add users"
+
+        (block,) = enum_script.upgrade_ops.ops
+        assert isinstance(block, AddEnumValuesBlockOp)
+        assert block.strategy == "autocommit"
+        assert block.ops == [addition]
+        assert [type(op) for op in enum_script.downgrade_ops.ops] == [ops.ExecuteSQLOp]
+        assert main_script.upgrade_ops.ops == [create_table]
+        assert [type(op) for op in main_script.downgrade_ops.ops] == [ops.DropTableOp]
+
+    def test_only_additions_wrapped_in_place(self):
+        """Test that a revision with nothing but enum additions is not split."""
+        addition = AddEnumValueOp("public", "user_status", "pending")
+        directives = [_script([addition], [addition.reverse()])]
+
+        split_enum_additions(None, None, directives)
+
+        (script,) = directives
+        (block,) = script.upgrade_ops.ops
+        assert block.ops == [addition]
+        assert script.head == "aaaaaaaaaaaa"
+
+    def test_without_additions_untouched(self):
+        """Test that revisions without enum additions are left alone."""
+        create_table = _create_table()
+        directives = [_script([create_table], [ops.DropTableOp("users")])]
+
+        split_enum_additions(None, None, directives)
+
+        assert len(directives) == 1
+        assert directives[0].upgrade_ops.ops == [create_table]
+
+    def test_multiple_databases(self):
+        """Test repeated calls with one more ops container per database."""
+        script = _script(
+            [AddEnumValueOp("public", "a", "x"), _create_table()],
+            [ops.DropTableOp("users")],
+        )
+        script.upgrade_ops_list[0].upgrade_token = "engine1_upgrades"
+        directives = [script]
+
+        split_enum_additions(None, None, directives)
+        script.upgrade_ops_list.append(
+            ops.UpgradeOps(
+                ops=[AddEnumValueOp("public", "b", "y")],
+                upgrade_token="engine2_upgrades",
+            )
+        )
+        script.downgrade_ops_list.append(
+            ops.DowngradeOps(ops=[], downgrade_token="engine2_downgrades")
+        )
+        split_enum_additions(None, None, directives)
+
+        enum_script, main_script = directives
+        assert [
+            container.upgrade_token for container in enum_script.upgrade_ops_list
+        ] == [
+            "engine1_upgrades",
+            "engine2_upgrades",
+        ]
+        assert [
+            [op.enum_name for op in upgrade_ops.ops[0].ops]
+            for upgrade_ops in enum_script.upgrade_ops_list
+        ] == [["a"], ["b"]]
+        assert main_script.upgrade_ops_list[1].ops == []
@@ -0,0 +1,216 @@
+"""Tests for snapshot module."""
+
+import json
+import warnings
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import Column, Enum, MetaData, Table
+
+from alembic_pg_enum_generator.compare_dispatch import (
+    compare_enums_for_additions,
+    compare_metadata_to_snapshot,
+)
+from alembic_pg_enum_generator.config import Config
+from alembic_pg_enum_generator.snapshot import (
+    CatalogSnapshot,
+    dump_catalog_snapshot,
+    export_catalog_snapshot,
+    load_catalog_snapshot,
+)
+
+
+class TestCatalogSnapshot:
+    def test_get_defined_enums_by_schema(self):
+        """Test that the snapshot answers like the live catalog query."""
+        snapshot = CatalogSnapshot(
+            enums={
+                "public": {"user_status": ("a",), "priority": ("low",)},
+                "tenant_1": {"user_status": ("a", "b")},
+                "unused": {"other_status": ("x",)},
+            }
+        )
+
+        result = snapshot.get_defined_enums_by_schema(
+            ["public", "tenant_1", "missing"],
+            include_name=lambda name: name.endswith("_status"),
+        )
+
+        assert result == {
+            "public": {"user_status": ("a",)},
+            "tenant_1": {"user_status": ("a", "b")},
+        }
+
+    def test_dump_and_load_roundtrip(self, tmp_path):
+        """Test that label order, fingerprint and default schema survive."""
+        path = str(tmp_path / "catalog.json")
+        snapshot = CatalogSnapshot(
+            enums={"public": {"priority": ("low", "medium", "high")}},
+            fingerprint="3:16400:abc",
+            default_schema="public",
+            schemas=("public", "empty"),
+        )
+
+        dump_catalog_snapshot(snapshot, path)
+
+        assert load_catalog_snapshot(path) == snapshot
+
+    def test_load_rejects_unknown_version(self, tmp_path):
+        """Test that snapshots of another format version are refused."""
+        path = tmp_path / "catalog.json"
+        path.write_text(json.dumps({"version": 999, "schemas": {}}))
+
+        with pytest.raises(ValueError, match="Unsupported catalog snapshot version"):
+            load_catalog_snapshot(str(path))
+
+    @patch("alembic_pg_enum_generator.snapshot.get_catalog_fingerprint")
+    @patch("alembic_pg_enum_generator.snapshot.get_defined_enums_by_schema")
+    def test_export_catalog_snapshot(
+        self, mock_get_defined, mock_get_fingerprint, tmp_path
+    ):
+        """Test exporting a live catalog to a file."""
+        mock_get_defined.return_value = {"public": {"user_status": ("a", "b")}}
+        mock_get_fingerprint.return_value = "2:16400:abc"
+        connection = Mock()
+        connection.dialect.default_schema_name = "public"
+        path = str(tmp_path / "catalog.json")
+
+        snapshot = export_catalog_snapshot(connection, ["public"], path)
+
+        mock_get_defined.assert_called_once_with(connection, ["public"])
+        assert snapshot.fingerprint == "2:16400:abc"
+        assert snapshot.schemas == ("public",)
+        assert load_catalog_snapshot(path) == snapshot
+
+
+class TestOfflineComparison:
+    def teardown_method(self):
+        """Reset global configuration after each test."""
+        import alembic_pg_enum_generator.config
+
+        alembic_pg_enum_generator.config._configuration = None
+
+    def test_compare_metadata_to_snapshot(self, tmp_path):
+        """Test that a snapshot allows comparing without a database."""
+        path = str(tmp_path / "catalog.json")
+        dump_catalog_snapshot(
+            CatalogSnapshot(
+                enums={"app": {"user_status": ("active",)}}, default_schema="app"
+            ),
+            path,
+        )
+
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("status", Enum("active", "pending", name="user_status")),
+        )
+
+        ops = compare_metadata_to_snapshot(metadata, path)
+
+        assert [(op.enum_schema, op.value) for op in ops] == [("app", "pending")]
+
+    def test_compare_metadata_to_snapshot_applies_configuration(self):
+        """Test that schemas and emission options apply as in autogenerate."""
+        snapshot = CatalogSnapshot(
+            enums={
+                "public": {"user_status": ("active",)},
+                "tenant": {"user_status": ("active",)},
+            }
+        )
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("status", Enum("active", "pending", "archived", name="user_status")),
+        )
+
+        with patch(
+            "alembic_pg_enum_generator.compare_dispatch.get_configuration",
+            return_value=Config(group_enum_values=True),
+        ):
+            ops = compare_metadata_to_snapshot(metadata, snapshot, schemas=[None])
+
+        (op,) = ops
+        assert (op.enum_schema, op.values) == ("public", ["pending", "archived"])
+
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_defined_enums_by_schema")
+    def test_snapshot_replaces_live_query(self, mock_get_defined, tmp_path):
+        """Test that a configured snapshot is used even with a connection."""
+        path = str(tmp_path / "catalog.json")
+        dump_catalog_snapshot(
+            CatalogSnapshot(enums={"public": {"user_status": ("active",)}}), path
+        )
+
+        metadata = MetaData()
+        Table(
+            "users",
+            metadata,
+            Column("status", Enum("active", "pending", name="user_status")),
+        )
+
+        autogen_context = Mock(metadata=metadata)
+        autogen_context.connection.dialect.name = "postgresql"
+        autogen_context.connection.dialect.default_schema_name = "public"
+        upgrade_ops = Mock(ops=[])
+
+        with patch(
+            "alembic_pg_enum_generator.compare_dispatch.get_configuration",
+            return_value=Config(catalog_snapshot=path),
+        ):
+            compare_enums_for_additions(autogen_context, upgrade_ops, ["public"])
+
+        mock_get_defined.assert_not_called()
+        assert [op.value for op in upgrade_ops.ops] == ["pending"]
+
+    def test_no_connection(self, tmp_path):
+        """Test that autogenerate without a connection does nothing."""
+        path = str(tmp_path / "catalog.json")
+        dump_catalog_snapshot(CatalogSnapshot(enums={}), path)
+        autogen_context = Mock(metadata=MetaData(), connection=None)
+        upgrade_ops = Mock(ops=[])
+
+        with patch(
+            "alembic_pg_enum_generator.compare_dispatch.get_configuration",
+            return_value=Config(catalog_snapshot=path),
+        ):
+            compare_enums_for_additions(autogen_context, upgrade_ops, [None])
+
+        assert upgrade_ops.ops == []
+
+    @pytest.mark.parametrize(
+        ("live_fingerprint", "warns"),
+        [("1:16400:abc", False), ("2:16401:def", True)],
+    )
+    @patch("alembic_pg_enum_generator.compare_dispatch.get_catalog_fingerprint")
+    def test_warns_when_snapshot_is_stale(
+        self, mock_get_fingerprint, live_fingerprint, warns, tmp_path
+    ):
+        """Test that a snapshot differing from the live catalog is reported."""
+        path = str(tmp_path / "catalog.json")
+        dump_catalog_snapshot(
+            CatalogSnapshot(
+                enums={"public": {"user_status": ("active",)}},
+                fingerprint="1:16400:abc",
+                schemas=("public", "empty"),
+            ),
+            path,
+        )
+        mock_get_fingerprint.return_value = live_fingerprint
+
+        autogen_context = Mock(metadata=MetaData())
+        autogen_context.connection.dialect.name = "postgresql"
+        autogen_context.connection.dialect.default_schema_name = "public"
+
+        with patch(
+            "alembic_pg_enum_generator.compare_dispatch.get_configuration",
+            return_value=Config(catalog_snapshot=path),
+        ), warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            compare_enums_for_additions(autogen_context, Mock(ops=[]), ["public"])
+
+        mock_get_fingerprint.assert_called_once_with(
+            autogen_context.connection, ("public", "empty")
+        )
+        assert bool(caught) is warns